@@ -9,9 +9,12 @@ Uses refactored LangGraph with:
 - Clean routing
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from threading import Lock
+from threading import Lock, Thread
+import os
+import queue
+import time
 import requests
 import json
 import logging
@@ -21,18 +24,26 @@ import logging
 # ============================================================================
 
 from langgraph_flow.flows.main_flow import build_main_flow
+from langgraph_flow.core.routing import IntentRouter
 from langgraph_flow.core.state import StateManager, AgentState
-from langgraph_flow.core.constants import ConversationPhase, IntentType
-from langgraph_flow.services.intent_classifier import IntentClassifier
+from langgraph_flow.core.constants import ConversationPhase, IntentType, DEFAULT_LATENCY_BUDGET_SECONDS
+from langgraph_flow.services.intent_classifier import IntentClassifier, get_tier_stats
 
 # Keep your existing handlers
 from langgraph_flow.handlers.spend_insights_node import handle_spend_insight
 from langgraph_flow.handlers.faq_node import handle_faq
+from tools.faq_tool import get_faq_cache_stats
 from langgraph_flow.handlers.offers_node import handle_offers
 from langgraph_flow.handlers.transfer_node import handle_transfer
-from utils.llm_connector import run_llm
+from utils.llm_connector import (
+    run_llm_streamed, get_breaker_state, get_cache_stats, get_model_routes, llm_user, token_sink,
+    warm_up_llm,
+)
+from utils.embedding_registry import get_embedding_model, get_loaded_models
 from utils.logger import get_logger
+from utils import metrics
 from utils.output_formatter import format_spend_response
+from utils.prompts import CHAT_FORMAT
 
 
 # ============================================================================
@@ -45,6 +56,14 @@ logger = get_logger(__name__)
 
 API_BASE = "http://10.32.2.151:3009"
 
+# Wall-clock budget for one turn; LLM suggestions are replaced by static ones once it runs short
+REQUEST_LATENCY_BUDGET_S = float(
+    os.environ.get("REQUEST_LATENCY_BUDGET_S", DEFAULT_LATENCY_BUDGET_SECONDS)
+)
+
+# Largest "queries" list accepted by /intent/batch
+INTENT_BATCH_MAX_QUERIES = int(os.environ.get("INTENT_BATCH_MAX_QUERIES", "10000"))
+
 # Build the LangGraph once at startup
 graph = build_main_flow()
 
@@ -53,6 +72,90 @@ user_states = {}
 state_lock = Lock()
 
 
+# ============================================================================
+# WARM-UP
+# ============================================================================
+
+# Load models and data in the background at startup; /api/health answers 503
+# until this has finished so load balancers skip cold workers.
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") == "1"
+
+# Ready unless start_background_tasks() launched a warm-up that is still running
+warmup_status = {"ready": True, "components": {}}
+
+
+def _warm_up_embedding_model():
+    get_embedding_model()
+
+
+def _warm_up_faq_index():
+    # Opens the Chroma collection and checks once whether it is populated
+    from tools.faq_tool import ensure_vector_store
+    ensure_vector_store()
+
+
+def _warm_up_spend_data():
+    from tools.spend_insights import load_transactions
+    load_transactions()
+
+
+def _warm_up_beneficiaries():
+    from tools.transfer_tool import load_beneficiaries
+    load_beneficiaries()
+
+
+WARMUP_STEPS = [
+    ("llm", warm_up_llm),
+    ("embedding_model", _warm_up_embedding_model),
+    ("faq_index", _warm_up_faq_index),
+    ("spend_data", _warm_up_spend_data),
+    ("beneficiaries", _warm_up_beneficiaries),
+]
+
+
+def run_warmup():
+    """Run every warm-up step, recording duration and outcome per component."""
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            outcome = "ok"
+        except Exception as e:
+            logger.error(f"Warm-up of {name} failed: {e}")
+            outcome = "failed"
+        elapsed = time.perf_counter() - start
+        metrics.observe(f"warmup.{name}", elapsed)
+        warmup_status["components"][name] = {
+            "status": outcome,
+            "duration_ms": round(elapsed * 1000, 1),
+        }
+        logger.info(f"Warm-up of {name}: {outcome} in {elapsed:.2f}s")
+    # Ready even if a step failed: those components load lazily on first use
+    warmup_status["ready"] = True
+    metrics.set_gauge("warmup.ready", 1)
+
+
+# Re-index edited FAQ documents in the background (only changed chunks are re-embedded)
+FAQ_WATCH_ENABLED = os.environ.get("FAQ_WATCH_ENABLED", "0") == "1"
+
+
+def start_background_tasks() -> None:
+    """
+    Start the warm-up and FAQ watcher threads (per WARMUP_ENABLED / FAQ_WATCH_ENABLED).
+
+    Called by the server entry point, never at import: spawned worker
+    processes (FAQ extraction) re-import this module as __mp_main__ and
+    must not warm up or sync the index themselves.
+    """
+    if WARMUP_ENABLED:
+        warmup_status["ready"] = False
+        metrics.set_gauge("warmup.ready", 0)
+        Thread(target=run_warmup, name="warmup", daemon=True).start()
+    if FAQ_WATCH_ENABLED:
+        from tools.faq_tool import watch_vector_store
+        watch_vector_store()
+
+
 # ============================================================================
 # STATE MANAGEMENT
 # ============================================================================
@@ -96,6 +199,12 @@ def reset_user_state(user_id: str) -> None:
         user_states[user_id_str] = create_default_state()
 
 
+def run_graph(user_id: str, state: dict) -> dict:
+    """Invoke the graph, queueing its LLM calls fairly under this user (see llm_user)."""
+    with llm_user(str(user_id)):
+        return graph.invoke(state)
+
+
 # ============================================================================
 # RESPONSE FORMATTING
 # ============================================================================
@@ -123,28 +232,10 @@ def llm_format_chat_response(raw_response: dict, user_query: str) -> str:
     recommendation = raw_response.get("recommendation")
     flattened_json = json.dumps(raw_response, indent=2)
 
-    prompt = f"""
-You are a helpful, professional banking assistant.
-The user asked: "{user_query}"
-
-Here is the structured backend response:
-{flattened_json}
-
-Your task:
-1. Keep the reply concise and direct (no extra details, no introduction).
-2. Formulate a conversational reply describing what happened.
-3. Summarize only the key info - amount, beneficiary. Do not add explanations.
-4. Do not expose internal keys, raw JSON, or formatting.
-5. Do not start with greetings ("Hi", "Hello", etc.).
-6. Do not end with "Best regards" or similar.
-7. Do not return status codes or raw JSON.
-8. If there is a 'recommendation', preserve it verbatim in the reply.
-
-Currency is USD. Use the same currency in your response. Start the reply directly.
-"""
+    rendered = CHAT_FORMAT.render(query=user_query, response=flattened_json)
 
     try:
-        llm_output = run_llm(prompt)
+        llm_output = run_llm_streamed(rendered.prompt, system=rendered.system, purpose="summarize")
         if llm_output:
             logger.info("LLM formatted response: %s", llm_output[:100])
             
@@ -180,8 +271,35 @@ def extract_response_from_result(result: dict) -> dict:
 
 @app.route("/api/health", methods=["GET"])
 def health():
-    """Health check endpoint."""
-    return jsonify({"status": "ok", "service": "virtual_financial_assistant"})
+    """Health check endpoint; 503 until the startup warm-up has finished."""
+    components = warmup_status["components"]
+    if not warmup_status["ready"]:
+        return jsonify({
+            "status": "warming_up",
+            "service": "virtual_financial_assistant",
+            "components": components,
+        }), 503
+    degraded = any(c["status"] != "ok" for c in components.values())
+    return jsonify({
+        "status": "degraded" if degraded else "ok",
+        "service": "virtual_financial_assistant",
+        "components": components,
+    })
+
+
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """In-process counters and timings (LLM cache hits, latencies, ...)."""
+    return jsonify({
+        "status": "ok",
+        "metrics": metrics.snapshot(),
+        "llm_cache": get_cache_stats(),
+        "llm_breaker": get_breaker_state(),
+        "llm_routes": get_model_routes(),
+        "intent_tiers": get_tier_stats(),
+        "embedding_models": get_loaded_models(),
+        "faq_cache": get_faq_cache_stats(),
+    })
 
 
 # ============================================================================
@@ -197,7 +315,7 @@ def intent():
         {"query": "Show me spending"}
     
     Response:
-        {"status": "ok", "intent": "spend", "confidence": 0.95}
+        {"status": "ok", "intent": "spend", "confidence": 0.95, "tier": "keyword"}
     """
     data = request.json or {}
     query = data.get("query", "").strip()
@@ -206,13 +324,13 @@ def intent():
         return jsonify({"status": "error", "message": "'query' is required"}), 400
 
     try:
-        intent = IntentClassifier.classify(query)
-        confidence = 0.85  # Default confidence
-        
+        result = IntentClassifier.classify_with_confidence(query)
+
         return jsonify({
             "status": "ok",
-            "intent": intent,
-            "confidence": confidence,
+            "intent": result.intent,
+            "confidence": result.confidence,
+            "tier": result.tier,
         })
     except Exception as e:
         logger.exception("Intent classification failed")
@@ -222,6 +340,51 @@ def intent():
         }), 500
 
 
+@app.route("/intent/batch", methods=["POST"])
+def intent_batch():
+    """
+    Detect intents for many queries; results stream back as NDJSON in input order.
+    
+    Request:
+        {"queries": ["Show me spending", "transfer 100 to mom", ...]}
+    
+    Response (one line per query):
+        {"index": 0, "query": "Show me spending", "intent": "spend", "confidence": 0.95, "tier": "keyword"}
+    """
+    data = request.json or {}
+    queries = data.get("queries")
+
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return jsonify({"status": "error", "message": "'queries' must be a list of strings"}), 400
+    if len(queries) > INTENT_BATCH_MAX_QUERIES:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {INTENT_BATCH_MAX_QUERIES} queries per request"
+        }), 400
+
+    def generate():
+        done = 0
+        try:
+            for result in IntentClassifier.classify_many(queries):
+                yield json.dumps({
+                    "index": done,
+                    "query": queries[done],
+                    "intent": result.intent,
+                    "confidence": result.confidence,
+                    "tier": result.tier,
+                }) + "\n"
+                done += 1
+        except Exception as e:
+            logger.exception("Batch intent classification failed")
+            yield json.dumps({
+                "status": "error",
+                "index": done,
+                "message": f"Intent classification failed: {e}"
+            }) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
 # ============================================================================
 # VOICE ENDPOINT
 # ============================================================================
@@ -240,6 +403,7 @@ def voice():
     data = request.json or {}
     user_id = str(data.get("user_id", "1"))
     query = data.get("query", "").strip()
+    fast = bool(data.get("fast", False))
     
     if not query:
         return jsonify({"status": "error", "message": "'query' is required"}), 400
@@ -247,12 +411,13 @@ def voice():
     try:
         user_state = get_user_state(user_id)
         StateManager.ensure_defaults(user_state)
+        StateManager.start_latency_budget(user_state, REQUEST_LATENCY_BUDGET_S, fast)
         
         # Set user input and run graph
         user_state["user_input"] = query
         user_state["intent"] = IntentType.UNKNOWN  # Let classifier determine
         
-        result = graph.invoke(user_state)
+        result = run_graph(user_id, user_state)
         save_user_state(user_id, result)
         
         return jsonify({
@@ -281,7 +446,7 @@ def chatbot():
     Routes to appropriate handlers based on phase and intent.
     
     Request:
-        {"user_id": 1, "query": "...", "otp": "..."}
+        {"user_id": 1, "query": "...", "otp": "...", "fast": false}
     
     Response:
         {"status": "ok", "response": {...}}
@@ -290,6 +455,35 @@ def chatbot():
     user_id = str(data.get("user_id", "1"))
     query = data.get("query", "").strip()
     otp = data.get("otp", "").strip()
+    fast = bool(data.get("fast", False))
+    
+    if not query and not otp:
+        return jsonify({
+            "status": "error",
+            "message": "'query' or 'otp' is required"
+        }), 400
+
+    return dispatch_chatbot_turn(user_id, query, otp, fast)
+
+
+@app.route("/chatbot/stream", methods=["POST"])
+def chatbot_stream():
+    """
+    Streaming variant of /chatbot (Server-Sent Events).
+    
+    Emits `token` events ({"text": "..."}) while the user-facing answer is
+    generated, then a single `done` event with the same payload /chatbot
+    returns plus `contextual_questions`.
+
+    Only FAQ answers are LLM-generated prose, so only FAQ turns emit `token`
+    events. Transfer, spend and offers replies are built from templates and
+    data and arrive whole in the `done` event.
+    """
+    data = request.json or {}
+    user_id = str(data.get("user_id", "1"))
+    query = data.get("query", "").strip()
+    otp = data.get("otp", "").strip()
+    fast = bool(data.get("fast", False))
     
     if not query and not otp:
         return jsonify({
@@ -297,9 +491,25 @@ def chatbot():
             "message": "'query' or 'otp' is required"
         }), 400
 
+    def work():
+        response, status_code = dispatch_chatbot_turn(user_id, query, otp, fast)
+        payload = response.get_json()
+        payload["contextual_questions"] = get_user_state(user_id).get("contextual_questions", [])
+        return payload, status_code
+
+    return stream_with_tokens(work)
+
+
+def dispatch_chatbot_turn(user_id: str, query: str, otp: str, fast: bool = False) -> tuple:
+    """
+    Run one chatbot turn, routing on the user's current phase.
+    
+    `fast` skips the LLM contextual-question suggestions (static ones are used) for this turn.
+    """
     try:
         user_state = get_user_state(user_id)
         StateManager.ensure_defaults(user_state)
+        StateManager.start_latency_budget(user_state, REQUEST_LATENCY_BUDGET_S, fast)
         
         phase = StateManager.get_phase(user_state)
         
@@ -319,6 +529,52 @@ def chatbot():
         }), 500
 
 
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def stream_with_tokens(work) -> Response:
+    """
+    Run `work()` in a worker thread and stream it as SSE.
+    
+    LLM tokens produced via run_llm_streamed while `work` runs are sent as
+    `token` events; the (payload, status_code) returned by `work` is sent as
+    the closing `done` event.
+    """
+    events = queue.Queue()
+
+    def worker():
+        try:
+            with app.app_context(), token_sink(lambda text: events.put(("token", {"text": text}))):
+                payload, status_code = work()
+            payload = dict(payload)
+            payload.setdefault("http_status", status_code)
+            events.put(("done", payload))
+        except Exception as e:
+            logger.exception("Streaming request failed")
+            events.put(("error", {"status": "error", "message": f"Processing failed: {e}"}))
+
+    Thread(target=worker, daemon=True).start()
+
+    def generate():
+        while True:
+            event, data = events.get()
+            yield _sse_event(event, data)
+            if event != "token":
+                break
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================================
 # PHASE HANDLERS
 # ============================================================================
@@ -345,7 +601,7 @@ def handle_otp_phase(user_id: str, user_state: dict, query: str, otp: str) -> tu
         user_state["intent"] = IntentType.OTP
         
         # Invoke graph to handle OTP validation
-        result = graph.invoke(user_state)
+        result = run_graph(user_id, user_state)
         save_user_state(user_id, result)
         
         response = extract_response_from_result(result)
@@ -379,8 +635,8 @@ def handle_confirmation_phase_route(user_id: str, user_state: dict, query: str)
         }), 200
     
     try:
-        # Normalize confirmation input
-        normalized = query.lower().strip()
+        # Normalize confirmation input ("y", "ok", "confirm", "cancel", ...)
+        normalized = IntentRouter.normalize_confirmation_input(query)
         
         if normalized not in ("yes", "no"):
             return jsonify({
@@ -392,7 +648,7 @@ def handle_confirmation_phase_route(user_id: str, user_state: dict, query: str)
         user_state["intent"] = IntentType.CONFIRMATION
         
         # Invoke graph to handle confirmation
-        result = graph.invoke(user_state)
+        result = run_graph(user_id, user_state)
         save_user_state(user_id, result)
         
         response = extract_response_from_result(result)
@@ -424,7 +680,7 @@ def handle_normal_phase_route(user_id: str, user_state: dict, query: str) -> tup
         user_state["intent"] = IntentType.UNKNOWN  # Let classifier determine
         
         # Invoke graph - it will classify and route
-        result = graph.invoke(user_state)
+        result = run_graph(user_id, user_state)
         save_user_state(user_id, result)
         
         response = extract_response_from_result(result)
@@ -467,10 +723,12 @@ def transfer():
     user_id = str(data.get("user_id", "1"))
     query = data.get("query", "").strip()
     otp = data.get("otp", "").strip()
+    fast = bool(data.get("fast", False))
     
     try:
         user_state = get_user_state(user_id)
         StateManager.ensure_defaults(user_state)
+        StateManager.start_latency_budget(user_state, REQUEST_LATENCY_BUDGET_S, fast)
         
         phase = StateManager.get_phase(user_state)
         
@@ -479,13 +737,13 @@ def transfer():
             logger.info("Transfer in OTP phase")
             user_state["user_input"] = otp or query
             user_state["intent"] = IntentType.OTP
-            result = graph.invoke(user_state)
+            result = run_graph(user_id, user_state)
         
         elif phase == ConversationPhase.CONFIRMATION:
             logger.info("Transfer in CONFIRMATION phase")
             user_state["user_input"] = query or otp
             user_state["intent"] = IntentType.CONFIRMATION
-            result = graph.invoke(user_state)
+            result = run_graph(user_id, user_state)
         
         else:
             # Normal phase - initiate transfer
@@ -498,7 +756,7 @@ def transfer():
             logger.info("Transfer initiating for user %s", user_id)
             user_state["user_input"] = query
             user_state["intent"] = IntentType.TRANSFER
-            result = graph.invoke(user_state)
+            result = run_graph(user_id, user_state)
         
         save_user_state(user_id, result)
         response = extract_response_from_result(result)
@@ -579,7 +837,8 @@ def spend():
         }), 400
     
     try:
-        insight = handle_spend_insight(user_id, query)
+        with llm_user(user_id):
+            insight = handle_spend_insight(user_id, query)
         response = format_spend_response(insight)
         
         return jsonify(response), 200
@@ -613,7 +872,8 @@ def faq():
         }), 400
     
     try:
-        result = handle_faq(user_id, query)
+        with llm_user(user_id):
+            result = handle_faq(user_id, query)
         return jsonify(result), 200
     except Exception as e:
         logger.exception("FAQ endpoint failed")
@@ -623,6 +883,35 @@ def faq():
         }), 500
 
 
+@app.route("/faq/stream", methods=["POST"])
+def faq_stream():
+    """
+    Streaming variant of /faq (Server-Sent Events).
+    
+    Emits `token` events while the answer is generated, then a `done` event
+    with the full /faq payload (answer, confidence, sources).
+    """
+    data = request.json or {}
+    user_id = str(data.get("user_id", "1"))
+    query = data.get("query", "").strip()
+    
+    if not query:
+        return jsonify({
+            "status": "error",
+            "message": "'query' is required"
+        }), 400
+
+    def work():
+        try:
+            with llm_user(user_id):
+                return handle_faq(user_id, query), 200
+        except Exception as e:
+            logger.exception("FAQ stream failed")
+            return {"status": "error", "message": f"FAQ lookup failed: {e}"}, 500
+
+    return stream_with_tokens(work)
+
+
 @app.route("/offers", methods=["POST"])
 def offers():
     """
@@ -639,7 +928,8 @@ def offers():
     query = data.get("query", "Show me offers").strip()
     
     try:
-        result = handle_offers(user_id, query)
+        with llm_user(user_id):
+            result = handle_offers(user_id, query)
         return jsonify(result), 200
     except Exception as e:
         logger.exception("Offers endpoint failed")
@@ -747,4 +1037,8 @@ def server_error(error):
 if __name__ == "__main__":
     logger.info("Starting Virtual Financial Assistant API")
     logger.info("LangGraph initialized with transfer flow isolation")
-    app.run(debug=True, host="0.0.0.0", port=3009)
+    debug = True
+    # With the debug reloader only the serving child process (not the file watcher) starts them
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_tasks()
+    app.run(debug=debug, host="0.0.0.0", port=3009)
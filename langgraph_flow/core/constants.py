@@ -56,6 +56,9 @@ TRANSFER_FLOW_PHASES = {
     ConversationPhase.CONFIRMATION,
 }
 
+# Per-request latency budget (seconds) for a chatbot turn
+DEFAULT_LATENCY_BUDGET_SECONDS = 20.0
+
 # Max OTP attempts before cancellation
 MAX_OTP_ATTEMPTS = 3
 
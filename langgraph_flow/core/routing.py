@@ -1,6 +1,7 @@
 # langraph_flow/core/routing.py
 
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
 from .constants import ConversationPhase, IntentType
 from .state import StateManager
 
@@ -66,6 +67,138 @@ class IntentRouter:
         return normalized
 
 
+class PhaseInputMatcher:
+    """
+    Recognizes the closed set of answers each transfer phase expects
+    (OTP digits, yes/no variants, account types, option indexes or names)
+    so that those turns never reach the intent classifier.
+
+    Short replies within a small edit distance of an expected word ("savngs",
+    "yse") also count, so the phase handler re-prompts instead of the typo
+    being classified as a new request.
+    """
+
+    ACCOUNT_OPTIONS = ("savings", "current")
+    CONFIRMATION_WORDS = ("yes", "confirm", "proceed", "cancel", "abort", "stop")
+    # Replies longer than this are treated as requests, not mistyped answers
+    NEAR_MISS_MAX_WORDS = 2
+
+    _DIGITS_RE = re.compile(r"^[\d\s-]+$")
+    _INDEX_RE = re.compile(r"^(?:option\s*|no\.?\s*|#)?(\d{1,2})$")
+    _ACCOUNT_RE = re.compile(r"\b(saving|savings|current)\b")
+
+    @staticmethod
+    def is_expected(phase: ConversationPhase, user_input: str, state: Dict[str, Any] = None) -> bool:
+        """True if `user_input` is a plausible answer for `phase` (valid or not)."""
+        normalized = (user_input or "").strip().lower()
+        if not normalized:
+            return True
+        if IntentRouter.normalize_confirmation_input(normalized) in ("yes", "no"):
+            return True
+
+        if phase == ConversationPhase.OTP:
+            return bool(PhaseInputMatcher._DIGITS_RE.match(normalized))
+
+        vocabulary = list(PhaseInputMatcher.CONFIRMATION_WORDS)
+        if phase == ConversationPhase.ACCOUNT_SELECTION:
+            if PhaseInputMatcher.match_account(normalized) is not None:
+                return True
+            vocabulary.extend(PhaseInputMatcher.ACCOUNT_OPTIONS)
+        elif phase == ConversationPhase.BENEFICIARY_SELECTION:
+            options = PhaseInputMatcher.beneficiary_options(state or {})
+            if PhaseInputMatcher._index(normalized) is not None:
+                return True
+            # A whole name word (or a short reply starting one, "matt") counts, even if ambiguous
+            words = re.findall(r"[a-z]+", normalized)
+            names = set(re.findall(r"[a-z]+", " ".join(
+                f"{o.get('name', '')} {o.get('nickname', '')}" if isinstance(o, dict) else str(o)
+                for o in options
+            ).lower()))
+            if any(len(w) > 2 and w in names for w in words):
+                return True
+            if len(words) == 1 and len(words[0]) > 2 and any(n.startswith(words[0]) for n in names):
+                return True
+            vocabulary.extend(names)
+        elif phase not in (ConversationPhase.TRANSFER_SUMMARY, ConversationPhase.CONFIRMATION):
+            return False
+        return PhaseInputMatcher._is_near_miss(normalized, vocabulary)
+
+    @staticmethod
+    def match_account(user_input: str) -> Optional[str]:
+        """'savings' / 'current' from "Savings", "current account", "1", "2"..."""
+        normalized = (user_input or "").strip().lower()
+        index = PhaseInputMatcher._index(normalized)
+        if index is not None:
+            options = PhaseInputMatcher.ACCOUNT_OPTIONS
+            return options[index - 1] if 1 <= index <= len(options) else None
+        match = PhaseInputMatcher._ACCOUNT_RE.search(normalized)
+        if not match:
+            return None
+        return "current" if match.group(1) == "current" else "savings"
+
+    @staticmethod
+    def match_option(user_input: str, options: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Option chosen by 1-based index, exact name, or a unique partial name/nickname."""
+        normalized = (user_input or "").strip().lower()
+        options = [o for o in options if isinstance(o, dict)]
+        if not normalized or not options:
+            return None
+
+        index = PhaseInputMatcher._index(normalized)
+        if index is not None:
+            return options[index - 1] if 1 <= index <= len(options) else None
+
+        for opt in options:
+            if (opt.get("name") or "").lower() == normalized:
+                return opt
+        partial = [
+            opt for opt in options
+            if normalized in (opt.get("name") or "").lower()
+            or normalized == (opt.get("nickname") or "").lower()
+        ]
+        return partial[0] if len(partial) == 1 else None
+
+    @staticmethod
+    def beneficiary_options(state: Dict[str, Any]) -> List[Any]:
+        """Candidates offered in BENEFICIARY_SELECTION (full records when available)."""
+        pending = state.get("pending_transfer") or {}
+        return pending.get("multiple_options") or (state.get("result") or {}).get("options") or []
+
+    @staticmethod
+    def _is_near_miss(normalized: str, vocabulary: List[str]) -> bool:
+        """True if a short reply has a word within typo distance of `vocabulary`."""
+        words = re.findall(r"[a-z]+", normalized)
+        if not words or len(words) > PhaseInputMatcher.NEAR_MISS_MAX_WORDS:
+            return False
+        targets = {t for t in vocabulary if len(t) > 2}
+        for word in words:
+            for target in targets:
+                # One edit for short words, two for longer ones
+                limit = 1 if len(target) <= 4 else 2
+                if abs(len(word) - len(target)) <= limit and _edit_distance(word, target) <= limit:
+                    return True
+        return False
+
+    @staticmethod
+    def _index(normalized: str) -> Optional[int]:
+        match = PhaseInputMatcher._INDEX_RE.match(normalized)
+        return int(match.group(1)) if match else None
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance counting an adjacent transposition as one edit."""
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        prev2, prev = prev, row
+    return prev[-1]
+
+
 class PhaseRouter:
     """Handles phase-based routing logic."""
     
@@ -1,7 +1,9 @@
 # langraph_flow/core/state.py
 
+import time
 from typing import TypedDict, Optional, Dict, Any, Literal
 from .constants import ConversationPhase, IntentType, DEFAULT_USER_ID, DEFAULT_OTP_ATTEMPTS
+from utils.latency_budget import has_budget
 
 
 class AgentState(TypedDict, total=False):
@@ -15,6 +17,7 @@ class AgentState(TypedDict, total=False):
     
     # Intent and routing
     intent: str  # Uses IntentType values
+    extracted_slots: Optional[Dict]  # Slots from fused classification (transfer/spend)
     
     # Transfer-specific state
     pending_transfer: Optional[Dict]
@@ -28,6 +31,11 @@ class AgentState(TypedDict, total=False):
     
     # Response enrichment
     contextual_questions: list
+    
+    # Latency budget (per request)
+    deadline: Optional[float]  # time.time() after which optional LLM steps are skipped
+    fast_mode: bool  # skip all optional LLM steps
+    stage_timings: Dict[str, float]  # per-stage durations (ms) of the last handler node
 
 
 class StateManager:
@@ -44,6 +52,7 @@ class StateManager:
         state.setdefault("intent", IntentType.UNKNOWN)
         state.setdefault("result", "")
         state.setdefault("phase", ConversationPhase.NORMAL)
+        state.setdefault("extracted_slots", None)
         
         # Normalize phase if it's a string
         if isinstance(state.get("phase"), str):
@@ -67,6 +76,11 @@ class StateManager:
         # Response enrichment
         state.setdefault("contextual_questions", [])
         
+        # Latency budget
+        state.setdefault("deadline", None)
+        state.setdefault("fast_mode", False)
+        state.setdefault("stage_timings", {})
+        
         return state
     
     @staticmethod
@@ -103,6 +117,17 @@ class StateManager:
         phase = StateManager.get_phase(state)
         return phase in (ConversationPhase.OTP, ConversationPhase.CONFIRMATION)
     
+    @staticmethod
+    def start_latency_budget(state: Dict[str, Any], budget_seconds: float, fast: bool = False) -> None:
+        """Stamp the state with this request's deadline and fast-mode flag."""
+        state["deadline"] = time.time() + budget_seconds
+        state["fast_mode"] = bool(fast)
+    
+    @staticmethod
+    def has_budget_for(state: Dict[str, Any], step: str) -> bool:
+        """Check whether the optional LLM step may run within this request's budget."""
+        return has_budget(step, state.get("deadline"), state.get("fast_mode", False))
+    
     @staticmethod
     def reset_transfer_state(state: Dict[str, Any]) -> None:
         """Reset all transfer-related state fields."""
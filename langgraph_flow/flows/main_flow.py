@@ -16,14 +16,15 @@ from langgraph.graph import StateGraph, END
 from typing import Dict, Any
 from ..core.state import AgentState, StateManager
 from ..core.constants import ConversationPhase, IntentType, MAX_OTP_ATTEMPTS
-from ..core.routing import IntentRouter, PhaseRouter
+from ..core.routing import IntentRouter, PhaseInputMatcher, PhaseRouter
 from ..flows.transfer_flow import TransferFlowHandler
 from ..core.constants import TRANSFER_FLOW_PHASES
-from ..services.intent_classifier import IntentClassifier
+from ..services.intent_classifier import IntentClassifier, FUSED_INTENT_EXTRACTION
 from ..nodes.main_nodes import (
     spend_node, faq_node, offers_node, unknown_node, voice_node
 )
 from ..nodes.confirmation_nodes import confirmation_node, interruption_confirmation_node
+from utils import metrics
 
 
 logger = logging.getLogger(__name__)
@@ -48,7 +49,7 @@ def classify_intent_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # Check for interruptions in ANY transfer phase (NEW)
     if phase in TRANSFER_FLOW_PHASES:
-        is_interruption, new_intent = _detect_interruption(phase, user_input)
+        is_interruption, new_intent = _detect_interruption(phase, user_input, state)
         
         if is_interruption:
             state["phase"] = ConversationPhase.INTERRUPTION_CONFIRMATION
@@ -65,7 +66,12 @@ def classify_intent_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     # Standard classification for NORMAL phase
     if phase == ConversationPhase.NORMAL:
-        state["intent"] = IntentClassifier.classify(user_input)
+        if FUSED_INTENT_EXTRACTION:
+            # One LLM call for intent + slots; handlers skip their own extraction
+            state["intent"], state["extracted_slots"] = IntentClassifier.classify_with_slots(user_input)
+        else:
+            state["intent"] = IntentClassifier.classify(user_input)
+            state["extracted_slots"] = None
     elif phase == ConversationPhase.BENEFICIARY_SELECTION:  # NEW
         state["intent"] = IntentType.TRANSFER
     elif phase == ConversationPhase.ACCOUNT_SELECTION:  # NEW
@@ -119,26 +125,33 @@ def route_from_classify_intent(state: Dict[str, Any]) -> str:
     return state.get("intent", IntentType.UNKNOWN)
 
 
-def _detect_interruption(phase: ConversationPhase, user_input: str) -> tuple:
+# Phases where unexpected input is classified as a possible new request
+INTERRUPTIBLE_PHASES = (ConversationPhase.OTP, ConversationPhase.CONFIRMATION)
+
+
+def _detect_interruption(phase: ConversationPhase, user_input: str,
+                         state: Dict[str, Any] = None) -> tuple:
     """
     Detect if current input interrupts a sensitive phase.
+
+    Only OTP and CONFIRMATION can be interrupted; the selection and summary
+    phases re-prompt on unexpected input instead. Answers the phase expects
+    (OTP digits, yes/no variants and their typos) are recognized locally;
+    only other input is classified.
     
     Returns:
         (is_interruption: bool, new_intent: str)
     """
-    # OTP phase: non-digit input that's a valid intent
-    if phase == ConversationPhase.OTP:
-        if not user_input.strip().isdigit():
-            new_intent = IntentClassifier.classify(user_input)
-            if new_intent != IntentType.UNKNOWN:
-                return True, new_intent
-    
-    # CONFIRMATION phase: response other than yes/no that's a valid intent
-    if phase == ConversationPhase.CONFIRMATION:
-        if user_input not in ("yes", "no"):
-            new_intent = IntentClassifier.classify(user_input)
-            if new_intent != IntentType.UNKNOWN:
-                return True, new_intent
+    if phase not in INTERRUPTIBLE_PHASES:
+        return False, IntentType.UNKNOWN
+    if PhaseInputMatcher.is_expected(phase, user_input, state):
+        metrics.increment("intent.phase_matcher.expected")
+        return False, IntentType.UNKNOWN
+
+    metrics.increment("intent.phase_matcher.escalated")
+    new_intent = IntentClassifier.classify(user_input)
+    if new_intent != IntentType.UNKNOWN:
+        return True, new_intent
     
     return False, IntentType.UNKNOWN
 
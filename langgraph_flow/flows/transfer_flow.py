@@ -26,7 +26,7 @@ from ..core.constants import (
     MAX_INVALID_SELECTION_ATTEMPTS, STATUS_MULTIPLE_MATCHES, 
     STATUS_INVALID_SELECTION, TRANSFER_FLOW_PHASES
 )
-from ..core.routing import IntentRouter
+from ..core.routing import IntentRouter, PhaseInputMatcher
 from tools import transfer_tool
 
 
@@ -51,9 +51,14 @@ class TransferFlowHandler:
         user_input = (state.get("user_input") or "").strip()
         
         try:
-            # Extract transfer details from query
-            from ..handlers.transfer_node import extract_transfer_details
-            details = extract_transfer_details(user_input)
+            # Extract transfer details from query (reuse fused-classification slots if present)
+            from ..handlers.transfer_node import extract_transfer_details, normalize_transfer_details
+            slots = state.get("extracted_slots")
+            state["extracted_slots"] = None
+            if slots:
+                details = normalize_transfer_details(slots)
+            else:
+                details = extract_transfer_details(user_input)
             
             amount = details.get("amount")
             to_beneficiary_name = details.get("to_beneficiary")
@@ -181,7 +186,7 @@ class TransferFlowHandler:
         StateManager.ensure_defaults(state)
         user_input = (state.get("user_input") or "").strip()
         pending = state.get("pending_transfer", {})
-        options = state.get("result", {}).get("options", [])
+        options = PhaseInputMatcher.beneficiary_options(state)
         
         if not user_input:
             state["result"] = {
@@ -191,12 +196,8 @@ class TransferFlowHandler:
             }
             return state
         
-        # Find matching beneficiary (case-insensitive)
-        selected = None
-        for opt in options:
-            if opt.get("name", "").lower() == user_input.lower():
-                selected = opt
-                break
+        # Find matching beneficiary (index, name, or unique partial name; case-insensitive)
+        selected = PhaseInputMatcher.match_option(user_input, options)
         
         if not selected:
             attempts = state.get("selection_attempts", 0) + 1
@@ -279,9 +280,9 @@ class TransferFlowHandler:
         user_input = (state.get("user_input") or "").strip()
         pending = state.get("pending_transfer", {})
         
-        # Normalize account selection (case-insensitive)
-        user_account = user_input.lower()
-        if user_account not in ["savings", "current"]:
+        # Normalize account selection ("Savings", "current account", "1", ...)
+        user_account = PhaseInputMatcher.match_account(user_input)
+        if user_account is None:
             attempts = state.get("selection_attempts", 0) + 1
             state["selection_attempts"] = attempts
             
@@ -345,7 +346,7 @@ class TransferFlowHandler:
         User input: "yes" or "no" (case-insensitive)
         """
         StateManager.ensure_defaults(state)
-        user_input = (state.get("user_input") or "").strip().lower()
+        user_input = IntentRouter.normalize_confirmation_input(state.get("user_input"))
         
         if user_input not in ("yes", "no"):
             attempts = state.get("selection_attempts", 0) + 1
@@ -2,9 +2,12 @@
 from typing import Dict, Any, List
 from utils.llm_connector import run_llm
 from utils.logger import get_logger
+from utils.prompts import SUGGESTIONS
 
 logger = get_logger("ContextualQuestionsNode")
 
+SUGGESTIONS_CACHE_TTL = 60 * 60
+
 
 def generate_static_suggestions(response_text: str) -> List[str]:
     """
@@ -41,7 +44,7 @@ def generate_static_suggestions(response_text: str) -> List[str]:
     return suggestions
 
 
-def handle_contextual_questions_node(user_id: int, last_query: str, last_response: str, state: Dict[str, Any] = None) -> Dict[str, Any]:
+def handle_contextual_questions_node(user_id: int, last_query: str, last_response: str, state: Dict[str, Any] = None, timeout: int = 60) -> Dict[str, Any]:
     """
     Generates contextual questions for the user to select after any query response.
 
@@ -53,23 +56,13 @@ def handle_contextual_questions_node(user_id: int, last_query: str, last_respons
     logger.info("Generating contextual questions for user_id=%s", user_id)
 
     # Build prompt for LLM
-    prompt = f"""
-You are a helpful banking assistant.
-
-The user asked: "{last_query}"
-The last response you gave: "{last_response}"
-
-Your task:
-- Suggest 3-5 concise follow-up questions the user might want to ask next.
-- Questions should be relevant to the previous response and actionable.
-- Format as a JSON array of strings only.
-- Keep tone friendly and professional.
-"""
+    rendered = SUGGESTIONS.render(query=last_query, response=last_response)
 
     contextual_questions: List[str] = []
 
     try:
-        llm_output = run_llm(prompt)
+        llm_output = run_llm(rendered.prompt, timeout, cache_ttl=SUGGESTIONS_CACHE_TTL,
+                             system=rendered.system, purpose="suggest")
         if llm_output:
             # Attempt to parse JSON array from LLM output
             import json
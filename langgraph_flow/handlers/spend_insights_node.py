@@ -5,6 +5,7 @@ import re
 import json
 from dateutil.relativedelta import relativedelta
 from utils.llm_connector import run_llm
+from utils.prompts import SPEND_EXTRACTION, SPEND_SUMMARY
 from tools import spend_insights
 from utils.logger import get_logger
 from datetime import datetime, date, timedelta
@@ -204,8 +205,17 @@ def compute_date_range_from_query(user_query: str):
 
 
 # Update handle_spend_insight to use fuzzy category and top merchants
-def handle_spend_insight(user_id: int, query: str) -> dict:
-    details = extract_spend_query_details(query)
+def handle_spend_insight(user_id: int, query: str, details: dict = None) -> dict:
+    """
+    Answer a spend query.
+
+    `details` may carry slots already extracted upstream (fused intent
+    classification); the LLM extraction call is skipped in that case.
+    """
+    if details:
+        details = normalize_spend_details(query, dict(details))
+    else:
+        details = extract_spend_query_details(query)
     user_category = details.get("category")
     canonical_category = match_category(user_category)
     details["category"] = canonical_category
@@ -318,29 +328,12 @@ def extract_spend_query_details(user_query: str) -> dict:
     Use LLM to extract category, time range, merchant.
     Post-process relative-date hints locally for reliability.
     """
-    today_str = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d")
-    prompt = f"""
-Extract spend analytics query details from the user query.
-Assume today's date is {today_str}.
-Return a JSON object with keys:
-  - category (string or null)
-  - start_date (YYYY-MM-DD or null)   # If the user gave explicit dates put them here; otherwise null.
-  - end_date (YYYY-MM-DD or null)
-  - merchant (string or null)
-
-Examples:
-  Input: "How much did I spend in groceries in August 2025?"
-  Output JSON: {{ "category": "Groceries", "start_date": "2025-08-01", "end_date": "2025-08-31", "merchant": null }}
-
-  Input: "Show me my spends this month"
-  Output JSON: {{ "category": null, "start_date": null, "end_date": null, "merchant": null }}
-    # For relative phrases like "this month" we'll compute concrete dates locally.
-
-The currency is USD and return the amounts in USD.
-
-Query: "{user_query}"
-"""
-    response = run_llm(prompt)
+    now = datetime.now(ZoneInfo("Asia/Kolkata"))
+    today_str = now.strftime("%Y-%m-%d")
+    rendered = SPEND_EXTRACTION.render(today=today_str, query=user_query)
+    # The prompt embeds today's date, so a cached answer is only valid until midnight.
+    response = run_llm(rendered.prompt, cache_ttl=_seconds_until_midnight(now),
+                       system=rendered.system, purpose="extract")
     logger.info("LLM spend query extraction response: %s", response)
     try:
         # 🩹 Clean common LLM artifacts
@@ -360,6 +353,14 @@ Query: "{user_query}"
         logger.error("Failed to parse LLM response: %s | Raw: %r", str(e), response)
         details = {}
 
+    return normalize_spend_details(user_query, details)
+
+
+def normalize_spend_details(user_query: str, details: dict) -> dict:
+    """
+    Post-process extracted spend slots: relative-date phrases in the query
+    override LLM dates; placeholder values are cleared.
+    """
     # If user used a relative phrase override the dates with deterministic logic
     try:
         start_date, end_date = compute_date_range_from_query(user_query)
@@ -382,6 +383,11 @@ Query: "{user_query}"
     return details
 
 
+def _seconds_until_midnight(now: datetime) -> float:
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max((tomorrow - now).total_seconds(), 1.0)
+
+
 def _format_amount(amount):
     try:
         return f"$ {float(amount):,.2f}"
@@ -401,24 +407,13 @@ def _summarize_spend_for_chat(user_query: str, details: dict, result: dict) -> s
         "result_keys": list(result.keys()),
     }
 
-    prompt = f"""
-You are a concise financial assistant. The user asked: "{user_query}"
-
-We have this spend analysis result (JSON keys: {', '.join(result.keys())}).
-Provide a short chat-friendly reply (maximum 2-3 sentences, one paragraph) that:
-  - States the total spend (if available).
-  - Lists the top 2-3 categories or top 3 merchants if the query is for a category.
-  - Ends with a short CTA like "Would you like the full breakdown?" or "Want more detail?"
-
-Return ONLY the short reply (plain text). Do not return JSON or internal debug info.
-The currency is USD and return the amount ONLY in USD. 
-Do not start with "As an AI language model" or greetings like "Hi" or "Hello".
-
-Here is the analysis JSON:
-{json.dumps(result, indent=2)}
-"""
+    rendered = SPEND_SUMMARY.render(
+        query=user_query,
+        keys=", ".join(result.keys()),
+        analysis=json.dumps(result, indent=2),
+    )
     try:
-        out = run_llm(prompt)
+        out = run_llm(rendered.prompt, system=rendered.system, purpose="summarize")
         if out and out.strip():
             return out.strip()
     except Exception:
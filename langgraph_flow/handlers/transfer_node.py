@@ -6,11 +6,13 @@ from utils.llm_connector import run_llm
 from tools import transfer_tool
 from tools.transfer_tool import confirm_recommendation
 from utils.logger import get_logger
-from utils.prompts import extraction_prompt
+from utils.prompts import TRANSFER_EXTRACTION
 
 
 logger = get_logger("TransferNode")
 
+EXTRACTION_CACHE_TTL = 60 * 60
+
 
 def extract_transfer_details(query: str) -> dict:
     """
@@ -22,44 +24,51 @@ def extract_transfer_details(query: str) -> dict:
     - from_account (Savings/Current or None if not specified)
     - frequency (one-time / recurring / null)
     """
-    prompt = extraction_prompt(query)
-    
-    response = run_llm(prompt)
+    rendered = TRANSFER_EXTRACTION.render(query=query)
+
+    response = run_llm(rendered.prompt, cache_ttl=EXTRACTION_CACHE_TTL, system=rendered.system,
+                       purpose="extract")
     try:
         parsed = json.loads(response)
-        
-        # Normalize amount
-        amount = parsed.get("amount")
-        if isinstance(amount, str) and amount.isdigit():
-            amount = int(amount)
-        
-        # Normalize from_account (case-insensitive, then capitalize properly)
-        from_account = parsed.get("from_account")
-        if from_account:
-            from_account_lower = from_account.lower().strip()
-            if "saving" in from_account_lower:
-                from_account = "Savings"
-            elif "current" in from_account_lower:
-                from_account = "Current"
-            else:
-                from_account = None
-        
-        # Normalize to_beneficiary (trim whitespace)
-        to_beneficiary = parsed.get("to_beneficiary")
-        if to_beneficiary:
-            to_beneficiary = to_beneficiary.strip()
-        
-        return {
-            "amount": amount,
-            "to_beneficiary": to_beneficiary,
-            "from_account": from_account,
-            "frequency": parsed.get("frequency", "one-time"),
-        }
+        return normalize_transfer_details(parsed)
     except Exception as e:
         logger.error("Failed to parse transfer details from LLM response=%s, error=%s", response, str(e))
         return {}
 
 
+def normalize_transfer_details(parsed: dict) -> dict:
+    """
+    Normalize raw transfer slots (from extraction or fused classification).
+    """
+    # Normalize amount
+    amount = parsed.get("amount")
+    if isinstance(amount, str) and amount.isdigit():
+        amount = int(amount)
+    
+    # Normalize from_account (case-insensitive, then capitalize properly)
+    from_account = parsed.get("from_account")
+    if from_account:
+        from_account_lower = from_account.lower().strip()
+        if "saving" in from_account_lower:
+            from_account = "Savings"
+        elif "current" in from_account_lower:
+            from_account = "Current"
+        else:
+            from_account = None
+    
+    # Normalize to_beneficiary (trim whitespace)
+    to_beneficiary = parsed.get("to_beneficiary")
+    if to_beneficiary:
+        to_beneficiary = to_beneficiary.strip()
+    
+    return {
+        "amount": amount,
+        "to_beneficiary": to_beneficiary,
+        "from_account": from_account,
+        "frequency": parsed.get("frequency", "one-time"),
+    }
+
+
 def handle_transfer(user_id: int, query_or_details, otp: str = None) -> dict:
     """
     Main transfer handler.
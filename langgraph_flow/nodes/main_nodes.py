@@ -7,120 +7,162 @@ Spend, FAQ, Offers, Voice, and Unknown intent handlers.
 Each enriched with contextual questions.
 """
 
+import contextvars
 import logging
-from typing import Dict, Any
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Callable
 from ..core.state import StateManager
 from ..core.constants import RESPONSE_FIELD, STATUS_FIELD, MESSAGE_FIELD
 from ..handlers.spend_insights_node import handle_spend_insight
 from ..handlers.faq_node import handle_faq
 from ..handlers.offers_node import handle_offers
 from ..handlers.voice_node import handle_voice_interaction
-from ..handlers.contextual_questions_node import handle_contextual_questions_node
+from ..handlers.contextual_questions_node import (
+    handle_contextual_questions_node, generate_static_suggestions
+)
+from utils import metrics
+from utils.latency_budget import step_timeout
 
 
 logger = logging.getLogger(__name__)
 
+# Run the handler and contextual-question generation concurrently
+NODE_PARALLEL_STAGES = os.environ.get("NODE_PARALLEL_STAGES", "1") == "1"
+
+_stage_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("NODE_STAGE_WORKERS", "8")),
+    thread_name_prefix="node-stage",
+)
+
+# Rough shape of each handler's answer, used to start suggestions before the
+# real response exists (keeps the static-suggestion keywords meaningful).
+PROVISIONAL_RESPONSES = {
+    "spend": "Here is your spending summary for: {query}",
+    "faq": "Here is the answer to your question: {query}",
+    "offers": "Here are the current offers and deals available to you.",
+}
+
 
 def _get_response_text(result: Any) -> str:
     """Extract readable response text from result."""
     return StateManager.extract_response_text(result)
 
 
-def _enrich_with_contextual_questions(
+def _timed(timings: Dict[str, float], stage: str, fn: Callable, *args, **kwargs):
+    """Run fn, recording its duration (ms) under `stage`."""
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[stage] = round(1000 * (time.perf_counter() - start), 2)
+
+
+def _run_handler_with_suggestions(
     state: Dict[str, Any],
-    handler_fn,
-    last_response: str
-) -> None:
+    intent: str,
+    handler_fn: Callable[[Any, str], Any],
+) -> Dict[str, Any]:
     """
-    Helper to enrich state with contextual questions.
+    Run an intent handler and enrich the state with contextual questions.
+    
+    With NODE_PARALLEL_STAGES the suggestion LLM call starts immediately from
+    the query and a provisional response shape, overlapping the handler's own
+    extraction/LLM work. Per-stage timings land in state["stage_timings"].
     
     Args:
         state: Agent state
-        handler_fn: The handler that was called
-        last_response: Response text from handler
+        intent: Intent name (spend/faq/offers), used for timings and provisional text
+        handler_fn: The handler to call with (user_id, user_input)
     """
-    user_id = int(state.get("user_id", 1))
-    user_input = state.get("user_input", "")
-    
-    try:
-        suggestions = handle_contextual_questions_node(
-            user_id=user_id,
-            last_query=user_input,
-            last_response=last_response,
-        )
-        state["contextual_questions"] = suggestions.get("contextual_questions", [])
-    except Exception as e:
-        logger.warning(f"Failed to get contextual questions: {e}")
-        state["contextual_questions"] = []
-
-
-def spend_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle spend/transaction insights."""
     StateManager.ensure_defaults(state)
     
     user_id = state.get("user_id", "0")
     user_input = state.get("user_input", "")
+    timings: Dict[str, float] = {}
+    wall_start = time.perf_counter()
+    
+    # Optional step: use static suggestions when the request budget is short.
+    # The parallel path decides now; the sequential one once the handler is done.
+    want_suggestions = StateManager.has_budget_for(state, "contextual_questions")
+    suggestions_future = None
+    if want_suggestions and NODE_PARALLEL_STAGES:
+        provisional = PROVISIONAL_RESPONSES.get(intent, "{query}").format(query=user_input)
+        ctx = contextvars.copy_context()
+        suggestions_future = _stage_executor.submit(
+            ctx.run, _timed, timings, "suggestions", _generate_suggestions, state, provisional
+        )
     
     try:
-        state["result"] = handle_spend_insight(user_id, user_input)
+        state["result"] = _timed(timings, "handler", handler_fn, user_id, user_input)
     except Exception as e:
-        logger.exception("spend_insight handler failed")
+        logger.exception("%s handler failed", intent)
         state["result"] = {
             STATUS_FIELD: "error",
             MESSAGE_FIELD: str(e)
         }
     
-    # Enrich with contextual questions
     response_text = _get_response_text(state.get("result"))
-    _enrich_with_contextual_questions(state, handle_spend_insight, response_text)
+    if want_suggestions and not NODE_PARALLEL_STAGES:
+        want_suggestions = StateManager.has_budget_for(state, "contextual_questions")
+    if not want_suggestions:
+        state["contextual_questions"] = generate_static_suggestions(response_text)
+    elif suggestions_future is not None:
+        try:
+            state["contextual_questions"] = suggestions_future.result(
+                timeout=step_timeout(state.get("deadline")) + 1
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get contextual questions: {e}")
+            state["contextual_questions"] = generate_static_suggestions(response_text)
+    else:
+        state["contextual_questions"] = _timed(
+            timings, "suggestions", _generate_suggestions, state, response_text
+        )
+    
+    timings["wall"] = round(1000 * (time.perf_counter() - wall_start), 2)
+    state["stage_timings"] = timings
+    for stage, ms in timings.items():
+        metrics.observe(f"stage.{intent}.{stage}", ms / 1000.0)
+    logger.debug("%s stage timings (ms): %s", intent, timings)
     
     return state
 
 
-def faq_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle FAQ/help queries."""
-    StateManager.ensure_defaults(state)
-    
-    user_id = state.get("user_id", "0")
-    user_input = state.get("user_input", "")
-    
+def _generate_suggestions(state: Dict[str, Any], last_response: str) -> list:
+    """Contextual questions via LLM, static suggestions on failure."""
     try:
-        state["result"] = handle_faq(user_id, user_input)
+        suggestions = handle_contextual_questions_node(
+            user_id=int(state.get("user_id", 1)),
+            last_query=state.get("user_input", ""),
+            last_response=last_response,
+            timeout=step_timeout(state.get("deadline")),
+        )
+        return suggestions.get("contextual_questions", [])
     except Exception as e:
-        logger.exception("faq handler failed")
-        state["result"] = {
-            STATUS_FIELD: "error",
-            MESSAGE_FIELD: str(e)
-        }
-    
-    # Enrich with contextual questions
-    response_text = _get_response_text(state.get("result"))
-    _enrich_with_contextual_questions(state, handle_faq, response_text)
-    
-    return state
+        logger.warning(f"Failed to get contextual questions: {e}")
+        return generate_static_suggestions(last_response)
+
+
+def spend_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle spend/transaction insights."""
+    # Slots from fused classification let the handler skip its extraction call
+    slots = state.get("extracted_slots")
+    state["extracted_slots"] = None
+    handler = partial(handle_spend_insight, details=slots) if slots else handle_spend_insight
+    return _run_handler_with_suggestions(state, "spend", handler)
+
+
+def faq_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle FAQ/help queries."""
+    return _run_handler_with_suggestions(state, "faq", handle_faq)
 
 
 def offers_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """Handle offers/promotions queries."""
-    StateManager.ensure_defaults(state)
-    
-    user_id = state.get("user_id", "0")
-    user_input = state.get("user_input", "")
-    
-    try:
-        state["result"] = handle_offers(user_id, user_input)
-    except Exception as e:
-        logger.exception("offers handler failed")
-        state["result"] = {
-            STATUS_FIELD: "error",
-            MESSAGE_FIELD: str(e)
-        }
-    
-    # Enrich with contextual questions
-    response_text = _get_response_text(state.get("result"))
-    _enrich_with_contextual_questions(state, handle_offers, response_text)
-    
-    return state
+    return _run_handler_with_suggestions(state, "offers", handle_offers)
 
 
 def voice_node(state: Dict[str, Any]) -> Dict[str, Any]:
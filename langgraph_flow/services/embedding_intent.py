@@ -0,0 +1,179 @@
+# langraph_flow/services/embedding_intent.py
+"""
+Local intent classifier: nearest labelled-example centroid in embedding space.
+
+Queries are embedded with the shared sentence model (utils/embedding_registry)
+and compared by cosine similarity to one centroid per intent, built from
+data/intent_examples.json. The file is re-read whenever it changes, so
+examples can be refreshed from logged traffic (INTENT_TRAFFIC_LOG_ENABLED=1,
+then utils/refresh_intent_examples.py) without a restart.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from utils import metrics
+from utils.embedding_registry import get_embedding_model
+
+logger = logging.getLogger(__name__)
+
+INTENT_EMBEDDING_ENABLED = os.environ.get("INTENT_EMBEDDING_ENABLED", "1") == "1"
+INTENT_EXAMPLES_PATH = os.environ.get("INTENT_EXAMPLES_PATH", "data/intent_examples.json")
+# Accept the nearest centroid only when it is this far ahead of the runner-up...
+INTENT_EMBED_MIN_MARGIN = float(os.environ.get("INTENT_EMBED_MIN_MARGIN", "0.08"))
+# ...and at least this similar to the query (out-of-domain text scores low everywhere)
+INTENT_EMBED_MIN_SIMILARITY = float(os.environ.get("INTENT_EMBED_MIN_SIMILARITY", "0.35"))
+# Softmax temperature turning similarities into a confidence
+INTENT_EMBED_TEMPERATURE = 0.05
+
+# Opt-in: classified queries (raw user text, so amounts and names too) are
+# appended here as JSONL raw material for new examples. Rotated like app.log.
+INTENT_TRAFFIC_LOG_ENABLED = os.environ.get("INTENT_TRAFFIC_LOG_ENABLED", "0") == "1"
+INTENT_TRAFFIC_LOG = os.environ.get("INTENT_TRAFFIC_LOG", "logs/intent_traffic.jsonl")
+INTENT_TRAFFIC_LOG_MAX_BYTES = 5 * 1024 * 1024
+INTENT_TRAFFIC_LOG_BACKUPS = 5
+
+
+class EmbeddingPrediction(NamedTuple):
+    label: str
+    confidence: float
+    margin: float
+    confident: bool
+
+
+class EmbeddingIntentClassifier:
+    """Centroid classifier over sentence embeddings, hot-reloaded from the examples file."""
+
+    def __init__(self, examples_path: str = INTENT_EXAMPLES_PATH):
+        self.examples_path = examples_path
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._labels: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._available = True
+
+    def predict(self, text: str) -> Optional[EmbeddingPrediction]:
+        """Nearest-centroid label for `text`, or None if the model/examples are unavailable."""
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: List[str]) -> List[Optional[EmbeddingPrediction]]:
+        """predict() for several texts with a single encode call (None per unusable text)."""
+        results: List[Optional[EmbeddingPrediction]] = [None] * len(texts)
+        indexes = [i for i, t in enumerate(texts) if t and t.strip()]
+        if not INTENT_EMBEDDING_ENABLED or not self._available or not indexes:
+            return results
+        try:
+            self._refresh()
+            if self._centroids is None:
+                return results
+            start = time.perf_counter()
+            queries = self._embed([texts[i] for i in indexes])
+            all_sims = queries @ self._centroids.T
+        except ImportError as e:
+            # sentence-transformers not installed: stop trying for this process
+            logger.warning(f"Embedding intent classifier disabled: {e}")
+            self._available = False
+            return results
+        except Exception as e:
+            logger.warning(f"Embedding intent classification unavailable: {e}")
+            return results
+
+        for i, sims in zip(indexes, all_sims):
+            results[i] = self._score(sims)
+        metrics.observe("intent.embedding.latency", time.perf_counter() - start)
+        return results
+
+    def _score(self, sims: np.ndarray) -> EmbeddingPrediction:
+        order = np.argsort(sims)[::-1]
+        top = float(sims[order[0]])
+        margin = top - float(sims[order[1]]) if len(order) > 1 else top
+        weights = np.exp((sims - sims.max()) / INTENT_EMBED_TEMPERATURE)
+        confidence = float(weights[order[0]] / weights.sum())
+        confident = margin >= INTENT_EMBED_MIN_MARGIN and top >= INTENT_EMBED_MIN_SIMILARITY
+        return EmbeddingPrediction(self._labels[order[0]], round(confidence, 3),
+                                   round(margin, 3), confident)
+
+    def _refresh(self) -> None:
+        """Rebuild centroids if the examples file changed since the last load."""
+        try:
+            mtime = os.path.getmtime(self.examples_path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            with open(self.examples_path, "r") as f:
+                examples: Dict[str, List[str]] = json.load(f)
+
+            labels, centroids = [], []
+            for label, texts in examples.items():
+                texts = [t for t in texts if t and t.strip()]
+                if not texts:
+                    continue
+                centroid = self._embed(texts).mean(axis=0)
+                centroids.append(centroid / np.linalg.norm(centroid))
+                labels.append(label)
+
+            self._labels = labels
+            self._centroids = np.vstack(centroids) if centroids else None
+            self._mtime = mtime
+            logger.info(f"Loaded intent centroids for {labels} from {self.examples_path}")
+
+    @staticmethod
+    def _embed(texts: List[str]) -> np.ndarray:
+        return get_embedding_model().encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        )
+
+
+_traffic_logger: Optional[logging.Logger] = None
+_traffic_lock = threading.Lock()
+
+
+def _get_traffic_logger() -> logging.Logger:
+    """Dedicated logger writing bare JSON lines to a rotating INTENT_TRAFFIC_LOG."""
+    global _traffic_logger
+    if _traffic_logger is None:
+        with _traffic_lock:
+            if _traffic_logger is None:
+                os.makedirs(os.path.dirname(INTENT_TRAFFIC_LOG) or ".", exist_ok=True)
+                handler = RotatingFileHandler(INTENT_TRAFFIC_LOG,
+                                              maxBytes=INTENT_TRAFFIC_LOG_MAX_BYTES,
+                                              backupCount=INTENT_TRAFFIC_LOG_BACKUPS)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                traffic_logger = logging.getLogger("intent.traffic")
+                traffic_logger.setLevel(logging.INFO)
+                traffic_logger.propagate = False
+                traffic_logger.addHandler(handler)
+                _traffic_logger = traffic_logger
+    return _traffic_logger
+
+
+def log_intent_traffic(query: str, intent: str, source: str, confidence: float = None) -> None:
+    """Record one classified query when INTENT_TRAFFIC_LOG_ENABLED (never raises)."""
+    if not INTENT_TRAFFIC_LOG_ENABLED or not INTENT_TRAFFIC_LOG or not query:
+        return
+    record = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "query": query,
+        "intent": str(getattr(intent, "value", intent)),
+        "source": source,
+        "confidence": confidence,
+    }
+    try:
+        _get_traffic_logger().info(json.dumps(record, ensure_ascii=False))
+    except OSError as e:
+        logger.debug(f"Could not write intent traffic log: {e}")
+
+
+embedding_intent_classifier = EmbeddingIntentClassifier()
@@ -1,23 +1,120 @@
 # langraph_flow/services/intent_classifier.py
 
+import json
 import logging
-from typing import Optional
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
 from ..core.constants import IntentType, VALID_INTENTS
-from utils.llm_connector import run_llm
+from .embedding_intent import embedding_intent_classifier, log_intent_traffic
+from utils import metrics
+from utils.batching import MicroBatcher
+from utils.cache import TTLCache
+from utils.llm_connector import run_llm, lookup_cached_llm, store_cached_llm
+from utils.prompts import BATCH_CLASSIFY, CLASSIFY, FUSED_CLASSIFY_EXTRACT, RenderedPrompt
 
 
 logger = logging.getLogger(__name__)
 
+# Classification prompts only depend on the query text, so answers are stable.
+LLM_CACHE_TTL = 24 * 60 * 60
+
+# Tiered classification (cache -> keyword -> embedding -> LLM): a tier answers
+# only when its confidence clears its bar, otherwise the next tier runs.
+INTENT_TIERS = ("cache", "keyword", "embedding", "llm", "fallback")
+# Calibrated on data/intent_holdout.json (python -m utils.calibrate_intent_threshold),
+# not on the intent examples the patterns were written from.
+INTENT_KEYWORD_THRESHOLD = float(os.environ.get("INTENT_KEYWORD_THRESHOLD", "0.8"))
+# The keyword tier answers only with this many distinct patterns matching its intent.
+KEYWORD_MIN_EVIDENCE = int(os.environ.get("INTENT_KEYWORD_MIN_EVIDENCE", "2"))
+INTENT_PHRASE_CACHE_SIZE = int(os.environ.get("INTENT_PHRASE_CACHE_SIZE", "4096"))
+# Keyword confidence = top / (top + runner-up + smoothing): a lone weak match stays unsure.
+KEYWORD_SMOOTHING = 0.5
+# Questions about an action ("how do I transfer money ...") are usually FAQ, so
+# action intents score less when the query is phrased as a question.
+ACTION_INTENTS = (IntentType.TRANSFER,)
+QUESTION_ACTION_PENALTY = 0.5
+_QUESTION_FORM_RE = re.compile(
+    r"^(how|what|why|when|where|which|can|could|do|does|is|are|should|will)\b"
+)
+# The LLM returns a bare label; agreeing with a local tier's best guess counts as stronger evidence.
+LLM_CONFIDENCE = 0.75
+LLM_AGREEMENT_CONFIDENCE = 0.9
+
+# Concurrent classification requests are merged into one batched LLM prompt.
+INTENT_BATCH_ENABLED = os.environ.get("INTENT_BATCH_ENABLED", "1") == "1"
+INTENT_BATCH_MAX_SIZE = int(os.environ.get("INTENT_BATCH_MAX_SIZE", "8"))
+INTENT_BATCH_MAX_WAIT_MS = float(os.environ.get("INTENT_BATCH_MAX_WAIT_MS", "5"))
+# classify_many() sends its LLM residue in numbered prompts of this many queries.
+INTENT_MANY_LLM_CHUNK = int(os.environ.get("INTENT_MANY_LLM_CHUNK", "16"))
+
+_BATCH_LINE_RE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*\W*([a-z]+)")
+
+# One LLM call returns both the intent and its slots (skips the separate
+# transfer/spend extraction call downstream).
+FUSED_INTENT_EXTRACTION = os.environ.get("FUSED_INTENT_EXTRACTION", "0") == "1"
+# The fused prompt embeds today's date, so keys roll over at midnight anyway.
+FUSED_CACHE_TTL = 60 * 60
+
+# Slots kept per intent, and those required before extraction can be skipped
+SLOT_KEYS = {
+    IntentType.TRANSFER: ("amount", "to_beneficiary", "from_account", "frequency"),
+    IntentType.SPEND: ("category", "start_date", "end_date", "merchant"),
+}
+REQUIRED_SLOTS = {
+    IntentType.TRANSFER: ("amount", "to_beneficiary"),
+    IntentType.SPEND: (),
+}
+
+
+class IntentResult(NamedTuple):
+    intent: str
+    confidence: float
+    tier: str
+
+
+class KeywordScore(NamedTuple):
+    intent: Optional[str]
+    confidence: float
+    evidence: int   # distinct patterns matched for `intent`
+
+    @property
+    def confident(self) -> bool:
+        """Strong enough for the keyword tier to answer."""
+        return (self.intent is not None and self.evidence >= KEYWORD_MIN_EVIDENCE
+                and self.confidence >= INTENT_KEYWORD_THRESHOLD)
+
 
 class IntentClassifier:
     """Centralized intent classification service with fallback heuristics."""
 
-    # Simple keyword-based fallback heuristics
-    KEYWORD_FALLBACKS = {
-        IntentType.TRANSFER: ["transfer", "send", "pay", "remit"],
-        IntentType.SPEND: ["spend", "transactions", "spending", "expense"],
-        IntentType.OFFERS: ["offer", "discount", "promo", "deal", "coupon"],
-        IntentType.FAQ: ["how", "what", "why", "when", "where", "faq", "help"],
+    # Weighted keyword/regex evidence per intent. Generic question words weigh
+    # little, so "how much did I spend" is spend rather than FAQ.
+    KEYWORD_PATTERNS = {
+        IntentType.TRANSFER: [
+            (re.compile(r"\b(transfer|send|remit)\b"), 3.0),
+            (re.compile(r"\bpay\b"), 2.0),
+            (re.compile(r"\b\d+(\.\d+)?\b.*\bto\b"), 1.5),
+            (re.compile(r"\bmoney\b"), 1.0),
+        ],
+        IntentType.SPEND: [
+            (re.compile(r"\bspen[dt]\w*"), 3.0),
+            (re.compile(r"\b(transactions?|expenses?)\b"), 3.0),
+            (re.compile(r"\b(merchants?|breakdown)\b"), 2.0),
+            (re.compile(r"\bhow much\b"), 1.0),
+        ],
+        IntentType.OFFERS: [
+            (re.compile(r"\b(offers?|discounts?|promos?|deals?|coupons?|cashback)\b"), 3.0),
+            (re.compile(r"\b(rewards?|promotions?)\b"), 2.0),
+        ],
+        IntentType.FAQ: [
+            (re.compile(r"\b(faq|help)\b"), 1.5),
+            (re.compile(r"\b(appointment|password|branch|documents?|statement|charges?|fees?)\b"), 1.5),
+            (re.compile(r"^(how|what|why|when|where)\b"), 0.5),
+        ],
     }
 
     @staticmethod
@@ -25,50 +122,369 @@ class IntentClassifier:
         """
         Classify user input to one of valid intents.
 
-        Uses LLM with keyword fallback.
         Returns: One of VALID_INTENTS or IntentType.UNKNOWN
         """
+        return IntentClassifier.classify_with_confidence(user_input).intent
+
+    @staticmethod
+    def classify_with_confidence(user_input: str) -> IntentResult:
+        """
+        Classify through the tiers, stopping at the first confident one:
+
+        1. cache     - exact (normalized) phrase answered before
+        2. keyword   - weighted keyword/regex scores
+        3. embedding - nearest labelled-example centroid
+        4. llm       - model label
+        5. fallback  - best keyword guess (or unknown), low confidence
+        """
         if not user_input or not user_input.strip():
-            return IntentType.UNKNOWN
+            return IntentResult(IntentType.UNKNOWN, 0.0, "fallback")
+
+        phrase = _normalize_phrase(user_input)
+        start = time.perf_counter()
+        cached = _phrase_cache.get(phrase)
+        _record_tier("cache", start, cached is not None)
+        if cached is not None:
+            return IntentResult(cached[0], cached[1], "cache")
+
+        guesses = set()
+        start = time.perf_counter()
+        keyword = IntentClassifier._score_keywords(user_input)
+        _record_tier("keyword", start, keyword.confident)
+        if keyword.confident:
+            return _accept(user_input, phrase,
+                           IntentResult(keyword.intent, keyword.confidence, "keyword"))
+        if keyword.intent:
+            guesses.add(keyword.intent)
 
-        # Try LLM classification first
-        llm_result = IntentClassifier._classify_with_llm(user_input)
-        if llm_result and llm_result in VALID_INTENTS:
-            return llm_result
+        start = time.perf_counter()
+        prediction = embedding_intent_classifier.predict(user_input)
+        hit = bool(prediction and prediction.confident)
+        _record_tier("embedding", start, hit)
+        if hit:
+            return _accept(user_input, phrase,
+                           IntentResult(prediction.label, prediction.confidence, "embedding"))
+        if prediction:
+            guesses.add(prediction.label)
 
-        # Fallback to keyword heuristics
-        return IntentClassifier._classify_with_keywords(user_input)
+        start = time.perf_counter()
+        llm_label = IntentClassifier._classify_with_llm(user_input)
+        _record_tier("llm", start, llm_label in VALID_INTENTS)
+        keyword_guess = (keyword.intent, keyword.confidence) if keyword.intent else None
+        return IntentClassifier._llm_or_fallback(user_input, phrase, llm_label, guesses,
+                                                 keyword_guess)
+
+    @staticmethod
+    def classify_many(user_inputs: List[str]) -> Iterator[IntentResult]:
+        """
+        classify_with_confidence() for a batch, yielded in input order.
+
+        Repeated phrases are classified once. The cache and keyword tiers run
+        per phrase, the embedding tier encodes all remaining phrases in one
+        call, and only what is still unsure reaches the LLM, in numbered
+        prompts of INTENT_MANY_LLM_CHUNK queries. A result is yielded as soon
+        as it and every earlier input are resolved, so callers can stream.
+        """
+        phrases = [_normalize_phrase(q or "") for q in user_inputs]
+        texts: Dict[str, str] = {}
+        for user_input, phrase in zip(user_inputs, phrases):
+            if phrase:
+                texts.setdefault(phrase, user_input)
+        metrics.increment("intent.many.queries", len(user_inputs))
+        metrics.increment("intent.many.unique", len(texts))
+
+        resolved: Dict[str, IntentResult] = {}
+        keyword_guesses: Dict[str, Tuple[str, float]] = {}
+        guesses: Dict[str, Set[str]] = {phrase: set() for phrase in texts}
+
+        start = time.perf_counter()
+        for phrase in texts:
+            cached = _phrase_cache.get(phrase)
+            if cached is not None:
+                resolved[phrase] = IntentResult(cached[0], cached[1], "cache")
+        _record_tier("cache", start, len(resolved), len(texts))
+
+        pending = [p for p in texts if p not in resolved]
+        start, hits = time.perf_counter(), 0
+        for phrase in pending:
+            keyword = IntentClassifier._score_keywords(texts[phrase])
+            if keyword.confident:
+                resolved[phrase] = _accept(texts[phrase], phrase,
+                                           IntentResult(keyword.intent, keyword.confidence, "keyword"))
+                hits += 1
+            elif keyword.intent:
+                keyword_guesses[phrase] = (keyword.intent, keyword.confidence)
+                guesses[phrase].add(keyword.intent)
+        _record_tier("keyword", start, hits, len(pending))
+
+        pending = [p for p in texts if p not in resolved]
+        start, hits = time.perf_counter(), 0
+        predictions = embedding_intent_classifier.predict_many([texts[p] for p in pending])
+        for phrase, prediction in zip(pending, predictions):
+            if prediction and prediction.confident:
+                resolved[phrase] = _accept(
+                    texts[phrase], phrase,
+                    IntentResult(prediction.label, prediction.confidence, "embedding"),
+                )
+                hits += 1
+            elif prediction:
+                guesses[phrase].add(prediction.label)
+        _record_tier("embedding", start, hits, len(pending))
+
+        residue = [p for p in texts if p not in resolved]
+        chunks = iter([
+            residue[i:i + INTENT_MANY_LLM_CHUNK]
+            for i in range(0, len(residue), max(1, INTENT_MANY_LLM_CHUNK))
+        ])
+        for phrase in phrases:
+            if not phrase:
+                yield IntentResult(IntentType.UNKNOWN, 0.0, "fallback")
+                continue
+            while phrase not in resolved:
+                chunk = next(chunks)
+                labels = IntentClassifier._classify_many_with_llm([texts[p] for p in chunk])
+                for p, label in zip(chunk, labels):
+                    resolved[p] = IntentClassifier._llm_or_fallback(
+                        texts[p], p, label, guesses[p], keyword_guesses.get(p)
+                    )
+            yield resolved[phrase]
+
+    @staticmethod
+    def classify_with_slots(user_input: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Classify and extract slots with a single structured-output LLM call.
+
+        Returns (intent, slots). slots is None unless the intent is transfer
+        or spend and the model returned usable values; callers then run
+        their own extraction as before. Falls back to classify() when the
+        fused output cannot be parsed.
+        """
+        if not user_input or not user_input.strip():
+            return IntentType.UNKNOWN, None
+
+        today_str = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d")
+        rendered = FUSED_CLASSIFY_EXTRACT.render(today=today_str, query=user_input)
+        raw = ""
+        try:
+            raw = run_llm(rendered.prompt, cache_ttl=FUSED_CACHE_TTL, system=rendered.system,
+                          purpose="extract")
+            if not raw:
+                # The model itself failed; don't pay for a second LLM call.
+                return IntentClassifier._classify_with_keywords(user_input), None
+            cleaned = re.sub(r"^[^\{]*\{", "{", raw.strip(), count=1)
+            cleaned = re.sub(r"\}[^}]*$", "}", cleaned, count=1)
+            parsed = json.loads(cleaned)
+            intent = str(parsed.get("intent", "")).strip().lower()
+            slots = parsed.get("slots") or {}
+        except Exception as e:
+            logger.warning(f"Fused classification failed ({e}); raw={raw!r}")
+            return IntentClassifier.classify(user_input), None
+
+        if intent not in VALID_INTENTS or not isinstance(slots, dict):
+            return IntentClassifier.classify(user_input), None
+
+        keys = SLOT_KEYS.get(intent)
+        if not keys:
+            return intent, None
+        kept = {k: slots.get(k) for k in keys}
+        if any(kept.get(k) in (None, "") for k in REQUIRED_SLOTS.get(intent, ())):
+            return intent, None
+
+        logger.info(f"Fused LLM classified '{user_input[:30]}...' as {intent} with slots {kept}")
+        return intent, kept
+
+    @staticmethod
+    def _llm_or_fallback(user_input: str, phrase: str, llm_label: Optional[str],
+                         guesses: Set[str],
+                         keyword_guess: Optional[Tuple[str, float]]) -> IntentResult:
+        """Final tiers: accept the LLM label, else fall back to the best keyword guess."""
+        if llm_label in VALID_INTENTS:
+            confidence = LLM_AGREEMENT_CONFIDENCE if llm_label in guesses else LLM_CONFIDENCE
+            return _accept(user_input, phrase, IntentResult(llm_label, confidence, "llm"))
+
+        _record_tier("fallback", time.perf_counter(), True)
+        if keyword_guess:
+            return IntentResult(keyword_guess[0], keyword_guess[1], "fallback")
+        return IntentResult(IntentType.UNKNOWN, 0.0, "fallback")
+
+    @staticmethod
+    def _classify_many_with_llm(user_inputs: List[str]) -> List[Optional[str]]:
+        """LLM labels for a classify_many() chunk; cached answers skip the prompt."""
+        start = time.perf_counter()
+        labels: List[Optional[str]] = [None] * len(user_inputs)
+        misses = []
+        for i, user_input in enumerate(user_inputs):
+            rendered = IntentClassifier._classification_prompt(user_input)
+            cached = lookup_cached_llm(rendered.prompt, rendered.system, purpose="classify")
+            label = cached.strip().lower() if cached is not None else None
+            if label in VALID_INTENTS:
+                labels[i] = label
+            else:
+                misses.append(i)
+        if misses:
+            answers = IntentClassifier._classify_batch_with_llm([user_inputs[i] for i in misses])
+            for i, label in zip(misses, answers):
+                labels[i] = label
+        _record_tier("llm", start, sum(label in VALID_INTENTS for label in labels), len(labels))
+        return labels
+
+    @staticmethod
+    def _classification_prompt(user_input: str) -> RenderedPrompt:
+        return CLASSIFY.render(query=user_input)
+
+    @staticmethod
+    def _batch_classification_prompt(user_inputs: List[str]) -> RenderedPrompt:
+        numbered = "\n".join(f'{i}. "{q}"' for i, q in enumerate(user_inputs, start=1))
+        return BATCH_CLASSIFY.render(numbered=numbered)
 
     @staticmethod
     def _classify_with_llm(user_input: str) -> Optional[str]:
-        """Try to classify using LLM."""
-        prompt = f"""Classify this user query into exactly one category: spend, faq, offers, transfer, or unknown.
-Query: "{user_input}"
-Return ONLY the single-word category label, nothing else."""
+        """Try to classify using LLM (micro-batched with concurrent callers)."""
+        if not INTENT_BATCH_ENABLED:
+            return IntentClassifier._classify_batch_with_llm([user_input])[0]
+
+        # Cache hits never need to wait for a batch.
+        rendered = IntentClassifier._classification_prompt(user_input)
+        cached = lookup_cached_llm(rendered.prompt, rendered.system, purpose="classify")
+        if cached is not None:
+            label = cached.strip().lower()
+            return label if label in VALID_INTENTS else None
 
         try:
-            raw = run_llm(prompt)
-            if raw:
-                label = raw.strip().lower()
-                if label in VALID_INTENTS:
-                    logger.info(f"LLM classified '{user_input[:30]}...' as {label}")
-                    return label
+            return _llm_batcher.submit(user_input)
         except Exception as e:
-            logger.warning(f"LLM classification failed: {e}")
+            logger.warning(f"Batched LLM classification failed: {e}")
+            return None
 
-        return None
+    @staticmethod
+    def _classify_batch_with_llm(user_inputs: List[str]) -> List[Optional[str]]:
+        """
+        Classify several queries with one LLM call.
+
+        A single query uses the plain (cacheable) prompt; larger batches use a
+        numbered prompt and each parsed label is written back to the cache
+        under its single-query prompt.
+        """
+        if len(user_inputs) == 1:
+            user_input = user_inputs[0]
+            try:
+                rendered = IntentClassifier._classification_prompt(user_input)
+                raw = run_llm(rendered.prompt, cache_ttl=LLM_CACHE_TTL, system=rendered.system,
+                              purpose="classify")
+                if raw:
+                    label = raw.strip().lower()
+                    if label in VALID_INTENTS:
+                        logger.info(f"LLM classified '{user_input[:30]}...' as {label}")
+                        return [label]
+            except Exception as e:
+                logger.warning(f"LLM classification failed: {e}")
+            return [None]
+
+        labels: List[Optional[str]] = [None] * len(user_inputs)
+        try:
+            rendered = IntentClassifier._batch_classification_prompt(user_inputs)
+            # "<n>: <label>" is a handful of tokens per query
+            raw = run_llm(rendered.prompt, system=rendered.system, purpose="classify",
+                          options={"num_predict": 8 * len(user_inputs)})
+        except Exception as e:
+            logger.warning(f"Batched LLM classification failed: {e}")
+            return labels
+
+        for line in (raw or "").splitlines():
+            match = _BATCH_LINE_RE.match(line.lower())
+            if not match:
+                continue
+            idx = int(match.group(1)) - 1
+            label = match.group(2)
+            if 0 <= idx < len(labels) and label in VALID_INTENTS:
+                labels[idx] = label
+                single = IntentClassifier._classification_prompt(user_inputs[idx])
+                store_cached_llm(single.prompt, label, LLM_CACHE_TTL, single.system,
+                                 purpose="classify")
+
+        logger.info(f"LLM batch-classified {len(user_inputs)} queries: {labels}")
+        return labels
+
+    @staticmethod
+    def _score_keywords(user_input: str) -> KeywordScore:
+        """Best keyword intent, its confidence and evidence count (None when nothing matches)."""
+        text = user_input.lower()
+        question = bool(_QUESTION_FORM_RE.match(text.strip()))
+        scores, evidence = {}, {}
+        for intent, patterns in IntentClassifier.KEYWORD_PATTERNS.items():
+            matched = [weight for pattern, weight in patterns if pattern.search(text)]
+            score = sum(matched)
+            if question and intent in ACTION_INTENTS:
+                score *= QUESTION_ACTION_PENALTY
+            scores[intent], evidence[intent] = score, len(matched)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        (best, top), (_, second) = ranked[0], ranked[1]
+        if top <= 0:
+            return KeywordScore(None, 0.0, 0)
+        return KeywordScore(best, round(top / (top + second + KEYWORD_SMOOTHING), 3), evidence[best])
 
     @staticmethod
     def _classify_with_keywords(user_input: str) -> str:
         """Fallback keyword-based classification."""
-        user_lower = user_input.lower()
+        label, confidence, _ = IntentClassifier._score_keywords(user_input)
+        if label is None:
+            return IntentType.UNKNOWN
+        logger.debug(
+            f"Keyword fallback classified '{user_input[:30]}...' as {label} ({confidence})"
+        )
+        return label
+
+
+# Exact-phrase cache of confident answers: normalized phrase -> (intent, confidence)
+_phrase_cache = TTLCache(max_size=INTENT_PHRASE_CACHE_SIZE, default_ttl=LLM_CACHE_TTL)
+
+
+def _normalize_phrase(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _record_tier(tier: str, start: float, hits: int, attempts: int = 1) -> None:
+    """Tier counters; for a batch the latency is recorded per query."""
+    if attempts <= 0:
+        return
+    metrics.increment(f"intent.tier.{tier}.attempts", attempts)
+    if hits:
+        metrics.increment(f"intent.tier.{tier}.hits", int(hits))
+    metrics.observe(f"intent.tier.{tier}.latency", (time.perf_counter() - start) / attempts)
+
+
+def _accept(user_input: str, phrase: str, result: IntentResult) -> IntentResult:
+    """Remember a confident answer for the phrase cache and the traffic log."""
+    _phrase_cache.set(phrase, (result.intent, result.confidence))
+    log_intent_traffic(user_input, result.intent, result.tier, result.confidence)
+    logger.info(
+        f"{result.tier} tier classified '{user_input[:30]}...' as {result.intent} "
+        f"(confidence={result.confidence})"
+    )
+    return result
+
+
+def get_tier_stats() -> Dict[str, Dict[str, float]]:
+    """Per-tier attempts, hits, hit rate and latency."""
+    timings = metrics.snapshot()["timings"]
+    stats = {}
+    for tier in INTENT_TIERS:
+        attempts = metrics.get_counter(f"intent.tier.{tier}.attempts")
+        hits = metrics.get_counter(f"intent.tier.{tier}.hits")
+        latency = timings.get(f"intent.tier.{tier}.latency", {})
+        stats[tier] = {
+            "attempts": attempts,
+            "hits": hits,
+            "hit_rate": round(hits / attempts, 3) if attempts else 0.0,
+            "avg_ms": latency.get("avg_ms", 0.0),
+            "max_ms": latency.get("max_ms", 0.0),
+        }
+    return stats
 
-        # Check keyword matches
-        for intent, keywords in IntentClassifier.KEYWORD_FALLBACKS.items():
-            if any(keyword in user_lower for keyword in keywords):
-                logger.debug(
-                    f"Keyword fallback classified '{user_input[:30]}...' as {intent}"
-                )
-                return intent
 
-        return IntentType.UNKNOWN
+_llm_batcher = MicroBatcher(
+    IntentClassifier._classify_batch_with_llm,
+    max_batch_size=INTENT_BATCH_MAX_SIZE,
+    max_wait_ms=INTENT_BATCH_MAX_WAIT_MS,
+    name="intent.batch",
+)
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Keep test logs out of logs/app.log (utils.logger reads LOG_PATH at import)
+os.environ.setdefault("LOG_PATH", os.path.join(tempfile.mkdtemp(prefix="vfa-tests-"), "app.log"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def fake_ollama_cli(tmp_path, monkeypatch):
+    """An `ollama` executable on PATH that echoes its prompt ("sleep" hangs)."""
+    script = tmp_path / "ollama"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        "prompt = sys.stdin.read()\n"
+        "if 'sleep' in prompt:\n"
+        "    time.sleep(30)\n"
+        "print('echo: ' + prompt, flush=True)\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+@pytest.fixture
+def fake_llm():
+    """The deterministic fake backend (no latency) as the active LLM, with an empty response cache."""
+    from utils import llm_connector
+    from utils.llm_fake_backend import FakeBackend
+
+    backend = FakeBackend(latency_ms=0, jitter_ms=0)
+    previous = llm_connector._active_backend
+    llm_connector.register_backend(FakeBackend.name, lambda: backend)
+    llm_connector.set_backend(FakeBackend.name)
+    llm_connector.llm_cache.clear()
+    yield backend
+    llm_connector.register_backend(FakeBackend.name, FakeBackend)
+    llm_connector.set_backend(previous)
+    llm_connector.llm_cache.clear()
@@ -0,0 +1,45 @@
+"""Importing api/main.py (as spawned extraction workers do) has no background side effects."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+for module in ("flask_cors", "fitz", "docx", "chromadb"):
+    pytest.importorskip(module)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a spawn worker does: re-run the parent's main script as __mp_main__
+WORKER_IMPORT = """
+import json, runpy, sys, threading, time
+sys.path.insert(0, {root!r})
+import tools.faq_tool as faq_tool
+calls = []
+faq_tool.sync_vector_store = lambda *a, **k: calls.append("sync")
+faq_tool.ensure_vector_store = lambda *a, **k: calls.append("ensure")
+module = runpy.run_path({main!r}, run_name="__mp_main__")
+time.sleep(0.3)
+print(json.dumps({{
+    "threads": [t.name for t in threading.enumerate()],
+    "calls": calls,
+    "components": module["warmup_status"]["components"],
+}}))
+"""
+
+
+def test_worker_import_starts_no_warmup_or_index_sync(tmp_path):
+    env = dict(os.environ, WARMUP_ENABLED="1", FAQ_WATCH_ENABLED="1", FAQ_WATCH_INTERVAL_S="0.05",
+               LOG_PATH=str(tmp_path / "app.log"))
+    script = WORKER_IMPORT.format(root=REPO_ROOT, main=os.path.join(REPO_ROOT, "api", "main.py"))
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert "warmup" not in report["threads"]
+    assert "faq-index-watch" not in report["threads"]
+    assert report["calls"] == []
+    assert report["components"] == {}
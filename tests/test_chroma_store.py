@@ -0,0 +1,59 @@
+"""ChromaStore: one client and collection per process, populated flag tracked in memory."""
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("docx")
+pytest.importorskip("chromadb")
+
+from tools import faq_tool  # noqa: E402
+
+
+class FakeClient:
+    opened = []
+
+    def __init__(self, path):
+        FakeClient.opened.append(path)
+        self.counts = 0
+
+    def get_or_create_collection(self, name, metadata=None):
+        client = self
+
+        class Collection:
+            def count(self):
+                client.counts += 1
+                return 3
+
+        return Collection()
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    FakeClient.opened = []
+    monkeypatch.setattr(faq_tool.chromadb, "PersistentClient", FakeClient)
+    return faq_tool.ChromaStore(str(tmp_path / "db"), "faqs")
+
+
+def test_client_and_collection_are_opened_once(store):
+    first = store.collection()
+
+    assert store.collection() is first
+    assert FakeClient.opened == [store.path]
+
+
+def test_populated_is_counted_once_then_tracked(store):
+    assert store.is_populated()
+    assert store.is_populated()
+    assert store._client.counts == 1
+
+    store.mark_populated(False)
+    assert not store.is_populated()
+    assert store._client.counts == 1
+
+
+def test_close_reopens_on_next_use(store):
+    first = store.collection()
+    store.close()
+
+    assert store.collection() is not first
+    assert len(FakeClient.opened) == 2
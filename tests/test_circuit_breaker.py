@@ -0,0 +1,88 @@
+"""CircuitBreaker states, and how LLM calls consult it before the fair limiter."""
+
+import time
+
+import pytest
+
+from utils import llm_connector
+from utils.circuit_breaker import CircuitBreaker
+from utils.concurrency import FairLimiter
+
+def test_breaker_opens_after_threshold_and_recovers():
+    breaker = CircuitBreaker("test.recover", failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # the single probe
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker("test.reopen", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_breaker_released_probe_frees_the_slot():
+    breaker = CircuitBreaker("test.release", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_breaker_abandoned_probe_times_out():
+    breaker = CircuitBreaker("test.probe_timeout", failure_threshold=1,
+                             recovery_timeout=0.05, probe_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()           # probe that never reports back
+    time.sleep(0.06)
+    assert not breaker.allow()
+    assert breaker.state == "open"   # counted as a failed probe
+
+
+@pytest.fixture
+def busy_llm(monkeypatch):
+    """A tripped breaker and a limiter whose only slot is taken."""
+    breaker = CircuitBreaker("test.llm", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    limiter = FairLimiter(1, name="test.llm_limiter")
+    assert limiter.acquire_blocking()
+    monkeypatch.setattr(llm_connector, "llm_breaker", breaker)
+    monkeypatch.setattr(llm_connector, "llm_limiter", limiter)
+    return breaker, limiter
+
+
+def test_open_breaker_fails_fast_without_queueing(busy_llm):
+    breaker, limiter = busy_llm
+
+    start = time.monotonic()
+    assert llm_connector.run_llm("hi", timeout=5) == ""
+    assert list(llm_connector.stream_llm("hi", timeout=5)) == []
+    assert time.monotonic() - start < 1
+    assert limiter.waiting == 0
+
+
+def test_probe_without_a_slot_is_released(busy_llm):
+    breaker, limiter = busy_llm
+    time.sleep(0.06)
+
+    assert llm_connector.run_llm("hi", timeout=0.05) == ""
+    assert list(llm_connector.stream_llm("hi", timeout=0.05)) == []
+
+    # The unserved probes gave their half-open slot back
+    assert breaker.state == "half_open"
+    assert breaker.allow()
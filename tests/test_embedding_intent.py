@@ -0,0 +1,102 @@
+"""EmbeddingIntentClassifier centroids, hot reload, and the opt-in traffic log."""
+
+import json
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from langgraph_flow.services import embedding_intent
+from langgraph_flow.services.embedding_intent import EmbeddingIntentClassifier
+
+VOCABULARY = ["transfer", "send", "spend", "spent", "offer", "deal"]
+
+
+class KeywordEncoder:
+    """One dimension per vocabulary word plus a small shared one, normalized."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True):
+        self.calls += 1
+        rows = []
+        for text in texts:
+            words = text.lower().split()
+            row = np.array([float(w in words) for w in VOCABULARY] + [0.2])
+            rows.append(row / np.linalg.norm(row))
+        return np.array(rows)
+
+
+@pytest.fixture
+def classifier(tmp_path, monkeypatch):
+    encoder = KeywordEncoder()
+    monkeypatch.setattr(embedding_intent, "get_embedding_model", lambda: encoder)
+    path = tmp_path / "examples.json"
+    path.write_text(json.dumps({
+        "transfer": ["transfer money", "send cash"],
+        "spend": ["what did i spend", "money spent"],
+    }))
+    return EmbeddingIntentClassifier(str(path)), path, encoder
+
+
+def test_nearest_centroid_is_confident(classifier):
+    clf, _, _ = classifier
+
+    prediction = clf.predict("please transfer it")
+
+    assert prediction.label == "transfer"
+    assert prediction.confident
+    assert prediction.confidence > 0.5
+
+
+def test_out_of_domain_text_is_not_confident(classifier):
+    clf, _, _ = classifier
+
+    prediction = clf.predict("good morning")
+
+    assert prediction is not None and not prediction.confident
+
+
+def test_predict_many_encodes_once_and_skips_blank_text(classifier):
+    clf, _, encoder = classifier
+    clf.predict("warm up")
+    calls = encoder.calls
+
+    results = clf.predict_many(["send it", "", "spent"])
+
+    assert [r.label if r else None for r in results] == ["transfer", None, "spend"]
+    assert encoder.calls == calls + 1
+
+
+def test_examples_file_is_reloaded_when_it_changes(classifier):
+    clf, path, _ = classifier
+    assert clf.predict("any deal").label != "offers"
+
+    path.write_text(json.dumps({"transfer": ["transfer money"], "offers": ["offer deal"]}))
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+    assert clf.predict("any deal").label == "offers"
+
+
+@pytest.fixture
+def traffic_log(tmp_path, monkeypatch):
+    path = tmp_path / "traffic.jsonl"
+    monkeypatch.setattr(embedding_intent, "INTENT_TRAFFIC_LOG", str(path))
+    monkeypatch.setattr(embedding_intent, "_traffic_logger", None)
+    yield path
+    for handler in list(logging.getLogger("intent.traffic").handlers):
+        logging.getLogger("intent.traffic").removeHandler(handler)
+        handler.close()
+
+
+def test_traffic_log_is_opt_in(traffic_log, monkeypatch):
+    embedding_intent.log_intent_traffic("send 5 to bob", "transfer", "keyword", 0.9)
+    assert not traffic_log.exists()
+
+    monkeypatch.setattr(embedding_intent, "INTENT_TRAFFIC_LOG_ENABLED", True)
+    embedding_intent.log_intent_traffic("send 5 to bob", "transfer", "keyword", 0.9)
+
+    record = json.loads(traffic_log.read_text())
+    assert (record["query"], record["intent"], record["source"]) == ("send 5 to bob", "transfer", "keyword")
@@ -0,0 +1,63 @@
+"""Shared embedding models: one load per name, even under concurrent first use."""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from utils import embedding_registry
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """A stand-in sentence_transformers module recording each model load."""
+    loaded = []
+
+    class SentenceTransformer:
+        def __init__(self, name):
+            time.sleep(0.05)
+            loaded.append(name)
+            self.name = name
+
+        def parameters(self):
+            return []
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=SentenceTransformer))
+    monkeypatch.setattr(embedding_registry, "_models", {})
+    monkeypatch.setattr(embedding_registry, "_model_info", {})
+    monkeypatch.setattr(embedding_registry, "_load_locks", {})
+    return loaded
+
+
+def test_concurrent_first_use_loads_once(loads):
+    models = []
+    barrier = threading.Barrier(8)
+
+    def get():
+        barrier.wait()
+        models.append(embedding_registry.get_embedding_model("model-a"))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert loads == ["model-a"]
+    assert len(models) == 8 and all(m is models[0] for m in models)
+
+
+def test_each_name_is_loaded_and_reported_separately(loads):
+    a = embedding_registry.get_embedding_model("model-a")
+    b = embedding_registry.get_embedding_model("model-b")
+
+    assert a is not b
+    assert embedding_registry.get_embedding_model("model-a") is a
+    assert loads == ["model-a", "model-b"]
+    info = embedding_registry.get_loaded_models()
+    assert set(info) == {"model-a", "model-b"}
+    assert info["model-a"]["load_s"] >= 0.05
+    assert info["model-a"]["params_mb"] == 0.0
@@ -0,0 +1,127 @@
+"""FairLimiter ordering and slots, and the per-user keys the API queues LLM calls under."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import llm_connector
+from utils.concurrency import FairLimiter
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def test_fair_limiter_serves_keys_round_robin():
+    async def scenario():
+        limiter = FairLimiter(1, name="test.fair")
+        await limiter.acquire("holder")
+        order = []
+
+        async def call(key, tag):
+            await limiter.acquire(key)
+            order.append(tag)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        tasks = [asyncio.create_task(call("a", f"a{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("b", "b0")))
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        return order, limiter.active
+
+    order, active = asyncio.run(scenario())
+    assert order == ["a0", "b0", "a1", "a2"]
+    assert active == 0
+
+
+def test_fair_limiter_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        limiter = FairLimiter(1, name="test.cancel")
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire("a"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        return limiter.active, limiter.waiting
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_fair_limiter_threads_share_the_round_robin_queue():
+    limiter = FairLimiter(1, name="test.threads")
+    assert limiter.acquire_blocking("holder")
+    order = []
+
+    def call(key, tag):
+        with limiter.slot(key, timeout=5) as acquired:
+            assert acquired
+            order.append(tag)
+
+    threads = []
+    for key, tag in [("a", "a0"), ("a", "a1"), ("a", "a2"), ("b", "b0")]:
+        thread = threading.Thread(target=call, args=(key, tag))
+        thread.start()
+        threads.append(thread)
+        _wait_until(lambda: limiter.waiting == len(threads))
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["a0", "b0", "a1", "a2"]
+    assert limiter.active == 0
+
+
+def test_fair_limiter_blocking_acquire_times_out():
+    limiter = FairLimiter(1, name="test.timeout")
+    assert limiter.acquire_blocking()
+
+    start = time.monotonic()
+    assert limiter.acquire_blocking("late", timeout=0.05) is False
+    assert time.monotonic() - start < 1
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.active == 0
+    with limiter.slot() as acquired:
+        assert acquired and limiter.active == 1
+    assert limiter.active == 0
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    for module in ("flask_cors", "fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from api import main
+
+    keys = []
+
+    def handler(user_id, query):
+        keys.append(llm_connector._llm_user.get())
+        return {"status": "ok", "answer": query}
+
+    for name in ("handle_faq", "handle_offers", "handle_spend_insight"):
+        monkeypatch.setattr(main, name, handler)
+    monkeypatch.setattr(main, "format_spend_response", lambda insight: insight)
+    return main.app.test_client(), keys
+
+
+@pytest.mark.parametrize("path", ["/faq", "/faq/stream", "/offers", "/spend"])
+def test_direct_handler_endpoints_queue_llm_calls_under_the_user(api_client, path):
+    client, keys = api_client
+
+    response = client.post(path, json={"user_id": 42, "query": "hello"})
+    response.get_data()
+
+    assert response.status_code == 200
+    assert keys == ["42"]
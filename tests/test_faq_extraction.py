@@ -0,0 +1,49 @@
+"""iter_extracted_files: order, split PDFs and per-file failures."""
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("docx")
+pytest.importorskip("chromadb")
+
+from tools import faq_tool  # noqa: E402
+
+
+@pytest.fixture
+def split_pdf(monkeypatch):
+    """big.pdf split into three page-range tasks around a small.docx."""
+    tasks = [("big.pdf", (0, 2)), ("big.pdf", (2, 4)), ("big.pdf", (4, 5)), ("small.docx", None)]
+    monkeypatch.setattr(faq_tool, "_extraction_tasks", lambda paths: tasks)
+    monkeypatch.setattr(faq_tool, "extract_file", lambda path: [{"text": path}])
+
+
+def test_split_pdf_chunks_are_joined_in_page_order(split_pdf, monkeypatch):
+    monkeypatch.setattr(faq_tool, "extract_text_from_pdf",
+                        lambda path, first, last: [{"text": f"p{n}"} for n in range(first, last)])
+
+    results = dict(faq_tool.iter_extracted_files(["big.pdf", "small.docx"], workers=1))
+
+    assert [c["text"] for c in results["big.pdf"]] == ["p0", "p1", "p2", "p3", "p4"]
+    assert results["small.docx"] == [{"text": "small.docx"}]
+
+
+def test_failed_page_range_fails_the_whole_file(split_pdf, monkeypatch):
+    def extract(path, first, last):
+        if first == 2:
+            raise ValueError("damaged page")
+        return [{"text": f"p{first}"}]
+
+    monkeypatch.setattr(faq_tool, "extract_text_from_pdf", extract)
+
+    results = list(faq_tool.iter_extracted_files(["big.pdf", "small.docx"], workers=1))
+
+    assert results == [("big.pdf", None), ("small.docx", [{"text": "small.docx"}])]
+
+
+def test_worker_errors_reach_the_parent(tmp_path):
+    # Spawned workers: missing files raise inside the worker and come back as failures
+    paths = [str(tmp_path / f"missing{n}.docx") for n in range(3)]
+
+    results = list(faq_tool.iter_extracted_files(paths, workers=2))
+
+    assert results == [(path, None) for path in paths]
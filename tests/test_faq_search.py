@@ -0,0 +1,131 @@
+"""search_faq caches: query embeddings, exact-repeat answers, paraphrases and index changes."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("docx")
+pytest.importorskip("chromadb")
+
+from tools import faq_tool  # noqa: E402
+
+VECTORS = {
+    "how do i reset my pin": [1.0, 0.0, 0.0],
+    "how can i reset my pin": [0.99, 0.01, 0.0],     # paraphrase, similarity ~1.0
+    "what are the card fees": [0.0, 1.0, 0.0],
+}
+
+
+class FakeCollection:
+    """Returns the chunk ids in `hits` for every query."""
+
+    def __init__(self):
+        self.hits = ["pin-1", "pin-2"]
+        self.queries = 0
+
+    def query(self, query_embeddings, n_results, include):
+        self.queries += 1
+        metas = [{"file": "faq.docx", "source_path": "faq.docx", "page": None, "para": n,
+                  "snippet": f"snippet {chunk_id}"} for n, chunk_id in enumerate(self.hits)]
+        return {"ids": [self.hits], "documents": [list(self.hits)], "metadatas": [metas],
+                "distances": [[0.1] * len(self.hits)]}
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([VECTORS[faq_tool._normalize_query(t)] for t in texts])
+
+
+@pytest.fixture
+def faq(tmp_path, monkeypatch):
+    collection, encoder, prompts = FakeCollection(), FakeEncoder(), []
+
+    def llm(prompt, system=None, purpose=None):
+        prompts.append(prompt)
+        return f"answer {len(prompts)}"
+
+    monkeypatch.setattr(faq_tool.chroma_store, "is_populated", lambda: True)
+    monkeypatch.setattr(faq_tool, "get_chroma_collection", lambda: collection)
+    monkeypatch.setattr(faq_tool, "get_embedding_model", lambda name=None: encoder)
+    monkeypatch.setattr(faq_tool, "run_llm_streamed", llm)
+    monkeypatch.setattr(faq_tool, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    faq_tool._query_embedding_cache.clear()
+    faq_tool._set_index_version(0)
+    yield {"collection": collection, "encoder": encoder, "prompts": prompts}
+    faq_tool._set_index_version(0)
+
+
+def test_repeated_query_skips_encoding_and_the_llm(faq, monkeypatch):
+    monkeypatch.setattr(faq_tool, "FAQ_SEMANTIC_CACHE_ENABLED", False)
+    before = faq_tool.get_faq_cache_stats()
+
+    first = faq_tool.search_faq("How do I reset my PIN?")
+    second = faq_tool.search_faq("how do i reset my pin")
+
+    assert second == first
+    assert faq["encoder"].encoded == ["How do I reset my PIN?"]
+    assert len(faq["prompts"]) == 1
+    assert faq["collection"].queries == 2
+    stats = faq_tool.get_faq_cache_stats()
+    for level in ("embedding", "answer"):
+        assert stats[level]["hits"] == before[level]["hits"] + 1
+        assert stats[level]["misses"] == before[level]["misses"] + 1
+
+
+def test_answer_cache_is_keyed_on_the_retrieved_chunks(faq, monkeypatch):
+    monkeypatch.setattr(faq_tool, "FAQ_SEMANTIC_CACHE_ENABLED", False)
+    faq_tool.search_faq("How do I reset my PIN?")
+    faq["collection"].hits = ["pin-3"]
+
+    assert faq_tool.search_faq("How do I reset my PIN?")["answer"] == "answer 2"
+
+
+def test_caches_can_be_disabled(faq, monkeypatch):
+    monkeypatch.setattr(faq_tool, "FAQ_CACHE_ENABLED", False)
+
+    faq_tool.search_faq("How do I reset my PIN?")
+    faq_tool.search_faq("How do I reset my PIN?")
+
+    assert len(faq["encoder"].encoded) == 2
+    assert len(faq["prompts"]) == 2
+
+
+def test_paraphrase_reuses_answer_when_sources_match(faq):
+    first = faq_tool.search_faq("How do I reset my PIN?")
+    second = faq_tool.search_faq("how can I reset my pin")
+
+    assert second["answer"] == first["answer"] == "answer 1"
+    assert len(faq["prompts"]) == 1
+    assert faq["collection"].queries == 2
+    assert [s["snippet"] for s in second["sources"]] == ["snippet pin-1", "snippet pin-2"]
+
+
+def test_near_identical_paraphrase_is_rejected_when_sources_changed(faq):
+    faq_tool.search_faq("How do I reset my PIN?")
+    faq["collection"].hits = ["pin-3", "pin-2"]
+
+    result = faq_tool.search_faq("how can I reset my pin")
+
+    # Even at ~1.0 similarity the cached answer is only served after retrieval agrees
+    assert result["answer"] == "answer 2"
+    assert [s["snippet"] for s in result["sources"]] == ["snippet pin-3", "snippet pin-2"]
+
+
+def test_unrelated_question_is_not_served_from_the_semantic_cache(faq):
+    faq_tool.search_faq("How do I reset my PIN?")
+
+    assert faq_tool.search_faq("What are the card fees?")["answer"] == "answer 2"
+
+
+def test_index_change_clears_cached_answers(faq):
+    faq_tool.search_faq("How do I reset my PIN?")
+    faq_tool._bump_index_version()
+
+    assert faq_tool.search_faq("How do I reset my PIN?")["answer"] == "answer 2"
+    stats = faq_tool.get_faq_cache_stats()
+    assert stats["index_version"] == 1
+    assert stats["semantic"]["threshold"] == faq_tool.FAQ_SEMANTIC_THRESHOLD
@@ -0,0 +1,193 @@
+"""sync_vector_store: incremental updates and resuming an interrupted build."""
+
+import functools
+import json
+
+import numpy as np
+import pytest
+
+# tools.faq_tool imports the document/vector libraries at module level
+pytest.importorskip("fitz")
+pytest.importorskip("docx")
+pytest.importorskip("chromadb")
+
+from tools import faq_tool  # noqa: E402
+
+
+class FakeCollection:
+    """In-memory stand-in for the Chroma collection calls the indexer makes."""
+
+    def __init__(self, fail_on_upsert=None):
+        self.items = {}
+        self.upserts = 0
+        self.batch_sizes = []
+        self.fail_on_upsert = fail_on_upsert
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.upserts += 1
+        self.batch_sizes.append(len(ids))
+        if self.upserts == self.fail_on_upsert:
+            raise RuntimeError("simulated crash")
+        for chunk_id, document, meta in zip(ids, documents, metadatas):
+            self.items[chunk_id] = (document, meta)
+
+    def update(self, ids, metadatas):
+        for chunk_id, meta in zip(ids, metadatas):
+            self.items[chunk_id] = (self.items[chunk_id][0], meta)
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.items.pop(chunk_id, None)
+
+    def get(self, include=None):
+        return {"ids": list(self.items)}
+
+    def count(self):
+        return len(self.items)
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.ones((len(texts), 4))
+
+
+@pytest.fixture
+def faq_env(tmp_path, monkeypatch):
+    data = tmp_path / "faqs"
+    data.mkdir()
+    encoder = FakeEncoder()
+    env = {"data": data, "encoder": encoder, "collection": FakeCollection()}
+
+    def read_lines(path):
+        with open(path) as f:
+            return [
+                {"text": line.strip(), "file": "doc", "page": None, "para": i + 1,
+                 "snippet": line.strip(), "source_path": path}
+                for i, line in enumerate(f) if line.strip()
+            ]
+
+    monkeypatch.setattr(faq_tool, "DATA_FOLDER", str(data))
+    monkeypatch.setattr(faq_tool, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(faq_tool, "extract_text_from_docx", read_lines)
+    # In-process extraction so the patched extractor is used
+    monkeypatch.setattr(faq_tool, "iter_extracted_files",
+                        functools.partial(faq_tool.iter_extracted_files, workers=1))
+    monkeypatch.setattr(faq_tool, "get_embedding_model", lambda name=None: encoder)
+    monkeypatch.setattr(faq_tool, "get_chroma_collection", lambda: env["collection"])
+    monkeypatch.setattr(faq_tool.chroma_store, "_populated", None)
+    return env
+
+
+def _write(folder, name, lines):
+    (folder / name).write_text("\n".join(lines) + "\n")
+
+
+def test_sync_only_embeds_changed_chunks(faq_env):
+    _write(faq_env["data"], "a.docx", ["one", "two"])
+    _write(faq_env["data"], "b.docx", ["three"])
+    stats = faq_tool.sync_vector_store()
+    assert stats["added"] == 3
+    assert faq_env["collection"].count() == 3
+
+    _write(faq_env["data"], "a.docx", ["one", "two changed"])
+    faq_env["encoder"].encoded.clear()
+    stats = faq_tool.sync_vector_store()
+
+    assert faq_env["encoder"].encoded == ["two changed"]
+    assert (stats["added"], stats["deleted"], stats["files_changed"]) == (1, 1, 1)
+    assert sorted(doc for doc, _ in faq_env["collection"].items.values()) == [
+        "one", "three", "two changed",
+    ]
+
+
+def test_removed_file_deletes_its_vectors(faq_env):
+    _write(faq_env["data"], "a.docx", ["one", "two"])
+    _write(faq_env["data"], "b.docx", ["three"])
+    faq_tool.sync_vector_store()
+
+    (faq_env["data"] / "b.docx").unlink()
+    stats = faq_tool.sync_vector_store()
+
+    assert (stats["files_removed"], stats["deleted"]) == (1, 1)
+    assert sorted(doc for doc, _ in faq_env["collection"].items.values()) == ["one", "two"]
+
+
+def test_unchanged_content_is_not_extracted_again(faq_env, monkeypatch):
+    _write(faq_env["data"], "a.docx", ["one"])
+    faq_tool.sync_vector_store()
+    extracted = []
+    monkeypatch.setattr(faq_tool, "extract_text_from_docx", lambda path: extracted.append(path))
+
+    assert faq_tool.sync_vector_store()["files_changed"] == 0
+    _write(faq_env["data"], "a.docx", ["one"])   # new mtime, same content
+    assert faq_tool.sync_vector_store()["files_changed"] == 0
+    assert extracted == []
+
+
+def test_full_sync_re_embeds_everything(faq_env):
+    _write(faq_env["data"], "a.docx", ["one", "two"])
+    faq_tool.sync_vector_store()
+    faq_env["encoder"].encoded.clear()
+
+    stats = faq_tool.sync_vector_store(full=True)
+
+    assert stats["added"] == 2
+    assert sorted(faq_env["encoder"].encoded) == ["one", "two"]
+    assert faq_env["collection"].count() == 2
+
+
+def test_interrupted_sync_resumes_from_last_batch(faq_env):
+    for n in range(3):
+        _write(faq_env["data"], f"f{n}.docx", [f"doc {n} line {i}" for i in range(3)])
+    faq_env["collection"] = FakeCollection(fail_on_upsert=3)
+
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        faq_tool.sync_vector_store(batch_size=2)
+    committed = faq_env["collection"].count()
+    assert committed == 4
+    with open(faq_tool.MANIFEST_PATH) as f:
+        checkpoint = json.load(f)["files"]
+    assert sum(len(entry["chunks"]) for entry in checkpoint.values()) == committed
+
+    faq_env["collection"].fail_on_upsert = None
+    faq_env["encoder"].encoded.clear()
+    stats = faq_tool.sync_vector_store(batch_size=2)
+
+    # Only the chunks not committed before the crash are embedded again
+    assert len(faq_env["encoder"].encoded) == 9 - committed
+    assert stats["added"] == 9 - committed
+    assert faq_env["collection"].count() == 9
+    assert faq_tool.sync_vector_store(batch_size=2)["added"] == 0
+
+
+def test_chunks_are_committed_in_bounded_batches(faq_env):
+    _write(faq_env["data"], "a.docx", [f"line {i}" for i in range(5)])
+    reports = []
+
+    faq_tool.sync_vector_store(batch_size=2, progress=reports.append)
+
+    assert faq_env["collection"].batch_sizes == [2, 2, 1]
+    assert [r["chunks_added"] for r in reports] == [2, 4, 5]
+    assert reports[-1]["files_done"] == reports[-1]["files_total"] == 1
+    with open(faq_tool.MANIFEST_PATH) as f:
+        entry = json.load(f)["files"][str(faq_env["data"] / "a.docx")]
+    assert entry["hash"] and len(entry["chunks"]) == 5
+
+
+def test_unreadable_file_keeps_its_vectors(faq_env, monkeypatch):
+    _write(faq_env["data"], "a.docx", ["one", "two"])
+    faq_tool.sync_vector_store()
+
+    def broken(path):
+        raise ValueError("corrupt document")
+
+    _write(faq_env["data"], "a.docx", ["one", "two", "three"])
+    monkeypatch.setattr(faq_tool, "extract_text_from_docx", broken)
+    stats = faq_tool.sync_vector_store()
+
+    assert stats["files_changed"] == 0
+    assert faq_env["collection"].count() == 2
@@ -0,0 +1,69 @@
+"""Fused intent classification + slot extraction in one LLM call."""
+
+import pytest
+
+from langgraph_flow.core.constants import IntentType
+from langgraph_flow.services import intent_classifier
+from langgraph_flow.services.intent_classifier import IntentClassifier
+
+
+def test_transfer_intent_and_slots_from_one_call(fake_llm):
+    intent, slots = IntentClassifier.classify_with_slots("transfer 500 to bob from savings")
+
+    assert intent == IntentType.TRANSFER
+    assert slots == {"amount": 500.0, "to_beneficiary": "bob", "from_account": "Savings",
+                     "frequency": "one-time"}
+    assert fake_llm.calls == 1
+
+
+def test_spend_slots_are_kept_without_required_fields(fake_llm):
+    intent, slots = IntentClassifier.classify_with_slots("show my spending on food")
+
+    assert intent == IntentType.SPEND
+    assert slots == {"category": "food", "start_date": None, "end_date": None, "merchant": None}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("how do i open an account", IntentType.FAQ),
+    ("send money", IntentType.TRANSFER),
+])
+def test_no_slots_without_usable_values(fake_llm, query, expected):
+    # FAQ has no slots; a transfer without amount/beneficiary is extracted again downstream
+    assert IntentClassifier.classify_with_slots(query) == (expected, None)
+
+
+def test_unparsable_output_falls_back_to_classify(fake_llm):
+    fake_llm.responses["extract its details in one step"] = "I think this is a transfer"
+
+    assert IntentClassifier.classify_with_slots("transfer 500 to bob") == (
+        IntentClassifier.classify("transfer 500 to bob"), None,
+    )
+
+
+def test_failed_model_call_uses_keywords_only(monkeypatch):
+    calls = []
+    monkeypatch.setattr(intent_classifier, "run_llm", lambda *a, **k: calls.append(a) or "")
+
+    assert IntentClassifier.classify_with_slots("show my spending") == (IntentType.SPEND, None)
+    assert len(calls) == 1
+
+
+def test_spend_node_skips_extraction_when_slots_are_present(monkeypatch):
+    for module in ("fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from langgraph_flow.nodes import main_nodes
+
+    received = {}
+
+    def handler(user_id, query, details=None):
+        received["details"] = details
+        return {"response": "ok"}
+
+    monkeypatch.setattr(main_nodes, "handle_spend_insight", handler)
+    monkeypatch.setattr(main_nodes, "_generate_suggestions", lambda state, text: [])
+    slots = {"category": "food", "start_date": None, "end_date": None, "merchant": None}
+
+    state = main_nodes.spend_node({"user_id": "1", "user_input": "food spend", "extracted_slots": slots})
+
+    assert received["details"] == slots
+    assert state["extracted_slots"] is None
@@ -0,0 +1,84 @@
+"""classify_many and the /intent/batch NDJSON endpoint."""
+
+import json
+
+import pytest
+
+from langgraph_flow.core.constants import IntentType
+from langgraph_flow.services import intent_classifier
+from langgraph_flow.services.intent_classifier import IntentClassifier
+
+# Keyword-confident, then three that need the LLM
+QUERIES = ["Transfer 500 to Bob", "pay", "any deal", "help me", "pay"]
+
+
+@pytest.fixture
+def many(fake_llm, monkeypatch):
+    embedder = intent_classifier.embedding_intent_classifier
+    monkeypatch.setattr(embedder, "predict_many", lambda texts: [None] * len(texts))
+    monkeypatch.setattr(intent_classifier, "INTENT_MANY_LLM_CHUNK", 2)
+    intent_classifier._phrase_cache.clear()
+    yield fake_llm
+    intent_classifier._phrase_cache.clear()
+
+
+def test_results_are_in_input_order_with_their_tiers(many):
+    results = list(IntentClassifier.classify_many(QUERIES + ["  "]))
+
+    assert [r.intent for r in results] == [
+        IntentType.TRANSFER, IntentType.TRANSFER, IntentType.OFFERS, IntentType.FAQ,
+        IntentType.TRANSFER, IntentType.UNKNOWN,
+    ]
+    assert [r.tier for r in results] == ["keyword", "llm", "llm", "llm", "llm", "fallback"]
+    assert results[1] == results[4]
+
+
+def test_llm_residue_goes_out_in_numbered_chunks(many):
+    list(IntentClassifier.classify_many(QUERIES))
+
+    # Three unique unresolved phrases in chunks of two: one batched prompt, one single
+    assert many.calls == 2
+
+
+def test_resolved_results_stream_before_the_llm_runs(many):
+    results = IntentClassifier.classify_many(QUERIES)
+
+    assert next(results).tier == "keyword"
+    assert many.calls == 0
+    assert next(results).tier == "llm"
+    assert many.calls == 1
+
+
+def test_llm_labels_are_cached_for_later_batches(many):
+    list(IntentClassifier.classify_many(QUERIES))
+    intent_classifier._phrase_cache.clear()
+    calls = many.calls
+
+    assert [r.tier for r in IntentClassifier.classify_many(["any deal", "help me"])] == ["llm", "llm"]
+    assert many.calls == calls
+
+
+@pytest.fixture
+def client(many, monkeypatch):
+    for module in ("flask_cors", "fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from api import main
+
+    monkeypatch.setattr(main, "INTENT_BATCH_MAX_QUERIES", 10)
+    return main.app.test_client()
+
+
+def test_batch_endpoint_streams_ndjson(client):
+    response = client.post("/intent/batch", json={"queries": QUERIES})
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["index"] for line in lines] == list(range(len(QUERIES)))
+    assert [line["query"] for line in lines] == QUERIES
+    assert lines[0]["intent"] == "transfer" and lines[0]["tier"] == "keyword"
+
+
+@pytest.mark.parametrize("payload", [{}, {"queries": "pay"}, {"queries": ["pay", 3]},
+                                     {"queries": ["pay"] * 11}])
+def test_batch_endpoint_rejects_bad_payloads(client, payload):
+    assert client.post("/intent/batch", json=payload).status_code == 400
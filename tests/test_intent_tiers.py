@@ -0,0 +1,111 @@
+"""Tiered intent classification: which tier answers, with what confidence."""
+
+import os
+
+import pytest
+
+from langgraph_flow.core.constants import IntentType
+from langgraph_flow.services import intent_classifier
+from langgraph_flow.services.embedding_intent import EmbeddingPrediction
+from langgraph_flow.services.intent_classifier import IntentClassifier
+
+
+@pytest.fixture
+def tiers(fake_llm, monkeypatch):
+    """Fake LLM, no embedding model, empty phrase cache; returns a setter for embedding predictions."""
+    prediction = {"value": None}
+    embedder = intent_classifier.embedding_intent_classifier
+    monkeypatch.setattr(embedder, "predict", lambda text: prediction["value"])
+    monkeypatch.setattr(embedder, "predict_many", lambda texts: [prediction["value"]] * len(texts))
+    intent_classifier._phrase_cache.clear()
+    yield lambda value: prediction.update(value=value)
+    intent_classifier._phrase_cache.clear()
+
+
+def test_strong_keyword_evidence_answers_locally(tiers, fake_llm):
+    result = IntentClassifier.classify_with_confidence("Transfer 500 to Bob")
+
+    assert (result.intent, result.tier) == (IntentType.TRANSFER, "keyword")
+    assert result.confidence >= intent_classifier.INTENT_KEYWORD_THRESHOLD
+    assert fake_llm.calls == 0
+
+
+def test_repeated_phrase_is_served_from_the_cache(tiers):
+    first = IntentClassifier.classify_with_confidence("Transfer 500 to Bob")
+    again = IntentClassifier.classify_with_confidence("transfer 500 to bob!")
+
+    assert again == first._replace(tier="cache")
+
+
+def test_single_keyword_is_not_enough_evidence(tiers, fake_llm):
+    keyword = IntentClassifier._score_keywords("pay")
+    assert keyword.intent == IntentType.TRANSFER and not keyword.confident
+
+    result = IntentClassifier.classify_with_confidence("pay")
+
+    # The LLM agrees with the keyword guess, which raises its confidence
+    assert (result.intent, result.tier) == (IntentType.TRANSFER, "llm")
+    assert result.confidence == intent_classifier.LLM_AGREEMENT_CONFIDENCE
+    assert fake_llm.calls == 1
+
+
+def test_questions_about_actions_are_not_keyword_transfers(tiers):
+    assert not IntentClassifier._score_keywords("how do I transfer money abroad?").confident
+    assert IntentClassifier._score_keywords("transfer money to mom").confident
+
+
+def test_confident_embedding_answers_before_the_llm(tiers, fake_llm):
+    tiers(EmbeddingPrediction(IntentType.OFFERS, 0.93, 0.3, True))
+
+    result = IntentClassifier.classify_with_confidence("anything good this week")
+
+    assert result == (IntentType.OFFERS, 0.93, "embedding")
+    assert fake_llm.calls == 0
+
+
+def test_failed_llm_falls_back_to_the_keyword_guess(tiers, monkeypatch):
+    monkeypatch.setattr(intent_classifier, "run_llm", lambda *a, **k: "")
+    monkeypatch.setattr(intent_classifier, "INTENT_BATCH_ENABLED", False)
+
+    result = IntentClassifier.classify_with_confidence("pay")
+    assert (result.intent, result.tier) == (IntentType.TRANSFER, "fallback")
+    assert result.confidence == IntentClassifier._score_keywords("pay").confidence
+
+    assert IntentClassifier.classify_with_confidence("hello there") == (IntentType.UNKNOWN, 0.0, "fallback")
+    assert IntentClassifier.classify_with_confidence("   ") == (IntentType.UNKNOWN, 0.0, "fallback")
+
+
+def test_tier_stats_count_attempts_and_hits(tiers):
+    before = intent_classifier.get_tier_stats()["keyword"]
+
+    IntentClassifier.classify_with_confidence("Transfer 500 to Bob")
+
+    after = intent_classifier.get_tier_stats()["keyword"]
+    assert (after["attempts"], after["hits"]) == (before["attempts"] + 1, before["hits"] + 1)
+
+
+def test_intent_endpoint_reports_confidence_and_tier(tiers):
+    for module in ("flask_cors", "fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from api import main
+
+    client = main.app.test_client()
+    body = client.post("/intent", json={"query": "Transfer 500 to Bob"}).get_json()
+
+    assert body["status"] == "ok"
+    assert (body["intent"], body["tier"]) == ("transfer", "keyword")
+    assert body["confidence"] >= intent_classifier.INTENT_KEYWORD_THRESHOLD
+    assert client.post("/intent", json={"query": ""}).status_code == 400
+
+
+def test_shipped_keyword_threshold_meets_the_holdout_precision_target():
+    from utils.calibrate_intent_threshold import _score_holdout
+
+    holdout = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "data", "intent_holdout.json")
+    scored, total = _score_holdout(holdout)
+    answered = [(label, intent) for label, intent, conf in scored
+                if conf >= intent_classifier.INTENT_KEYWORD_THRESHOLD]
+
+    assert answered and total
+    assert sum(label == intent for label, intent in answered) / len(answered) >= 0.98
@@ -0,0 +1,47 @@
+"""Per-request latency budget: when optional LLM steps run, and their timeouts."""
+
+import time
+
+from langgraph_flow.core.state import StateManager
+from utils import metrics
+from utils.latency_budget import OPTIONAL_STEP_ESTIMATES, has_budget, step_timeout
+
+STEP = "contextual_questions"
+
+
+def test_no_deadline_always_has_budget():
+    assert has_budget(STEP, None)
+    assert step_timeout(None, default=60) == 60
+
+
+def test_short_budget_degrades_the_step():
+    before = metrics.get_counter(f"budget.degraded.{STEP}.deadline")
+
+    assert has_budget(STEP, time.time() + OPTIONAL_STEP_ESTIMATES[STEP] + 5)
+    assert not has_budget(STEP, time.time() + OPTIONAL_STEP_ESTIMATES[STEP] - 1)
+    assert metrics.get_counter(f"budget.degraded.{STEP}.deadline") == before + 1
+
+
+def test_fast_mode_skips_optional_steps():
+    before = metrics.get_counter(f"budget.degraded.{STEP}.fast")
+
+    assert not has_budget(STEP, None, fast=True)
+    assert metrics.get_counter(f"budget.degraded.{STEP}.fast") == before + 1
+
+
+def test_step_timeout_is_capped_by_the_remaining_budget():
+    assert step_timeout(time.time() + 10.5, default=60) == 10
+    assert step_timeout(time.time() + 100, default=60) == 60
+    assert step_timeout(time.time() - 5, default=60) == 1
+
+
+def test_state_carries_the_request_budget():
+    state = {}
+    StateManager.start_latency_budget(state, budget_seconds=30)
+    assert StateManager.has_budget_for(state, STEP)
+
+    StateManager.start_latency_budget(state, budget_seconds=1)
+    assert not StateManager.has_budget_for(state, STEP)
+
+    StateManager.start_latency_budget(state, budget_seconds=30, fast=True)
+    assert not StateManager.has_budget_for(state, STEP)
@@ -0,0 +1,128 @@
+"""HTTPBackend against a local stand-in server, and the `ollama run` fallback."""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import llm_connector
+from utils.llm_connector import (
+    HTTPBackend, LLMBackendError, LLMBackendUnavailable, SubprocessBackend,
+)
+
+WORDS = ["Hello", " from", " the", " stand-in"]
+
+
+class _OllamaHandler(BaseHTTPRequestHandler):
+    """Minimal POST /api/generate: JSON answer, or NDJSON chunks when streaming."""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        if payload["prompt"] == "fail":
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b"model not found")
+            return
+        self.send_response(200)
+        self.end_headers()
+        if payload.get("stream"):
+            for word in WORDS:
+                self.wfile.write(json.dumps({"response": word, "done": False}).encode() + b"\n")
+                self.wfile.flush()
+            self.wfile.write(json.dumps({"response": "", "done": True}).encode() + b"\n")
+        else:
+            self.wfile.write(json.dumps({"response": "".join(WORDS), "done": True}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaHandler)
+    server.payloads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def unreachable_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_http_generate_sends_system_and_options(ollama_server):
+    backend = HTTPBackend(base_url=_url(ollama_server), model="test-model")
+
+    output = backend.generate("hi", 5, system="be brief",
+                              options={"temperature": 0.0, "format": "json", "stop": []})
+
+    assert output == "Hello from the stand-in"
+    payload = ollama_server.payloads[0]
+    assert payload["model"] == "test-model"
+    assert payload["system"] == "be brief"
+    assert payload["stream"] is False
+    assert payload["format"] == "json"
+    assert payload["options"] == {"temperature": 0.0}
+
+
+def test_http_stream_yields_chunks_in_order(ollama_server):
+    backend = HTTPBackend(base_url=_url(ollama_server))
+
+    assert list(backend.stream("hi", 5)) == WORDS
+    assert ollama_server.payloads[0]["stream"] is True
+
+
+def test_http_error_status_raises_backend_error(ollama_server):
+    backend = HTTPBackend(base_url=_url(ollama_server))
+
+    with pytest.raises(LLMBackendError, match="HTTP 500"):
+        backend.generate("fail", 5)
+    with pytest.raises(LLMBackendError, match="HTTP 500"):
+        list(backend.stream("fail", 5))
+
+
+def test_http_unreachable_server_is_unavailable(unreachable_url):
+    backend = HTTPBackend(base_url=unreachable_url)
+
+    with pytest.raises(LLMBackendUnavailable):
+        backend.generate("hi", 5)
+
+
+def test_subprocess_generate_and_stream(fake_ollama_cli):
+    backend = SubprocessBackend(model="test-model")
+
+    assert backend.generate("hi", 10, system="sys") == "echo: sys\n\nhi"
+    assert "".join(backend.stream("hi", 10)).strip() == "echo: hi"
+
+
+@pytest.fixture
+def http_backend_down(unreachable_url):
+    """Make the active backend an HTTP server that is not running."""
+    previous = llm_connector._active_backend
+    llm_connector.register_backend("http", lambda: HTTPBackend(base_url=unreachable_url))
+    llm_connector.register_backend(SubprocessBackend.name, SubprocessBackend)
+    llm_connector.set_backend("http")
+    llm_connector.llm_breaker.record_success()
+    yield
+    llm_connector.register_backend("http", HTTPBackend)
+    llm_connector.set_backend(previous)
+    llm_connector.llm_breaker.record_success()
+
+
+def test_run_llm_falls_back_to_subprocess(fake_ollama_cli, http_backend_down):
+    assert llm_connector.run_llm("hi", timeout=10) == "echo: hi"
+    assert "".join(llm_connector.stream_llm("hi", timeout=10)).strip() == "echo: hi"
+    assert llm_connector.llm_breaker.state == "closed"
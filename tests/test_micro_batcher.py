@@ -0,0 +1,90 @@
+"""MicroBatcher, and concurrent LLM intent classification sharing one prompt."""
+
+import threading
+
+import pytest
+
+from langgraph_flow.services import intent_classifier
+from langgraph_flow.services.intent_classifier import IntentClassifier
+from utils.batching import MicroBatcher
+
+
+def test_micro_batcher_merges_concurrent_submits():
+    sizes = []
+
+    def handler(items):
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, max_wait_ms=100, name="test.batch")
+    barrier = threading.Barrier(5)
+    results = {}
+
+    def submit(n):
+        barrier.wait()
+        results[n] = batcher.submit(n, timeout=5)
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {n: n * 2 for n in range(5)}
+    assert sum(sizes) == 5
+    assert max(sizes) > 1
+
+
+def test_micro_batcher_respects_max_batch_size():
+    sizes = []
+    batcher = MicroBatcher(lambda items: sizes.append(len(items)) or items,
+                           max_batch_size=2, max_wait_ms=50, name="test.batch_size")
+    threads = [threading.Thread(target=batcher.submit, args=(n, 5)) for n in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sum(sizes) == 5
+    assert max(sizes) <= 2
+
+
+def test_micro_batcher_propagates_handler_errors():
+    def handler(items):
+        raise RuntimeError("model down")
+
+    batcher = MicroBatcher(handler, max_wait_ms=1, name="test.batch_error")
+    with pytest.raises(RuntimeError, match="model down"):
+        batcher.submit("x", timeout=5)
+
+    short = MicroBatcher(lambda items: [], max_wait_ms=1, name="test.batch_short")
+    with pytest.raises(ValueError):
+        short.submit("x", timeout=5)
+
+
+def test_concurrent_llm_classifications_share_one_prompt(fake_llm, monkeypatch):
+    monkeypatch.setattr(intent_classifier, "_llm_batcher", MicroBatcher(
+        IntentClassifier._classify_batch_with_llm, max_batch_size=8, max_wait_ms=200,
+        name="test.intent_batch",
+    ))
+    queries = ["send 5 to bob", "show spending", "any discount", "help me"]
+    barrier = threading.Barrier(len(queries))
+    labels = {}
+
+    def classify(query):
+        barrier.wait()
+        labels[query] = IntentClassifier._classify_with_llm(query)
+
+    threads = [threading.Thread(target=classify, args=(q,)) for q in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert labels == {"send 5 to bob": "transfer", "show spending": "spend",
+                      "any discount": "offers", "help me": "faq"}
+    assert fake_llm.calls < len(queries)
+    # Each parsed label is cached under its single-query prompt
+    calls = fake_llm.calls
+    assert IntentClassifier._classify_with_llm("show spending") == "spend"
+    assert fake_llm.calls == calls
@@ -0,0 +1,80 @@
+"""Handler and contextual-question stages: overlap, budget fallbacks and timings."""
+
+import time
+
+import pytest
+
+for module in ("fitz", "docx", "chromadb"):
+    pytest.importorskip(module)
+
+from langgraph_flow.core.state import StateManager  # noqa: E402
+from langgraph_flow.nodes import main_nodes  # noqa: E402
+
+STAGE_S = 0.2
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Handler and LLM suggestions that each take STAGE_S."""
+    seen = {}
+
+    def suggestions(state, last_response):
+        seen["provisional"] = last_response
+        time.sleep(STAGE_S)
+        return ["llm suggestion"]
+
+    def handler(user_id, user_input):
+        time.sleep(STAGE_S)
+        return {"status": "ok", "response": "You spent $10"}
+
+    monkeypatch.setattr(main_nodes, "_generate_suggestions", suggestions)
+    return handler, seen
+
+
+def _state(budget=30.0, fast=False):
+    state = {"user_id": "1", "user_input": "coffee spend"}
+    StateManager.start_latency_budget(state, budget, fast)
+    return state
+
+
+def test_suggestions_overlap_the_handler(stages):
+    handler, seen = stages
+
+    state = main_nodes._run_handler_with_suggestions(_state(), "spend", handler)
+
+    assert state["contextual_questions"] == ["llm suggestion"]
+    assert seen["provisional"] == "Here is your spending summary for: coffee spend"
+    assert set(state["stage_timings"]) == {"handler", "suggestions", "wall"}
+    assert state["stage_timings"]["wall"] < 1000 * 1.75 * STAGE_S
+
+
+def test_sequential_mode_uses_the_real_response(stages, monkeypatch):
+    handler, seen = stages
+    monkeypatch.setattr(main_nodes, "NODE_PARALLEL_STAGES", False)
+
+    state = main_nodes._run_handler_with_suggestions(_state(), "spend", handler)
+
+    assert state["contextual_questions"] == ["llm suggestion"]
+    assert seen["provisional"] == "You spent $10"
+    assert state["stage_timings"]["wall"] >= 1000 * 2 * STAGE_S
+
+
+@pytest.mark.parametrize("budget, fast", [(1.0, False), (30.0, True)])
+def test_short_budget_or_fast_mode_uses_static_suggestions(stages, budget, fast):
+    handler, seen = stages
+
+    state = main_nodes._run_handler_with_suggestions(_state(budget, fast), "spend", handler)
+
+    assert seen == {}
+    assert state["contextual_questions"] == main_nodes.generate_static_suggestions("You spent $10")
+    assert "suggestions" not in state["stage_timings"]
+
+
+def test_handler_errors_still_get_suggestions(stages):
+    def broken(user_id, user_input):
+        raise RuntimeError("data source down")
+
+    state = main_nodes._run_handler_with_suggestions(_state(), "spend", broken)
+
+    assert state["result"] == {"status": "error", "message": "data source down"}
+    assert state["contextual_questions"] == ["llm suggestion"]
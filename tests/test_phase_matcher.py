@@ -0,0 +1,77 @@
+"""PhaseInputMatcher answers, and which transfer phases escalate to the classifier."""
+
+import pytest
+
+from langgraph_flow.core.constants import ConversationPhase, IntentType
+from langgraph_flow.core.routing import PhaseInputMatcher
+
+BENEFICIARIES = {"pending_transfer": {"multiple_options": [
+    {"name": "Matthew Pareira", "nickname": "matt"},
+    {"name": "Alexander Heather", "nickname": "alex"},
+]}}
+
+
+@pytest.mark.parametrize("reply", ["2", "option 1", "pareira", "Matthew", "alex please", "mat", "heathr"])
+def test_beneficiary_names_and_indexes_are_expected(reply):
+    assert PhaseInputMatcher.is_expected(ConversationPhase.BENEFICIARY_SELECTION, reply, BENEFICIARIES)
+
+
+@pytest.mark.parametrize("reply", ["what are the offers", "and the fees", "the balance", "show my spending"])
+def test_name_fragments_inside_other_words_do_not_match(reply):
+    # "are" is inside "pareira", "the" inside "matthew"/"heather", "and" inside "alexander"
+    assert not PhaseInputMatcher.is_expected(ConversationPhase.BENEFICIARY_SELECTION, reply, BENEFICIARIES)
+
+
+@pytest.mark.parametrize("phase, reply, expected", [
+    (ConversationPhase.OTP, "123 456", True),
+    (ConversationPhase.OTP, "what is my balance", False),
+    (ConversationPhase.CONFIRMATION, "confirm_yes", True),
+    (ConversationPhase.CONFIRMATION, "yse", True),
+    (ConversationPhase.CONFIRMATION, "show my balance", False),
+    (ConversationPhase.ACCOUNT_SELECTION, "savngs", True),
+    (ConversationPhase.ACCOUNT_SELECTION, "current account", True),
+])
+def test_phase_answers(phase, reply, expected):
+    assert PhaseInputMatcher.is_expected(phase, reply) is expected
+
+
+def test_match_option_and_account():
+    options = BENEFICIARIES["pending_transfer"]["multiple_options"]
+    assert PhaseInputMatcher.match_option("2", options)["nickname"] == "alex"
+    assert PhaseInputMatcher.match_option("matthew", options)["nickname"] == "matt"
+    assert PhaseInputMatcher.match_option("3", options) is None
+    assert PhaseInputMatcher.match_account("Savings account") == "savings"
+    assert PhaseInputMatcher.match_account("2") == "current"
+
+
+@pytest.fixture
+def main_flow(monkeypatch):
+    for module in ("fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from langgraph_flow.flows import main_flow
+
+    classified = []
+    monkeypatch.setattr(main_flow.IntentClassifier, "classify",
+                        lambda text: classified.append(text) or IntentType.FAQ)
+    return main_flow, classified
+
+
+@pytest.mark.parametrize("phase", [
+    ConversationPhase.TRANSFER_SUMMARY,
+    ConversationPhase.BENEFICIARY_SELECTION,
+    ConversationPhase.ACCOUNT_SELECTION,
+])
+def test_selection_and_summary_phases_are_not_interrupted(main_flow, phase):
+    flow, classified = main_flow
+
+    assert flow._detect_interruption(phase, "what are the offers", BENEFICIARIES) == (False, IntentType.UNKNOWN)
+    assert classified == []
+
+
+@pytest.mark.parametrize("phase", [ConversationPhase.OTP, ConversationPhase.CONFIRMATION])
+def test_otp_and_confirmation_escalate_unexpected_input(main_flow, phase):
+    flow, classified = main_flow
+
+    assert flow._detect_interruption(phase, "yes") == (False, IntentType.UNKNOWN)
+    assert flow._detect_interruption(phase, "what are the offers") == (True, IntentType.FAQ)
+    assert classified == ["what are the offers"]
@@ -0,0 +1,40 @@
+"""SemanticCache: nearest match, LFU eviction and expiry."""
+
+import time
+
+from utils.semantic_cache import SemanticCache, similarity_bucket
+
+
+def test_nearest_returns_most_similar_entry():
+    cache = SemanticCache("test.semantic")
+    assert cache.nearest([1.0, 0.0]) is None
+    cache.add([1.0, 0.0], "a", sources=["c1"])
+    cache.add([0.0, 1.0], "b")
+
+    entry, similarity = cache.nearest([2.0, 0.1])
+
+    assert entry.value == "a" and entry.sources == ("c1",)
+    assert similarity > 0.99
+    assert similarity_bucket(similarity) == "0.99"
+    assert similarity_bucket(0.5) == "lt_0.80"
+
+
+def test_full_cache_evicts_least_frequently_used():
+    cache = SemanticCache("test.semantic_lfu", max_size=2)
+    cache.add([1.0, 0.0], "hot")
+    cache.add([0.0, 1.0], "cold")
+    cache.record_hit(cache.nearest([1.0, 0.0])[0])
+
+    cache.add([1.0, 1.0], "new")
+
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.nearest([0.0, 1.0])[0].value != "cold"
+
+
+def test_entries_expire():
+    cache = SemanticCache("test.semantic_ttl", ttl=0.05)
+    cache.add([1.0, 0.0], "a")
+    time.sleep(0.06)
+
+    assert cache.nearest([1.0, 0.0]) is None
+    assert len(cache) == 0
@@ -0,0 +1,52 @@
+"""load_transactions: read once, re-read when the workbook changes."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from tools import spend_insights
+
+
+def _write(path, amounts, mtime):
+    pd.DataFrame({
+        "TXN_DATE": pd.to_datetime(["2024-01-01"] * len(amounts)),
+        "TXN_AMOUNT_LCY": amounts,
+        "genify_category": [None] * len(amounts),
+        "genify_clean_description": ["shop"] * len(amounts),
+    }).to_excel(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    path = tmp_path / "transactions.xlsx"
+    monkeypatch.setattr(spend_insights, "EXCEL_PATH", str(path))
+    monkeypatch.setattr(spend_insights, "_transactions_cache", None)
+    reads = []
+    read_excel = pd.read_excel
+    monkeypatch.setattr(spend_insights.pd, "read_excel",
+                        lambda *a, **k: reads.append(a[0]) or read_excel(*a, **k))
+    return path, reads
+
+
+def test_transactions_are_read_once_while_unchanged(workbook):
+    path, reads = workbook
+    _write(path, [10.0, 5.0], mtime=1_000)
+
+    first = spend_insights.load_transactions()
+    assert spend_insights.load_transactions() is first
+    assert spend_insights.get_total_spend() == 15.0
+    assert len(reads) == 1
+    assert set(first["genify_category"]) == {"Uncategorized"}
+
+
+def test_changed_workbook_is_reloaded(workbook):
+    path, reads = workbook
+    _write(path, [10.0], mtime=1_000)
+    spend_insights.load_transactions()
+
+    _write(path, [10.0, 7.0], mtime=2_000)
+
+    assert spend_insights.get_total_spend() == 17.0
+    assert len(reads) == 2
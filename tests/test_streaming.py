@@ -0,0 +1,89 @@
+"""Token streaming: subprocess deadlines, token_sink, and the SSE endpoints."""
+
+import json
+import subprocess
+import time
+
+import pytest
+
+from utils import llm_connector
+from utils.llm_connector import SubprocessBackend, run_llm_streamed, token_sink
+
+
+def test_subprocess_stream_enforces_deadline(fake_ollama_cli):
+    backend = SubprocessBackend()
+
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(backend.stream("sleep", 1))
+    assert time.monotonic() - start < 5
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """stream_llm yields fixed chunks; run_llm must not be used while a sink is active."""
+    monkeypatch.setattr(llm_connector, "stream_llm", lambda *a, **k: iter(["Reset ", "it ", "online."]))
+    monkeypatch.setattr(llm_connector, "run_llm", lambda *a, **k: "whole answer")
+
+
+def test_run_llm_streamed_forwards_chunks_to_the_sink(chunks):
+    received = []
+
+    with token_sink(received.append):
+        answer = run_llm_streamed("q")
+
+    assert received == ["Reset ", "it ", "online."]
+    assert answer == "Reset it online."
+    assert run_llm_streamed("q") == "whole answer"
+
+
+def _events(response):
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def api(monkeypatch, chunks):
+    for module in ("flask_cors", "fitz", "docx", "chromadb"):
+        pytest.importorskip(module)
+    from api import main
+
+    def faq(user_id, query):
+        return {"status": "ok", "answer": run_llm_streamed(query)}
+
+    monkeypatch.setattr(main, "handle_faq", faq)
+    return main
+
+
+def test_faq_stream_sends_tokens_then_done(api):
+    response = api.app.test_client().post("/faq/stream", json={"user_id": 1, "query": "reset pin"})
+
+    assert response.mimetype == "text/event-stream"
+    events = _events(response)
+    assert [e for e, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(d["text"] for e, d in events if e == "token") == "Reset it online."
+    assert events[-1][1] == {"status": "ok", "answer": "Reset it online.", "http_status": 200}
+
+
+def test_chatbot_stream_non_faq_turn_is_a_single_done_event(api, monkeypatch):
+    def turn(user_id, query, otp, fast=False):
+        api.save_user_state(user_id, dict(api.create_default_state(), contextual_questions=["Next?"]))
+        return api.jsonify({"status": "ok", "message": "Your balance is $10"}), 200
+
+    monkeypatch.setattr(api, "dispatch_chatbot_turn", turn)
+    response = api.app.test_client().post("/chatbot/stream", json={"user_id": 7, "query": "balance"})
+
+    assert _events(response) == [("done", {
+        "status": "ok", "message": "Your balance is $10",
+        "contextual_questions": ["Next?"], "http_status": 200,
+    })]
+
+
+def test_stream_endpoints_validate_before_streaming(api):
+    client = api.app.test_client()
+
+    assert client.post("/faq/stream", json={"query": " "}).status_code == 400
+    assert client.post("/chatbot/stream", json={}).status_code == 400
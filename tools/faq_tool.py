@@ -1,13 +1,25 @@
 #tools/faq_tool.py
 
+import hashlib
+import json
+import multiprocessing
 import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
 import docx
 import pandas as pd
-from typing import List, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from utils import metrics
+from utils.cache import TTLCache
+from utils.semantic_cache import SIMILARITY_BUCKETS, SemanticCache, similarity_bucket
 from utils.logger import get_logger
-from utils.llm_connector import run_llm
-from sentence_transformers import SentenceTransformer
+from utils.embedding_registry import DEFAULT_EMBEDDING_MODEL, get_embedding_model
+from utils.llm_connector import run_llm_streamed
+from utils.prompts import FAQ_ANSWER
 import chromadb
 
 logger = get_logger("FAQTool")
@@ -15,17 +27,20 @@ logger = get_logger("FAQTool")
 DATA_FOLDER = "data/faqs"  # folder containing all FAQ documents
 CHROMA_PATH = "data/chroma_faq_db"
 COLLECTION_NAME = "banking_faqs"
-EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_MODEL = DEFAULT_EMBEDDING_MODEL
 
 # ------------------ HELPERS ------------------ #
+# The extractors raise on unreadable files; iter_extracted_files isolates the
+# failure to that file so its previous vectors are kept and it is retried.
 
-def extract_text_from_pdf(path: str) -> List[Dict[str, str]]:
-    """Extract text per page & paragraph from a PDF file."""
+def extract_text_from_pdf(path: str, first_page: int = 0,
+                          last_page: Optional[int] = None) -> List[Dict[str, str]]:
+    """Extract text per page & paragraph from a PDF file (optionally pages [first, last))."""
     results = []
-    try:
-        doc = fitz.open(path)
-        for page_num, page in enumerate(doc, start=1):
-            text = page.get_text("text")
+    with fitz.open(path) as doc:
+        last_page = doc.page_count if last_page is None else min(last_page, doc.page_count)
+        for page_num in range(first_page + 1, last_page + 1):
+            text = doc[page_num - 1].get_text("text")
             paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
             for idx, para in enumerate(paragraphs):
                 snippet = para[:200].replace("\n", " ")
@@ -37,40 +52,33 @@ def extract_text_from_pdf(path: str) -> List[Dict[str, str]]:
                     "snippet": snippet,
                     "source_path": path,
                 })
-        doc.close()
-    except Exception as e:
-        logger.exception(f"Error reading PDF {path}: {e}")
     return results
 
 
 def extract_text_from_docx(path: str) -> List[Dict[str, str]]:
     """Extract text paragraphs from a Word file."""
     results = []
-    try:
-        doc = docx.Document(path)
-        for idx, para in enumerate(doc.paragraphs):
-            text = para.text.strip()
-            if not text:
-                continue
-            snippet = text[:200].replace("\n", " ")
-            results.append({
-                "text": text,
-                "file": os.path.basename(path),
-                "page": None,
-                "para": idx + 1,
-                "snippet": snippet,
-                "source_path": path,
-            })
-    except Exception as e:
-        logger.exception(f"Error reading DOCX {path}: {e}")
+    doc = docx.Document(path)
+    for idx, para in enumerate(doc.paragraphs):
+        text = para.text.strip()
+        if not text:
+            continue
+        snippet = text[:200].replace("\n", " ")
+        results.append({
+            "text": text,
+            "file": os.path.basename(path),
+            "page": None,
+            "para": idx + 1,
+            "snippet": snippet,
+            "source_path": path,
+        })
     return results
 
 
 def extract_text_from_excel(path: str) -> List[Dict[str, str]]:
     """Extract text from Excel files (all sheets)."""
     results = []
-    try:
-        xls = pd.ExcelFile(path)
+    with pd.ExcelFile(path) as xls:
         for sheet_name in xls.sheet_names:
             df = pd.read_excel(xls, sheet_name=sheet_name)
             for row_idx, row in df.iterrows():
@@ -86,113 +94,672 @@ def extract_text_from_excel(path: str) -> List[Dict[str, str]]:
                     "snippet": snippet,
                     "source_path": path,
                 })
-    except Exception as e:
-        logger.exception(f"Error reading Excel {path}: {e}")
     return results
 
 
-def load_all_documents() -> List[Dict[str, str]]:
-    """Load and extract text chunks from all supported files in folder."""
-    supported_ext = {".pdf", ".docx", ".xlsx"}
-    all_chunks = []
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".xlsx"}
+
+
+def list_source_files() -> List[str]:
+    """Paths of all supported documents under DATA_FOLDER, sorted."""
+    paths = []
     for root, _, files in os.walk(DATA_FOLDER):
         for file in files:
-            ext = os.path.splitext(file)[1].lower()
-            full_path = os.path.join(root, file)
-            if ext not in supported_ext:
+            if os.path.splitext(file)[1].lower() in SUPPORTED_EXTENSIONS:
+                paths.append(os.path.join(root, file))
+    return sorted(paths)
+
+
+def extract_file(path: str) -> List[Dict[str, str]]:
+    """Text chunks of one supported document."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        return extract_text_from_pdf(path)
+    if ext == ".docx":
+        return extract_text_from_docx(path)
+    if ext == ".xlsx":
+        return extract_text_from_excel(path)
+    return []
+
+
+# Extraction is CPU-bound (PyMuPDF, python-docx, pandas): fan it out over processes.
+FAQ_EXTRACT_WORKERS = int(os.environ.get("FAQ_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+# PDFs longer than this are split into page-range tasks
+FAQ_PDF_PAGES_PER_TASK = int(os.environ.get("FAQ_PDF_PAGES_PER_TASK", "25"))
+
+
+def _extraction_tasks(paths: List[str]) -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+    """(path, page range or None) per task, in path order."""
+    tasks = []
+    size = FAQ_PDF_PAGES_PER_TASK
+    for path in paths:
+        if size > 0 and path.lower().endswith(".pdf"):
+            try:
+                with fitz.open(path) as doc:
+                    pages = doc.page_count
+            except Exception:
+                pages = 0
+            if pages > size:
+                tasks.extend((path, (start, min(start + size, pages))) for start in range(0, pages, size))
                 continue
-            if ext == ".pdf":
-                all_chunks.extend(extract_text_from_pdf(full_path))
-            elif ext == ".docx":
-                all_chunks.extend(extract_text_from_docx(full_path))
-            elif ext == ".xlsx":
-                all_chunks.extend(extract_text_from_excel(full_path))
+        tasks.append((path, None))
+    return tasks
+
+
+def _extract_task(path: str, page_range: Optional[Tuple[int, int]]) -> Tuple[List[Dict[str, str]], float]:
+    """Worker entry point: chunks of one file (or PDF page range) and the time taken."""
+    start = time.perf_counter()
+    chunks = extract_text_from_pdf(path, *page_range) if page_range else extract_file(path)
+    return chunks, time.perf_counter() - start
+
+
+def _run_extraction_tasks(tasks, workers: int) -> Iterator[Tuple[str, Any]]:
+    """(path, (chunks, seconds) or exception) per task, in task order."""
+    if workers <= 1 or len(tasks) <= 1:
+        for path, page_range in tasks:
+            try:
+                yield path, _extract_task(path, page_range)
+            except Exception as e:
+                yield path, e
+        return
+
+    # Keep a bounded window of tasks in flight so results stream out in order.
+    # Spawned (not forked) workers: the parent may hold torch state and live
+    # threads (watcher, Flask) that are unsafe to fork.
+    window = workers * 2
+    queued = iter(tasks)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+
+        def submit_next():
+            task = next(queued, None)
+            if task is not None:
+                pending.append((task[0], pool.submit(_extract_task, *task)))
+
+        for _ in range(window):
+            submit_next()
+        while pending:
+            path, future = pending.popleft()
+            submit_next()
+            try:
+                yield path, future.result()
+            except Exception as e:
+                yield path, e
+
+
+def iter_extracted_files(paths: List[str],
+                         workers: int = FAQ_EXTRACT_WORKERS) -> Iterator[Tuple[str, Optional[List[Dict[str, str]]]]]:
+    """
+    Extract `paths` in parallel, yielding (path, chunks) in the given order.
+
+    chunks is None when extraction failed, including when any page range of
+    a split PDF failed (the error is logged and the other files are
+    unaffected).
+    """
+    tasks = _extraction_tasks(paths)
+    current, chunks, elapsed, failed = None, [], 0.0, False
+
+    def finish():
+        metrics.observe("faq.extract.file", elapsed)
+        if failed:
+            metrics.increment("faq.extract.errors")
+            return current, None
+        logger.info("Extracted %d chunks from %s in %.2fs", len(chunks), current, elapsed)
+        return current, chunks
+
+    for path, outcome in _run_extraction_tasks(tasks, workers):
+        if path != current:
+            if current is not None:
+                yield finish()
+            current, chunks, elapsed, failed = path, [], 0.0, False
+        if isinstance(outcome, Exception):
+            logger.error(f"Error extracting {path}: {outcome}")
+            failed = True
+            continue
+        task_chunks, seconds = outcome
+        chunks.extend(task_chunks)
+        elapsed += seconds
+    if current is not None:
+        yield finish()
+
+
+def iter_document_chunks(paths: Optional[List[str]] = None) -> Iterator[Dict[str, str]]:
+    """Stream text chunks of all (or the given) documents in deterministic order."""
+    for _, chunks in iter_extracted_files(list_source_files() if paths is None else paths):
+        yield from chunks or []
+
+
+def load_all_documents() -> List[Dict[str, str]]:
+    """Load and extract text chunks from all supported files in folder."""
+    all_chunks = list(iter_document_chunks())
     logger.info("Extracted %d total text chunks from documents.", len(all_chunks))
     return all_chunks
 
 
 # ------------------ CHROMADB SETUP ------------------ #
 
+class ChromaStore:
+    """
+    Process-wide Chroma client and collection handle.
+
+    The client is opened on first use and reused by every request. Whether
+    the collection holds any embeddings is checked once (ensure_vector_store
+    at startup) and then tracked in memory instead of counted per query.
+    """
+
+    def __init__(self, path: str, collection_name: str):
+        self.path = path
+        self.collection_name = collection_name
+        self._lock = threading.Lock()
+        self._client = None
+        self._collection = None
+        self._populated: Optional[bool] = None
+
+    def collection(self):
+        """The collection handle, opening the client/collection on first call."""
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    self._client = chromadb.PersistentClient(path=self.path)
+                    self._collection = self._client.get_or_create_collection(
+                        name=self.collection_name, metadata={"source": "faq_docs"}
+                    )
+                    logger.info("Opened ChromaDB collection: %s", self.collection_name)
+        return self._collection
+
+    def is_populated(self) -> bool:
+        """Whether the collection has entries; counted only the first time."""
+        if self._populated is None:
+            count = self.collection().count()
+            self._populated = count > 0
+            logger.info("ChromaDB collection %s has %d entries.", self.collection_name, count)
+        return self._populated
+
+    def mark_populated(self, populated: bool = True) -> None:
+        self._populated = populated
+
+    def close(self) -> None:
+        """Drop the handles; the next call reopens them."""
+        with self._lock:
+            self._collection = None
+            self._client = None
+            self._populated = None
+
+
+chroma_store = ChromaStore(CHROMA_PATH, COLLECTION_NAME)
+
+
 def get_chroma_collection():
-    client = chromadb.PersistentClient(path=CHROMA_PATH)
-    if COLLECTION_NAME not in [c.name for c in client.list_collections()]:
-        collection = client.create_collection(name=COLLECTION_NAME, metadata={"source": "faq_docs"})
-        logger.info("Created new ChromaDB collection: %s", COLLECTION_NAME)
-    else:
-        collection = client.get_collection(COLLECTION_NAME)
-    return collection
+    return chroma_store.collection()
 
 
-def build_vector_store():
-    """Embed and store all documents in ChromaDB."""
-    logger.info("Building ChromaDB vector store from documents...")
-    chunks = load_all_documents()
-    if not chunks:
-        raise ValueError("No documents found in FAQ data folder.")
+# ------------------ INCREMENTAL INDEXING ------------------ #
 
-    model = SentenceTransformer(EMBEDDING_MODEL)
-    collection = get_chroma_collection()
-    # Clear old data safely
-    try:
-        existing = collection.get()
-        if existing and len(existing["ids"]) > 0:
-            collection.delete(ids=existing["ids"])
-            logger.info(f"Cleared {len(existing['ids'])} old items from Chroma collection.")
-    except Exception as e:
-        logger.warning(f"Could not clear existing data: {e}")
-
-    embeddings = model.encode([c["text"] for c in chunks], convert_to_numpy=True).tolist()
-    # ✅ Prepare clean metadata — Chroma only accepts str, int, float, bool
-    metadatas = []
+# Per source file: content hash, stat signature and the ids of its chunks.
+# Chunk ids are hashes of (source path, text), so unchanged text keeps its
+# embedding even when the rest of the file is edited. The manifest also holds
+# the index version, so processes serving queries notice rebuilds made by
+# another process (e.g. the generate_faq_embeddings CLI).
+MANIFEST_PATH = os.path.join(CHROMA_PATH, "faq_manifest.json")
+MANIFEST_VERSION = 1
+FAQ_WATCH_INTERVAL_S = float(os.environ.get("FAQ_WATCH_INTERVAL_S", "5"))
+# New chunks are embedded and added to Chroma this many at a time; the
+# manifest is checkpointed after each batch so an interrupted build resumes.
+FAQ_INDEX_BATCH_SIZE = int(os.environ.get("FAQ_INDEX_BATCH_SIZE", "256"))
+
+_sync_lock = threading.Lock()
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_signature(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _chunk_ids(chunks: List[Dict[str, str]]) -> List[str]:
+    """Content-hash id per chunk; repeated text within a file gets a #n suffix."""
+    ids, seen = [], {}
     for c in chunks:
-        metadatas.append({
-            "file": str(c.get("file") or ""),
-            "page": int(c.get("page") or 0),
-            "para": int(c.get("para") or 0),
-            "snippet": str(c.get("snippet") or ""),
-            "source_path": str(c.get("source_path") or ""),
-        })
+        base = hashlib.sha256(f"{c.get('source_path')}\0{c['text']}".encode("utf-8")).hexdigest()[:32]
+        n = seen.get(base, 0)
+        seen[base] = n + 1
+        ids.append(base if n == 0 else f"{base}#{n}")
+    return ids
 
-    collection.add(
-        ids=[f"doc_{i}" for i in range(len(chunks))],
-        embeddings=embeddings,
-        documents=[c["text"] for c in chunks],
-        metadatas=metadatas,
-    )
+
+def _chunk_metadata(c: Dict[str, str]) -> Dict[str, object]:
+    # Chroma only accepts str, int, float, bool
+    return {
+        "file": str(c.get("file") or ""),
+        "page": int(c.get("page") or 0),
+        "para": int(c.get("para") or 0),
+        "snippet": str(c.get("snippet") or ""),
+        "source_path": str(c.get("source_path") or ""),
+    }
+
+
+def _read_manifest() -> Optional[dict]:
+    """Whole manifest, or None if missing/unreadable/of another format version."""
+    try:
+        with open(MANIFEST_PATH, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _load_manifest() -> Optional[Dict[str, dict]]:
+    """Manifest files entry, or None if missing/unreadable (index state unknown)."""
+    manifest = _read_manifest()
+    return None if manifest is None else manifest.get("files", {})
 
 
-    logger.info("Vector store built successfully with %d entries.", len(chunks))
-    return collection
+def _save_manifest(files: Dict[str, dict]) -> None:
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "index_version": _index_version, "files": files}, f)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def _clear_collection(collection) -> None:
+    existing = collection.get(include=[])
+    if existing and existing["ids"]:
+        collection.delete(ids=existing["ids"])
+        logger.info("Cleared %d old items from Chroma collection.", len(existing["ids"]))
+
+
+def _chunk_location(c: Dict[str, str]) -> List[int]:
+    return [int(c.get("page") or 0), int(c.get("para") or 0)]
+
+
+class _BatchIndexer:
+    """
+    Embeds and adds new chunks in fixed-size batches, checkpointing the manifest.
+
+    A changed file's manifest entry becomes final once all of its new chunks
+    are committed. Until then the checkpoint lists it with no hash (so the
+    next sync re-diffs it) and with the chunk ids already committed (so those
+    are not embedded again).
+    """
+
+    def __init__(self, collection, manifest: Dict[str, dict], batch_size: int,
+                 total_files: int, progress: Optional[Callable[[Dict[str, Any]], None]]):
+        self.collection = collection
+        self.files = manifest              # last committed state, written at each checkpoint
+        self.batch_size = max(1, batch_size)
+        self.progress = progress
+        self.total_files = total_files
+        self.files_done = 0
+        self.chunks_added = 0
+        self.batches = 0
+        self.start = time.perf_counter()
+        self._buffer: List[Tuple[str, str, Dict[str, str]]] = []
+        self._pending: Dict[str, dict] = {}   # path -> final entry and outstanding chunk count
+
+    def add_file(self, path: str, entry: dict, new_chunks: List[Tuple[str, Dict[str, str]]]) -> None:
+        base = (self.files.get(path) or {}).get("chunks", {})
+        kept = {k: v for k, v in base.items() if k in entry["chunks"]}
+        self.files[path] = {"hash": None, "signature": None, "chunks": kept}
+        self._pending[path] = {"entry": entry, "outstanding": len(new_chunks)}
+        if not new_chunks:
+            self._finish(path)
+        for chunk_id, chunk in new_chunks:
+            self._buffer.append((path, chunk_id, chunk))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit the buffered chunks (if any) and checkpoint."""
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            texts = [chunk["text"] for _, _, chunk in batch]
+            embeddings = get_embedding_model(EMBEDDING_MODEL).encode(texts, convert_to_numpy=True)
+            self.collection.upsert(
+                ids=[chunk_id for _, chunk_id, _ in batch],
+                embeddings=embeddings.tolist(),
+                documents=texts,
+                metadatas=[_chunk_metadata(chunk) for _, _, chunk in batch],
+            )
+            for path, chunk_id, chunk in batch:
+                self.files[path]["chunks"][chunk_id] = _chunk_location(chunk)
+                self._pending[path]["outstanding"] -= 1
+                if self._pending[path]["outstanding"] == 0:
+                    self._finish(path)
+            self.chunks_added += len(batch)
+            self.batches += 1
+            _bump_index_version()
+            metrics.increment("faq.index.chunks_added", len(batch))
+            self._report()
+        _save_manifest(self.files)
+
+    def _finish(self, path: str) -> None:
+        self.files[path] = self._pending.pop(path)["entry"]
+        self.files_done += 1
+
+    def _report(self) -> None:
+        elapsed = time.perf_counter() - self.start
+        info = {
+            "files_done": self.files_done,
+            "files_total": self.total_files,
+            "chunks_added": self.chunks_added,
+            "batches": self.batches,
+            "chunks_per_s": round(self.chunks_added / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        metrics.set_gauge("faq.index.files_done", self.files_done)
+        logger.info(
+            "FAQ index: %d/%d files, %d chunks embedded (%.1f/s)",
+            self.files_done, self.total_files, self.chunks_added, info["chunks_per_s"],
+        )
+        if self.progress:
+            self.progress(info)
+
+
+def sync_vector_store(full: bool = False, batch_size: int = FAQ_INDEX_BATCH_SIZE,
+                      progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+    """
+    Bring the collection in line with DATA_FOLDER, touching only what changed.
+
+    Files whose stat signature or content hash matches the manifest are
+    skipped without extraction. Changed files stream through extraction and
+    only chunks with new content ids are embedded, `batch_size` at a time,
+    each batch added to Chroma as soon as it is ready; ids that disappeared
+    are deleted and moved chunks get fresh metadata. The manifest is
+    checkpointed after every batch, so an interrupted run resumes from the
+    last committed batch. `full=True` (or a missing manifest) clears the
+    collection and re-embeds everything. `progress` receives a dict after
+    each batch.
+
+    Returns counts: files_changed, files_removed, added, deleted, updated.
+    """
+    with _sync_lock:
+        _refresh_index_version()  # continue from the version on disk
+        collection = get_chroma_collection()
+        manifest = None if full else _load_manifest()
+        if manifest is None:
+            logger.info("No usable index manifest; rebuilding the whole collection.")
+            _clear_collection(collection)
+            manifest = {}
+            _save_manifest(manifest)
+
+        stats = {"files_changed": 0, "files_removed": 0, "added": 0, "deleted": 0, "updated": 0}
+        sources = list_source_files()
+
+        for path in set(manifest) - set(sources):
+            entry = manifest.pop(path)
+            if entry["chunks"]:
+                collection.delete(ids=list(entry["chunks"]))
+            stats["files_removed"] += 1
+            stats["deleted"] += len(entry["chunks"])
+
+        changed = {}
+        for path in sources:
+            entry = manifest.get(path)
+            signature = _file_signature(path)
+            if entry and entry["signature"] == signature:
+                continue
+            content_hash = _file_hash(path)
+            if entry and entry["hash"] == content_hash:
+                manifest[path] = dict(entry, signature=signature)
+                continue
+            changed[path] = (content_hash, signature)
+
+        indexer = _BatchIndexer(collection, manifest, batch_size, len(changed), progress)
+        for path, chunks in iter_extracted_files(list(changed)):
+            if chunks is None:
+                continue  # keep the previous vectors; retried on the next sync
+            stats["files_changed"] += 1
+            content_hash, signature = changed[path]
+            ids = _chunk_ids(chunks)
+            old_chunks = (manifest.get(path) or {}).get("chunks", {})
+
+            removed = list(set(old_chunks) - set(ids))
+            if removed:
+                collection.delete(ids=removed)
+            moved = [
+                (chunk_id, chunk) for chunk_id, chunk in zip(ids, chunks)
+                if chunk_id in old_chunks and old_chunks[chunk_id] != _chunk_location(chunk)
+            ]
+            if moved:
+                collection.update(ids=[i for i, _ in moved],
+                                  metadatas=[_chunk_metadata(c) for _, c in moved])
+            new_chunks = [(i, c) for i, c in zip(ids, chunks) if i not in old_chunks]
+
+            stats["added"] += len(new_chunks)
+            stats["deleted"] += len(removed)
+            stats["updated"] += len(moved)
+            indexer.add_file(path, {
+                "hash": content_hash,
+                "signature": signature,
+                "chunks": {chunk_id: _chunk_location(c) for chunk_id, c in zip(ids, chunks)},
+            }, new_chunks)
+        indexer.flush()
+
+        chroma_store.mark_populated(any(e["chunks"] for e in manifest.values()))
+        if full or stats["added"] or stats["deleted"] or stats["updated"]:
+            _bump_index_version()
+            _save_manifest(manifest)
+        if any(stats.values()):
+            logger.info("FAQ index synced: %s", stats)
+        return stats
+
+
+def build_vector_store():
+    """Embed and store all documents in ChromaDB from scratch."""
+    logger.info("Building ChromaDB vector store from documents...")
+    if not list_source_files():
+        raise ValueError("No documents found in FAQ data folder.")
+    sync_vector_store(full=True)
+    logger.info("Vector store built successfully.")
+    return get_chroma_collection()
 
 
 def ensure_vector_store():
     """
-    Ensure ChromaDB is built at least once.
-    Called manually before first use or after adding new docs.
+    Ensure ChromaDB is built and up to date with DATA_FOLDER.
+    Called at startup; only added/changed/removed documents are re-indexed.
     """
-    collection = get_chroma_collection()
-    if collection.count() == 0:
+    if not chroma_store.is_populated():
         logger.info("No existing embeddings found. Building vector store...")
         build_vector_store()
     else:
-        logger.info("ChromaDB already populated with %d entries.", collection.count())
+        sync_vector_store()
+
+
+def watch_vector_store(interval: float = FAQ_WATCH_INTERVAL_S,
+                       stop_event: Optional[threading.Event] = None) -> threading.Thread:
+    """
+    Poll DATA_FOLDER in a daemon thread and apply index deltas as files change.
+
+    Each poll only stats files (see sync_vector_store); set `stop_event` to stop.
+    """
+    stop_event = stop_event or threading.Event()
+
+    def poll():
+        while not stop_event.wait(interval):
+            try:
+                sync_vector_store()
+            except Exception as e:
+                logger.warning(f"FAQ index sync failed: {e}")
+
+    thread = threading.Thread(target=poll, name="faq-index-watch", daemon=True)
+    thread.start()
+    logger.info("Watching %s for FAQ changes every %.1fs", DATA_FOLDER, interval)
+    return thread
 
 
 # ------------------ RETRIEVAL ------------------ #
 
+# Two-level cache for recurring questions:
+#   1. normalized query text -> query embedding (skips model.encode)
+#   2. (index version, retrieved chunk ids, normalized query) -> LLM answer
+# Any index change bumps the version, which orphans (and clears) cached answers.
+FAQ_CACHE_ENABLED = os.environ.get("FAQ_CACHE_ENABLED", "1") == "1"
+FAQ_EMBEDDING_CACHE_SIZE = int(os.environ.get("FAQ_EMBEDDING_CACHE_SIZE", "2048"))
+FAQ_EMBEDDING_CACHE_TTL = float(os.environ.get("FAQ_EMBEDDING_CACHE_TTL", str(24 * 60 * 60)))
+FAQ_ANSWER_CACHE_SIZE = int(os.environ.get("FAQ_ANSWER_CACHE_SIZE", "1024"))
+FAQ_ANSWER_CACHE_TTL = float(os.environ.get("FAQ_ANSWER_CACHE_TTL", str(60 * 60)))
+
+_query_embedding_cache = TTLCache(max_size=FAQ_EMBEDDING_CACHE_SIZE, default_ttl=FAQ_EMBEDDING_CACHE_TTL)
+_answer_cache = TTLCache(max_size=FAQ_ANSWER_CACHE_SIZE, default_ttl=FAQ_ANSWER_CACHE_TTL)
+_index_version = 0
+_manifest_signature: Optional[List[int]] = None   # manifest stat when _index_version was checked
+_index_version_lock = threading.Lock()
+
+# Semantic cache for paraphrased questions. Above FAQ_SEMANTIC_THRESHOLD a past
+# answer is served only if retrieval returns the same chunks (skipping just the
+# LLM), however close the match: a near-identical question can still need
+# different sources after the index changed.
+# Matches down to FAQ_SEMANTIC_TRACK_FLOOR are checked against retrieval for the
+# per-bucket metrics, so the threshold can be tuned from real traffic.
+FAQ_SEMANTIC_CACHE_ENABLED = os.environ.get("FAQ_SEMANTIC_CACHE_ENABLED", "1") == "1"
+FAQ_SEMANTIC_THRESHOLD = float(os.environ.get("FAQ_SEMANTIC_THRESHOLD", "0.92"))
+FAQ_SEMANTIC_TRACK_FLOOR = SIMILARITY_BUCKETS[-1]
+FAQ_SEMANTIC_CACHE_SIZE = int(os.environ.get("FAQ_SEMANTIC_CACHE_SIZE", "1024"))
+FAQ_SEMANTIC_CACHE_TTL = float(os.environ.get("FAQ_SEMANTIC_CACHE_TTL", str(6 * 60 * 60)))
+
+_semantic_cache = SemanticCache("faq.semantic", max_size=FAQ_SEMANTIC_CACHE_SIZE,
+                                ttl=FAQ_SEMANTIC_CACHE_TTL)
+
+
+def _bump_index_version() -> None:
+    _set_index_version(_index_version + 1)
+
+
+def _set_index_version(version: int) -> None:
+    global _index_version
+    with _index_version_lock:
+        _index_version = version
+        _answer_cache.clear()
+        _semantic_cache.clear()
+    metrics.set_gauge("faq.index.version", version)
+
+
+def _refresh_index_version() -> None:
+    """Adopt the manifest's index version if another process changed the index."""
+    global _manifest_signature
+    try:
+        signature = _file_signature(MANIFEST_PATH)
+    except OSError:
+        return
+    if signature == _manifest_signature:
+        return
+    _manifest_signature = signature
+    manifest = _read_manifest()
+    version = (manifest or {}).get("index_version", 0)
+    if version != _index_version:
+        logger.info("FAQ index changed on disk (version %d -> %d), clearing answer caches",
+                    _index_version, version)
+        metrics.increment("faq.index.external_changes")
+        _set_index_version(version)
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", query.lower()))
+
+
+def _cache_lookup(cache: TTLCache, name: str, key: str) -> Any:
+    if not FAQ_CACHE_ENABLED:
+        return None
+    value = cache.get(key)
+    metrics.increment(f"faq.cache.{name}.{'hit' if value is not None else 'miss'}")
+    return value
+
+
+def _embed_query(query: str) -> List[float]:
+    key = f"{EMBEDDING_MODEL}|{_normalize_query(query)}"
+    embedding = _cache_lookup(_query_embedding_cache, "embedding", key)
+    if embedding is None:
+        embedding = get_embedding_model(EMBEDDING_MODEL).encode([query], convert_to_numpy=True)[0].tolist()
+        if FAQ_CACHE_ENABLED:
+            _query_embedding_cache.set(key, embedding)
+    return embedding
+
+
+def _semantic_lookup(query_emb: List[float]):
+    """Nearest semantic cache entry and similarity, if one is close enough to matter."""
+    if not (FAQ_CACHE_ENABLED and FAQ_SEMANTIC_CACHE_ENABLED):
+        return None, 0.0
+    match = _semantic_cache.nearest(query_emb)
+    if match is None or match[1] < FAQ_SEMANTIC_TRACK_FLOOR:
+        metrics.increment("faq.cache.semantic.miss")
+        return None, 0.0
+    return match
+
+
+# served / rejected: above threshold and the retrieved sources did / did not match;
+# shadow_*: below threshold, checked only
+SEMANTIC_OUTCOMES = ("served", "rejected", "shadow_match", "shadow_mismatch")
+
+
+def _semantic_record(entry, similarity: float, outcome: str) -> None:
+    metrics.increment(f"faq.semantic.bucket.{similarity_bucket(similarity)}.{outcome}")
+    if outcome == "served":
+        metrics.increment("faq.cache.semantic.hit")
+        _semantic_cache.record_hit(entry)
+    else:
+        metrics.increment("faq.cache.semantic.miss")
+
+
+def _semantic_bucket_stats() -> Dict[str, Dict[str, Any]]:
+    """Per similarity bucket: outcome counts and how often cached sources matched retrieval."""
+    counters = metrics.snapshot()["counters"]
+    buckets = {}
+    for bound in SIMILARITY_BUCKETS:
+        bucket = similarity_bucket(bound)
+        counts = {o: counters.get(f"faq.semantic.bucket.{bucket}.{o}", 0) for o in SEMANTIC_OUTCOMES}
+        matched = counts["served"] + counts["shadow_match"]
+        checked = matched + counts["rejected"] + counts["shadow_mismatch"]
+        buckets[bucket] = dict(
+            counts,
+            lookups=sum(counts.values()),
+            source_match_rate=round(matched / checked, 3) if checked else None,
+        )
+    return buckets
+
+
+def get_faq_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters per FAQ cache level."""
+    stats = {"enabled": FAQ_CACHE_ENABLED, "index_version": _index_version}
+    for name, cache in (("embedding", _query_embedding_cache), ("answer", _answer_cache),
+                        ("semantic", _semantic_cache)):
+        hits = metrics.get_counter(f"faq.cache.{name}.hit")
+        misses = metrics.get_counter(f"faq.cache.{name}.miss")
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "entries": len(cache),
+            "evictions": cache.evictions,
+        }
+    stats["semantic"]["threshold"] = FAQ_SEMANTIC_THRESHOLD
+    stats["semantic"]["buckets"] = _semantic_bucket_stats()
+    return stats
+
+
 def search_faq(query: str) -> Dict[str, str]:
     """Search all stored docs, return top-2 relevant answers with source snippets."""
-    model = SentenceTransformer(EMBEDDING_MODEL)
-    collection = get_chroma_collection()
-
-    if collection.count() == 0:
+    if not chroma_store.is_populated():
         logger.info("FAQ vector DB empty, rebuilding...")
-        collection = build_vector_store()
+        build_vector_store()
+    collection = get_chroma_collection()
+    _refresh_index_version()
 
-    query_emb = model.encode([query], convert_to_numpy=True).tolist()
+    query_emb = _embed_query(query)
+    semantic_entry, similarity = _semantic_lookup(query_emb)
 
     results = collection.query(
-        query_embeddings=query_emb,
+        query_embeddings=[query_emb],
         n_results=2,
         include=["documents", "metadatas", "distances"],
     )
@@ -221,27 +788,40 @@ def search_faq(query: str) -> Dict[str, str]:
             "confidence": confidence
         })
 
+    top_conf = sources[0]["confidence"]
+    chunk_ids = sorted(results["ids"][0][:len(sources)])
+    if semantic_entry is not None:
+        matched = list(semantic_entry.sources) == chunk_ids
+        if similarity >= FAQ_SEMANTIC_THRESHOLD:
+            _semantic_record(semantic_entry, similarity, "served" if matched else "rejected")
+            if matched:
+                logger.info("FAQ semantic cache hit (%.3f) for query: %s", similarity, query)
+                return {"answer": semantic_entry.value["answer"], "confidence": top_conf,
+                        "sources": sources}
+        else:
+            _semantic_record(semantic_entry, similarity,
+                             "shadow_match" if matched else "shadow_mismatch")
+
+    answer_key = "|".join([str(_index_version), ",".join(chunk_ids), _normalize_query(query)])
+    cached_answer = _cache_lookup(_answer_cache, "answer", answer_key)
+    if cached_answer is not None:
+        logger.info("FAQ answer cache hit for query: %s", query)
+        return {"answer": cached_answer, "confidence": top_conf, "sources": sources}
+
     # Summarize best answer using LLM, grounded in retrieved snippets
     context = "\n\n".join([s["snippet"] for s in sources])
-    prompt = f"""
-    You are a helpful and concise banking FAQ assistant.
-    The user asked: "{query}".
-    Based strictly on the information provided below, give a clear and direct answer.
-    Do NOT mention documents, sources, file names, or any references. Do NOT provide document names or links.
-    Only provide the factual answer.
-
-    Context:
-    {context}
-
-    Return only the answer, without repeating the question.
-    """
+    rendered = FAQ_ANSWER.render(context=context, query=query)
     logger.info("Generating answer with LLM for query: %s", query)
-    logger.debug("LLM Prompt: %s", prompt)
+    logger.debug("LLM Prompt: %s", rendered.prompt)
     logger.debug("Context used for LLM: %s", context)
     logger.debug("Sources: %s", sources)
 
-    llm_answer = run_llm(prompt).strip()
-    top_conf = sources[0]["confidence"]
+    llm_answer = run_llm_streamed(rendered.prompt, system=rendered.system,
+                                  purpose="faq_answer").strip()
+    if llm_answer and FAQ_CACHE_ENABLED:
+        _answer_cache.set(answer_key, llm_answer)
+        if FAQ_SEMANTIC_CACHE_ENABLED:
+            _semantic_cache.add(query_emb, {"answer": llm_answer}, chunk_ids)
     logger.info("LLM Answer: %s", llm_answer)
     logger.info("Top confidence score: %.3f", top_conf)
     logger.info("Sources used: %s", sources)
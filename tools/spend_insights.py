@@ -1,20 +1,29 @@
 # tools/spend_insights.py
 import pandas as pd
+import os
 from datetime import datetime
-from functools import lru_cache
 
 from utils import logger
 
 logger = logger.get_logger("SpendInsightsTool")
 EXCEL_PATH = "data/transactions.xlsx"
 
-@lru_cache(maxsize=1)
+# (mtime, data) of the last transactions load
+_transactions_cache = None
+
 def load_transactions() -> pd.DataFrame:
-    """Load and cache the transactions Excel."""
+    """Load the transactions Excel, re-reading it only when the file has changed."""
+    global _transactions_cache
+    mtime = os.path.getmtime(EXCEL_PATH)
+    if _transactions_cache and _transactions_cache[0] == mtime:
+        return _transactions_cache[1]
+
     df = pd.read_excel(EXCEL_PATH, parse_dates=["TXN_DATE"])
     # Normalize column names if needed
     df["genify_category"] = df["genify_category"].fillna("Uncategorized")
     df["genify_clean_description"] = df["genify_clean_description"].fillna("")
+    logger.info("Loaded %d transactions from %s", len(df), EXCEL_PATH)
+    _transactions_cache = (mtime, df)
     return df
 
 def filter_transactions(start_date=None, end_date=None, category=None, merchant=None):
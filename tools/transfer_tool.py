@@ -9,6 +9,9 @@ from utils.logger import get_logger
 logger = get_logger("TransferTool")
 BENEFICIARIES_PATH = "data/beneficiaries.json"
 
+# (mtime, data) of the last successful beneficiaries load
+_beneficiaries_cache = None
+
 # Structure: { user_id: { "otp": "123456", "attempts": 0, "max_attempts": 3 } }
 OTP_STORE = {}
 
@@ -16,10 +19,16 @@ logger.info("Current working directory: %s", os.getcwd())
 
 
 def load_beneficiaries():
+    """Load beneficiaries, re-reading the file only when it has changed."""
+    global _beneficiaries_cache
     if not os.path.exists(BENEFICIARIES_PATH):
         logger.warning("Beneficiaries file not found at %s", BENEFICIARIES_PATH)
         return []
 
+    mtime = os.path.getmtime(BENEFICIARIES_PATH)
+    if _beneficiaries_cache and _beneficiaries_cache[0] == mtime:
+        return _beneficiaries_cache[1]
+
     logger.info("Beneficiaries file found. Attempting to load...")
     try:
         with open(BENEFICIARIES_PATH, "r") as f:
@@ -28,6 +37,7 @@ def load_beneficiaries():
             "Successfully loaded beneficiaries data with %d records",
             len(data) if isinstance(data, list) else 1,
         )
+        _beneficiaries_cache = (mtime, data)
         return data
     except json.JSONDecodeError as e:
         logger.error("Error decoding JSON from %s: %s", BENEFICIARIES_PATH, str(e))
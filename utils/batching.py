@@ -0,0 +1,92 @@
+# utils/batching.py
+"""
+Micro-batching for small, independent requests (e.g. intent classification).
+
+Callers block in submit(); a background worker collects requests that
+arrive within `max_wait_ms` of the first one (up to `max_batch_size`),
+runs the batch handler once and fans results back out.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+from . import metrics
+from .logger import get_logger
+
+logger = get_logger("MicroBatcher")
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent submit() calls into batches.
+
+    handler: takes a list of items and returns a list of results of the
+    same length and order. If it raises, every caller in that batch gets
+    the exception.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]], max_batch_size: int = 8,
+                 max_wait_ms: float = 5.0, name: str = "batcher"):
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Queue `item` and block until its batch has been processed."""
+        fut: Future = Future()
+        self._ensure_worker()
+        self._queue.put((item, fut))
+        return fut.result(timeout=timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name=f"{self.name}-worker", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[tuple]) -> None:
+        items = [item for item, _ in batch]
+        metrics.increment(f"{self.name}.batches")
+        metrics.increment(f"{self.name}.items", len(items))
+        start = time.perf_counter()
+        try:
+            results = self.handler(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch handler returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            logger.exception("%s batch of %d failed", self.name, len(items))
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        finally:
+            metrics.observe(f"{self.name}.batch_latency", time.perf_counter() - start)
+
+        for (_, fut), result in zip(batch, results):
+            fut.set_result(result)
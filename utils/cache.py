@@ -0,0 +1,118 @@
+# utils/cache.py
+"""
+Small cache primitives shared by the LLM connector and tools.
+
+- TTLCache: bounded in-memory LRU with per-entry expiry.
+- DiskCache: SQLite-backed string cache that survives restarts.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .logger import get_logger
+
+logger = get_logger("Cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a max size and per-entry TTL (seconds)."""
+
+    def __init__(self, max_size: int = 1024, default_ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """SQLite-backed key/value store for string values with expiry."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value, expires_at) or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
@@ -0,0 +1,66 @@
+# utils/calibrate_intent_threshold.py
+"""
+Pick INTENT_KEYWORD_THRESHOLD from a held-out labelled set.
+
+For each candidate threshold, reports how many held-out queries the keyword
+tier would answer (coverage) and how many of those it gets right
+(precision); queries labelled "unknown" count as wrong when answered. The
+suggested threshold has the best coverage among those meeting
+--target-precision, and the largest margin (highest value) among equals.
+Keep the held-out queries out of data/intent_examples.json. Example:
+
+    python -m utils.calibrate_intent_threshold --target-precision 0.98
+"""
+
+import argparse
+import json
+
+from langgraph_flow.services.intent_classifier import KEYWORD_MIN_EVIDENCE, IntentClassifier
+
+DEFAULT_HOLDOUT_PATH = "data/intent_holdout.json"
+
+
+def _score_holdout(path):
+    """(label, keyword intent, confidence) for every held-out query the tier could answer."""
+    with open(path, "r") as f:
+        holdout = json.load(f)
+    scored, total = [], 0
+    for label, queries in holdout.items():
+        for query in queries:
+            total += 1
+            score = IntentClassifier._score_keywords(query)
+            if score.intent is not None and score.evidence >= KEYWORD_MIN_EVIDENCE:
+                scored.append((label, score.intent, score.confidence))
+    return scored, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--holdout", default=DEFAULT_HOLDOUT_PATH)
+    parser.add_argument("--target-precision", type=float, default=0.98)
+    args = parser.parse_args()
+
+    scored, total = _score_holdout(args.holdout)
+    rows = []
+    for threshold in sorted({conf for _, _, conf in scored}):
+        answered = [(label, intent) for label, intent, conf in scored if conf >= threshold]
+        correct = sum(1 for label, intent in answered if label == intent)
+        precision = correct / len(answered) if answered else 1.0
+        rows.append({
+            "threshold": threshold,
+            "coverage": round(len(answered) / total, 3),
+            "precision": round(precision, 3),
+        })
+
+    passing = [row for row in rows if row["precision"] >= args.target_precision]
+    best = max(passing, key=lambda row: (row["coverage"], row["threshold"]), default=None)
+    print(json.dumps({
+        "queries": total,
+        "min_evidence": KEYWORD_MIN_EVIDENCE,
+        "thresholds": rows,
+        "suggested_threshold": best["threshold"] if best else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# utils/circuit_breaker.py
+"""
+Circuit breaker for a flaky dependency (the LLM backend).
+
+closed    -> calls pass; failures inside `window_seconds` are counted
+open      -> calls are rejected immediately for `recovery_timeout` seconds
+half_open -> up to `half_open_max_calls` probe calls pass; a success closes
+             the breaker, a failure re-opens it. A probe that neither
+             reports nor release()s within `probe_timeout` counts as failed.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from . import metrics
+from .logger import get_logger
+
+logger = get_logger("CircuitBreaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Thread-safe failure-count circuit breaker with metrics."""
+
+    def __init__(self, name: str, failure_threshold: int = 3, window_seconds: float = 60.0,
+                 recovery_timeout: float = 30.0, half_open_max_calls: int = 1,
+                 probe_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures: deque = deque()
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started_at = 0.0
+        metrics.set_gauge(f"{name}.breaker.state", _STATE_CODES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (counts as a probe when half-open)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN:
+                now = time.monotonic()
+                if self._half_open_calls < self.half_open_max_calls:
+                    self._half_open_calls += 1
+                    self._probe_started_at = now
+                    return True
+                if self.probe_timeout and now - self._probe_started_at > self.probe_timeout:
+                    # The outstanding probe never reported back
+                    metrics.increment(f"{self.name}.breaker.probe_timeouts")
+                    self._open(now)
+        metrics.increment(f"{self.name}.breaker.short_circuited")
+        return False
+
+    @property
+    def probing(self) -> bool:
+        """True while half-open, i.e. calls allowed now are recovery probes."""
+        return self.state == HALF_OPEN
+
+    def release(self) -> None:
+        """Give back a probe slot without a verdict (the call was abandoned)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            metrics.increment(f"{self.name}.breaker.failures")
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_seconds:
+                self._failures.popleft()
+            if self._state == CLOSED and len(self._failures) >= self.failure_threshold:
+                self._open(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "recent_failures": len(self._failures),
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+            }
+
+    # Callers must hold self._lock
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._failures.clear()
+        self._transition(OPEN)
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+
+    def _transition(self, new_state: str) -> None:
+        old_state = self._state
+        self._state = new_state
+        self._half_open_calls = 0
+        metrics.set_gauge(f"{self.name}.breaker.state", _STATE_CODES[new_state])
+        metrics.increment(f"{self.name}.breaker.transition.{old_state}_to_{new_state}")
+        logger.warning("Circuit breaker '%s': %s -> %s", self.name, old_state, new_state)
@@ -0,0 +1,173 @@
+# utils/concurrency.py
+"""
+Fair concurrency limiting for shared, slow resources (the LLM).
+
+FairLimiter caps the number of in-flight calls and hands out free slots
+round-robin across callers (e.g. user ids), so one user's burst of
+requests cannot starve another user's single request. Asyncio callers
+await acquire(); threads block in acquire_blocking() on the same queues.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Hashable, Optional, Tuple
+
+from . import metrics
+
+
+class _ThreadWaiter:
+    """Queue entry for a blocked thread; state changes happen under the limiter lock."""
+
+    __slots__ = ("event", "granted", "abandoned")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.abandoned = False
+
+
+class FairLimiter:
+    """
+    Bounded semaphore with per-key FIFO queues served round-robin.
+
+    Safe to use from several event loops/threads at once: async waiters are
+    woken on their own loop via call_soon_threadsafe, blocked threads via an
+    Event.
+    """
+
+    def __init__(self, max_concurrency: int, name: str = "limiter"):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self._lock = threading.Lock()
+        self._active = 0
+        # key -> deque of (loop, future, enqueued_at) for async waiters or
+        # (None, _ThreadWaiter, enqueued_at) for threads; order = round-robin order
+        self._queues: "OrderedDict[Hashable, Deque[Tuple]]" = OrderedDict()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    async def acquire(self, key: Hashable = None) -> None:
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.monotonic()
+        with self._lock:
+            if self._active < self.max_concurrency and not self._queues:
+                self._active += 1
+                self._record_wait(0.0)
+                return
+            fut = loop.create_future()
+            entry = (loop, fut, enqueued_at)
+            self._queues.setdefault(key, deque()).append(entry)
+            self._publish_depth()
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                queue = self._queues.get(key)
+                if queue is not None and entry in queue:
+                    queue.remove(entry)
+                    if not queue:
+                        del self._queues[key]
+                    self._publish_depth()
+                    raise
+            # Already granted: hand the slot back (if the grant callback has
+            # not run yet it will see the cancelled future and release itself).
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        self._record_wait(time.monotonic() - enqueued_at)
+
+    def acquire_blocking(self, key: Hashable = None, timeout: Optional[float] = None) -> bool:
+        """Thread counterpart of acquire(); False if no slot came within `timeout`."""
+        enqueued_at = time.monotonic()
+        with self._lock:
+            if self._active < self.max_concurrency and not self._queues:
+                self._active += 1
+                self._record_wait(0.0)
+                return True
+            waiter = _ThreadWaiter()
+            entry = (None, waiter, enqueued_at)
+            self._queues.setdefault(key, deque()).append(entry)
+            self._publish_depth()
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if not waiter.granted:
+                waiter.abandoned = True
+                queue = self._queues.get(key)
+                if queue is not None and entry in queue:
+                    queue.remove(entry)
+                    if not queue:
+                        del self._queues[key]
+                self._publish_depth()
+                metrics.increment(f"{self.name}.queue_timeouts")
+                return False
+        self._record_wait(time.monotonic() - enqueued_at)
+        return True
+
+    @contextmanager
+    def slot(self, key: Hashable = None, timeout: Optional[float] = None):
+        """Hold a slot for the block (threads); yields False if none came in time."""
+        acquired = self.acquire_blocking(key, timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release()
+
+    def release(self) -> None:
+        with self._lock:
+            while self._queues:
+                key, queue = next(iter(self._queues.items()))
+                loop, fut, _ = queue.popleft()
+                if queue:
+                    self._queues.move_to_end(key)
+                else:
+                    del self._queues[key]
+                if loop is None:
+                    if fut.abandoned:
+                        continue
+                    fut.granted = True
+                    fut.event.set()
+                    self._publish_depth()
+                    return
+                if fut.cancelled():
+                    continue
+                # The slot passes directly to the next waiter; _active is unchanged.
+                loop.call_soon_threadsafe(self._grant, fut)
+                self._publish_depth()
+                return
+            self._active -= 1
+            self._publish_depth()
+
+    def _grant(self, fut: asyncio.Future) -> None:
+        if fut.cancelled():
+            self.release()
+        else:
+            fut.set_result(None)
+
+    def _record_wait(self, seconds: float) -> None:
+        metrics.observe(f"{self.name}.queue_wait", seconds)
+
+    def _publish_depth(self) -> None:
+        metrics.set_gauge(f"{self.name}.waiting", sum(len(q) for q in self._queues.values()))
+        metrics.set_gauge(f"{self.name}.active", self._active)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
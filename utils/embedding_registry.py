@@ -0,0 +1,96 @@
+# utils/embedding_registry.py
+"""
+Process-wide registry of sentence embedding models.
+
+Each model is loaded once, on first use, and shared by every caller (FAQ
+retrieval, the embedding intent classifier, ...). Loading is guarded by a
+per-model lock so concurrent first requests wait for one load instead of
+each reading the weights. Load time and memory are recorded as metrics
+(embedding.model.<name>.*) and via get_loaded_models().
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+from . import metrics
+from .logger import get_logger
+
+logger = get_logger("EmbeddingRegistry")
+
+DEFAULT_EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+_models: Dict[str, Any] = {}
+_model_info: Dict[str, Dict[str, float]] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def get_embedding_model(name: str = DEFAULT_EMBEDDING_MODEL):
+    """
+    Shared SentenceTransformer for `name`, loaded on first call.
+
+    Raises ImportError if sentence-transformers is not installed.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _load_locks.setdefault(name, threading.Lock())
+    with lock:
+        model = _models.get(name)
+        if model is None:
+            model = _load(name)
+            _models[name] = model
+    return model
+
+
+def get_loaded_models() -> Dict[str, Dict[str, float]]:
+    """Load time and memory per loaded model."""
+    return {name: dict(info) for name, info in _model_info.items()}
+
+
+def _load(name: str):
+    from sentence_transformers import SentenceTransformer
+
+    logger.info("Loading embedding model: %s", name)
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    model = SentenceTransformer(name)
+    elapsed = time.perf_counter() - start
+
+    info = {
+        "load_s": round(elapsed, 3),
+        "params_mb": _params_mb(model),
+        "peak_rss_delta_mb": round(_peak_rss_mb() - rss_before, 1),
+    }
+    _model_info[name] = info
+    metrics.observe(f"embedding.model.{name}.load", elapsed)
+    metrics.set_gauge(f"embedding.model.{name}.params_mb", info["params_mb"])
+    metrics.set_gauge(f"embedding.model.{name}.peak_rss_delta_mb", info["peak_rss_delta_mb"])
+    logger.info(
+        "Loaded embedding model %s in %.2fs (%.1f MB weights, peak RSS +%.1f MB)",
+        name, elapsed, info["params_mb"], info["peak_rss_delta_mb"],
+    )
+    return model
+
+
+def _params_mb(model) -> float:
+    try:
+        size = sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return 0.0
+    return round(size / (1024 * 1024), 1)
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
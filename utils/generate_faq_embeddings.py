@@ -1,12 +1,45 @@
 # generate_faq_embeddings.py
-from tools.faq_tool import ensure_vector_store
+"""
+Index FAQ documents into ChromaDB.
+
+By default only added/changed/removed documents are re-embedded.
+
+    python -m utils.generate_faq_embeddings            # incremental sync
+    python -m utils.generate_faq_embeddings --rebuild  # re-embed everything
+    python -m utils.generate_faq_embeddings --watch    # keep syncing as files change
+"""
+import argparse
+import threading
+
+from tools.faq_tool import (
+    FAQ_INDEX_BATCH_SIZE, FAQ_WATCH_INTERVAL_S, sync_vector_store, watch_vector_store,
+)
 
 if __name__ == "__main__":
-    print("🔍 Checking FAQ embeddings...")
-    ensure_vector_store()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rebuild", action="store_true", help="clear and re-embed all documents")
+    parser.add_argument("--watch", action="store_true", help="poll for changes until interrupted")
+    parser.add_argument("--batch-size", type=int, default=FAQ_INDEX_BATCH_SIZE,
+                        help="chunks embedded and added to Chroma per batch")
+    parser.add_argument("--interval", type=float, default=FAQ_WATCH_INTERVAL_S,
+                        help="seconds between polls in --watch mode")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print("Rebuilding embeddings from scratch...")
+    else:
+        print("🔍 Checking FAQ embeddings...")
+    # An interrupted run resumes from its last committed batch (rerun without --rebuild)
+    sync_vector_store(full=args.rebuild, batch_size=args.batch_size,
+                      progress=lambda p: print(f"  {p['files_done']}/{p['files_total']} files, "
+                                               f"{p['chunks_added']} chunks embedded"))
     print("✅ Vector store ready!")
 
-    # Optional: force rebuild if you’ve added new or updated files
-    # print("Rebuilding embeddings from scratch...")
-    # build_vector_store()
-    # print("✅ Embeddings regenerated successfully.")
\ No newline at end of file
+    if args.watch:
+        stop = threading.Event()
+        watch_vector_store(args.interval, stop)
+        try:
+            while not stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            stop.set()
@@ -0,0 +1,51 @@
+# utils/latency_budget.py
+"""
+Per-request latency budget helpers.
+
+A request carries an absolute `deadline` (time.time() based) and an
+optional `fast` flag. Optional LLM steps call has_budget() before running
+and fall back to their deterministic path when it returns False.
+"""
+
+import time
+from typing import Optional
+
+from . import metrics
+
+# Rough wall-clock cost of each optional LLM step; a step only runs if at
+# least this much budget is left.
+OPTIONAL_STEP_ESTIMATES = {
+    "contextual_questions": 4.0,
+}
+DEFAULT_STEP_ESTIMATE = 4.0
+
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before `deadline`, or None when there is no deadline."""
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def has_budget(step: str, deadline: Optional[float], fast: bool = False) -> bool:
+    """
+    True if optional `step` may run. Records a degradation metric otherwise.
+    """
+    if fast:
+        metrics.increment(f"budget.degraded.{step}.fast")
+        return False
+    remaining = remaining_seconds(deadline)
+    if remaining is None:
+        return True
+    if remaining < OPTIONAL_STEP_ESTIMATES.get(step, DEFAULT_STEP_ESTIMATE):
+        metrics.increment(f"budget.degraded.{step}.deadline")
+        return False
+    return True
+
+
+def step_timeout(deadline: Optional[float], default: int = 60) -> int:
+    """LLM timeout for a step: the default, capped by the remaining budget."""
+    remaining = remaining_seconds(deadline)
+    if remaining is None:
+        return default
+    return max(1, min(default, int(remaining)))
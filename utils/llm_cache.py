@@ -0,0 +1,106 @@
+# utils/llm_cache.py
+"""
+Content-addressed cache for LLM responses.
+
+Keys are a SHA-256 over (model, prompt, generation params), so identical
+prompts from different users share one entry. Two tiers:
+- a bounded in-memory LRU with per-entry TTL
+- an optional SQLite tier (LLM_CACHE_PATH) that survives restarts
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from . import metrics
+from .cache import DiskCache, TTLCache
+from .logger import get_logger
+
+logger = get_logger("LLMCache")
+
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "2048"))
+# Empty disables the on-disk tier.
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "")
+
+
+def make_key(model: str, prompt: str, **params: Any) -> str:
+    """Stable hash of everything that influences the generated text."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (memory + optional disk) cache with hit/miss counters."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, path: str = LLM_CACHE_PATH):
+        self.memory = TTLCache(max_size=max_entries)
+        self.disk: Optional[DiskCache] = None
+        if path:
+            try:
+                self.disk = DiskCache(path)
+                logger.info("LLM disk cache enabled at %s", path)
+            except Exception as e:
+                logger.warning("Could not open LLM disk cache at %s: %s", path, e)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            metrics.increment("llm.cache.hit.memory")
+            return value
+
+        if self.disk is not None:
+            try:
+                row = self.disk.get(key)
+            except Exception as e:
+                logger.warning("LLM disk cache read failed: %s", e)
+                row = None
+            if row is not None:
+                value, expires_at = row
+                ttl = expires_at - time.time() if expires_at is not None else None
+                self.memory.set(key, value, ttl=ttl)
+                metrics.increment("llm.cache.hit.disk")
+                return value
+
+        metrics.increment("llm.cache.miss")
+        return None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.memory.set(key, value, ttl=ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, time.time() + ttl)
+            except Exception as e:
+                logger.warning("LLM disk cache write failed: %s", e)
+        metrics.increment("llm.cache.store")
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits_memory = metrics.get_counter("llm.cache.hit.memory")
+        hits_disk = metrics.get_counter("llm.cache.hit.disk")
+        misses = metrics.get_counter("llm.cache.miss")
+        lookups = hits_memory + hits_disk + misses
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "hits_memory": hits_memory,
+            "hits_disk": hits_disk,
+            "misses": misses,
+            "hit_rate": round((hits_memory + hits_disk) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "disk_enabled": self.disk is not None,
+        }
+
+
+llm_cache = LLMResponseCache()
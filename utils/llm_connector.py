@@ -1,35 +1,675 @@
 # utils/llm_connector.py
+import codecs
+import contextvars
+import os
+import select
 import subprocess
 import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .circuit_breaker import CircuitBreaker
+from .concurrency import FairLimiter
+from .llm_cache import LLM_CACHE_ENABLED, llm_cache, make_key
+from .llm_fake_backend import FakeBackend
 from .logger import get_logger
 
 logger = get_logger("LLMConnector")
 
+LLM_MODEL = os.environ.get("LLM_MODEL", "openchat:latest")
+# Registered backends: "http" (long-lived Ollama-compatible server), "subprocess"
+# (`ollama run` per call) and "fake" (deterministic, for load tests).
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "http")
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+LLM_HTTP_POOL_SIZE = int(os.environ.get("LLM_HTTP_POOL_SIZE", "10"))
+# How long the server keeps the model loaded after a request (Ollama duration string)
+LLM_KEEP_ALIVE = os.environ.get("LLM_KEEP_ALIVE", "30m")
+# Max model calls in flight (all callers share one fair queue, served round-robin
+# by the llm_user() of each request); a local model serves ~1 at a time.
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "2"))
+# Circuit breaker: after LLM_BREAKER_FAILURES failures/timeouts within
+# LLM_BREAKER_WINDOW_S, calls return "" at once (callers use their
+# deterministic fallbacks) until a probe after LLM_BREAKER_RESET_S succeeds.
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_WINDOW_S = float(os.environ.get("LLM_BREAKER_WINDOW_S", "60"))
+LLM_BREAKER_RESET_S = float(os.environ.get("LLM_BREAKER_RESET_S", "30"))
+# Recovery probes get at most this long; a probe slot unreported after twice
+# that (e.g. an abandoned stream) is treated as a failed probe.
+LLM_BREAKER_PROBE_TIMEOUT_S = float(os.environ.get("LLM_BREAKER_PROBE_TIMEOUT_S", "10"))
 
-def run_llm(prompt: str, timeout: int = 60) -> str:
-    """
-    Call ollama with openchat:latest and return its output as string.
-    """
-    try:
-      
+# Generation options per call purpose (Ollama option names). `format: json`
+# constrains output to a single JSON value, so extraction ends at the closing
+# brace; explicit `options` passed to run_llm override the profile.
+GENERATION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "classify": {"temperature": 0.0, "num_predict": 5},
+    "extract": {"temperature": 0.0, "num_predict": 256, "format": "json"},
+    "summarize": {"temperature": 0.3, "num_predict": 200, "stop": ["\nUser:", "\nQuery:"]},
+    "suggest": {"temperature": 0.5, "num_predict": 200},
+    "faq_answer": {"temperature": 0.2, "num_predict": 300, "stop": ["\nUser:", "\nQuestion:"]},
+}
+
+# Model per call purpose, overridable with LLM_MODEL_<PURPOSE>
+# (e.g. LLM_MODEL_CLASSIFY=qwen2.5:0.5b). Routed calls that error fall back
+# to the backend's default model; per-route latency/fallbacks go to metrics.
+LLM_PURPOSES = ("classify", "extract", "summarize", "suggest", "faq_answer")
+MODEL_ROUTES: Dict[str, str] = {
+    purpose: os.environ.get(f"LLM_MODEL_{purpose.upper()}", LLM_MODEL) for purpose in LLM_PURPOSES
+}
+
+
+class LLMBackendError(Exception):
+    """Raised by a backend when the model call fails."""
+
+
+class LLMBackendUnavailable(LLMBackendError):
+    """Raised when a backend cannot be reached at all (e.g. server not running)."""
+
+
+def _with_system(prompt: str, system: Optional[str]) -> str:
+    """Prepend the system block for backends that only take a single prompt."""
+    return f"{system}\n\n{prompt}" if system else prompt
+
+
+def _resolve_options(purpose: Optional[str], options: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Profile for `purpose` overlaid with explicit options; None when neither is set."""
+    resolved = dict(GENERATION_PROFILES.get(purpose, {}))
+    resolved.update(options or {})
+    return resolved or None
+
+
+def _ollama_payload_options(payload: Dict[str, Any], options: Optional[Dict[str, Any]]) -> None:
+    """Map generation options onto an /api/generate payload."""
+    if not options:
+        return
+    options = dict(options)
+    fmt = options.pop("format", None)
+    if fmt:
+        payload["format"] = fmt
+    if not options.get("stop"):
+        options.pop("stop", None)
+    if options:
+        payload["options"] = options
+
+
+class SubprocessBackend:
+    """Spawns `ollama run <model>` for every prompt."""
+
+    name = "subprocess"
+
+    def __init__(self, model: str = LLM_MODEL):
+        self.model = model
+
+    def _command(self, options: Optional[Dict[str, Any]], model: Optional[str]) -> list:
+        # `ollama run` only exposes the output format; sampling options need the HTTP API
+        cmd = ["ollama", "run", model or self.model]
+        if options and options.get("format"):
+            cmd += ["--format", options["format"]]
+        return cmd
+
+    def generate(self, prompt: str, timeout: int, system: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> str:
         result = subprocess.run(
-            ["ollama", "run", "openchat:latest"],
-            input=prompt.encode("utf-8"),
+            self._command(options, model),
+            input=_with_system(prompt, system).encode("utf-8"),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             timeout=timeout,
         )
-        
-        
         if result.returncode != 0:
-            logger.error("LLM error: %s", result.stderr.decode("utf-8"))
+            raise LLMBackendError(result.stderr.decode("utf-8"))
+        return result.stdout.decode("utf-8").strip()
+
+    def stream(self, prompt: str, timeout: int, system: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> Iterator[str]:
+        proc = subprocess.Popen(
+            self._command(options, model),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        deadline = time.monotonic() + timeout
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+        stderr = []
+        try:
+            proc.stdin.write(_with_system(prompt, system).encode("utf-8"))
+            proc.stdin.close()
+            # select() so a silent process cannot block past the deadline;
+            # stderr is drained too so the child never stalls on a full pipe.
+            open_fds = [out_fd, err_fd]
+            while out_fd in open_fds:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                ready, _, _ = select.select(open_fds, [], [], remaining)
+                if not ready:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                for fd in ready:
+                    data = os.read(fd, 1024)
+                    if not data:
+                        open_fds.remove(fd)
+                    elif fd == err_fd:
+                        stderr.append(data)
+                    else:
+                        text = decoder.decode(data)
+                        if text:
+                            yield text
+            returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0.1))
+            if returncode != 0:
+                if err_fd in open_fds:
+                    stderr.append(proc.stderr.read())
+                raise LLMBackendError(b"".join(stderr).decode("utf-8", errors="replace"))
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+
+    def warm_up(self, timeout: int, model: Optional[str] = None) -> None:
+        # `ollama run` loads the model on first use and keeps it for OLLAMA_KEEP_ALIVE
+        self.generate("Hi", timeout, model=model)
+
+
+class HTTPBackend:
+    """
+    Talks to a local Ollama-compatible server (`POST /api/generate`).
+
+    A single requests.Session is shared by all threads so TCP connections
+    are pooled and kept alive between calls.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = LLM_MODEL,
+                 pool_size: int = LLM_HTTP_POOL_SIZE, keep_alive: str = LLM_KEEP_ALIVE):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.keep_alive = keep_alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, prompt: str, timeout: int, system: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> str:
+        payload = {"model": model or self.model, "prompt": prompt, "stream": False,
+                   "keep_alive": self.keep_alive}
+        if system:
+            payload["system"] = system
+        _ollama_payload_options(payload, options)
+        try:
+            resp = self.session.post(
+                f"{self.base_url}/api/generate", json=payload, timeout=timeout
+            )
+        except requests.ConnectionError as e:
+            raise LLMBackendUnavailable(str(e)) from e
+
+        if resp.status_code != 200:
+            raise LLMBackendError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+        try:
+            return (resp.json().get("response") or "").strip()
+        except json.JSONDecodeError as e:
+            raise LLMBackendError(f"Invalid JSON from LLM server: {e}") from e
+
+    def stream(self, prompt: str, timeout: int, system: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> Iterator[str]:
+        payload = {"model": model or self.model, "prompt": prompt, "stream": True,
+                   "keep_alive": self.keep_alive}
+        if system:
+            payload["system"] = system
+        _ollama_payload_options(payload, options)
+        try:
+            resp = self.session.post(
+                f"{self.base_url}/api/generate", json=payload, timeout=timeout, stream=True
+            )
+        except requests.ConnectionError as e:
+            raise LLMBackendUnavailable(str(e)) from e
+
+        with resp:
+            if resp.status_code != 200:
+                raise LLMBackendError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                try:
+                    chunk = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise LLMBackendError(f"Invalid stream chunk from LLM server: {e}") from e
+                if chunk.get("error"):
+                    raise LLMBackendError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    def warm_up(self, timeout: int, model: Optional[str] = None) -> None:
+        # An empty prompt makes Ollama load the model without generating anything
+        try:
+            resp = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model or self.model, "prompt": "", "keep_alive": self.keep_alive},
+                timeout=timeout,
+            )
+        except requests.ConnectionError as e:
+            raise LLMBackendUnavailable(str(e)) from e
+        if resp.status_code != 200:
+            raise LLMBackendError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# Backend registry: name -> zero-arg factory. A backend provides
+# generate(prompt, timeout, system=None, options=None, model=None) -> str and
+# stream(prompt, timeout, system=None, options=None, model=None) -> Iterator[str],
+# raising LLMBackendError / LLMBackendUnavailable on failure. model=None means
+# the backend's own default model.
+_backend_factories: Dict[str, Callable[[], object]] = {}
+_backends: Dict[str, object] = {}
+_backends_lock = threading.Lock()
+_active_backend = LLM_BACKEND
+
+
+def register_backend(name: str, factory: Callable[[], object]) -> None:
+    """Register (or replace) a backend factory under `name`."""
+    with _backends_lock:
+        _backend_factories[name] = factory
+        _backends.pop(name, None)
+
+
+def set_backend(name: str) -> None:
+    """Switch the default backend used by run_llm and friends."""
+    global _active_backend
+    if name not in _backend_factories:
+        raise ValueError(f"Unknown LLM backend: {name}")
+    _active_backend = name
+    logger.info("Active LLM backend set to: %s", name)
+
+
+def get_backend(name: Optional[str] = None):
+    """Return the process-wide backend instance for `name` (default: active backend)."""
+    name = name or _active_backend
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                if name not in _backend_factories:
+                    raise ValueError(f"Unknown LLM backend: {name}")
+                backend = _backend_factories[name]()
+                _backends[name] = backend
+                logger.info("Initialized LLM backend: %s", name)
+    return backend
+
+
+register_backend(SubprocessBackend.name, SubprocessBackend)
+register_backend(HTTPBackend.name, HTTPBackend)
+register_backend(FakeBackend.name, FakeBackend)
+
+llm_breaker = CircuitBreaker(
+    "llm",
+    failure_threshold=LLM_BREAKER_FAILURES,
+    window_seconds=LLM_BREAKER_WINDOW_S,
+    recovery_timeout=LLM_BREAKER_RESET_S,
+    probe_timeout=2 * LLM_BREAKER_PROBE_TIMEOUT_S,
+)
+
+
+llm_limiter = FairLimiter(LLM_MAX_CONCURRENCY, name="llm")
+
+# Fairness key (user id) of the request being served; see llm_user.
+_llm_user: contextvars.ContextVar = contextvars.ContextVar("llm_user", default=None)
+
+
+@contextmanager
+def llm_user(user_id: Hashable):
+    """Queue LLM calls made in this context under `user_id` in llm_limiter."""
+    token = _llm_user.set(user_id)
+    try:
+        yield
+    finally:
+        _llm_user.reset(token)
+
+
+def _call_timeout(timeout: float) -> float:
+    """Timeout for a call just admitted by the breaker (shorter for recovery probes)."""
+    return min(timeout, LLM_BREAKER_PROBE_TIMEOUT_S) if llm_breaker.probing else timeout
+
+
+def run_llm(prompt: str, timeout: int = 60, cache_ttl: Optional[float] = None,
+            system: Optional[str] = None, purpose: Optional[str] = None,
+            options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Run the prompt against the configured model and return its output as string.
+
+    Uses the persistent HTTP backend by default and falls back to spawning
+    `ollama run` when the server is unreachable. Returns "" on any failure,
+    and immediately while the circuit breaker is open.
+
+    cache_ttl: if set, identical prompts are served from the response cache
+    for that many seconds. Empty (failed) outputs are never cached.
+    system: static instructions sent ahead of `prompt` (see utils.prompts);
+    keeping them separate lets the server reuse its prompt cache.
+    purpose: selects a GENERATION_PROFILES entry (max tokens, stop
+    sequences, temperature, JSON format; `options` override it) and the
+    model from MODEL_ROUTES.
+    """
+    options = _resolve_options(purpose, options)
+    key, cached = _cache_lookup(prompt, cache_ttl, system, options, purpose)
+    if cached is not None:
+        return cached
+
+    output = _generate(prompt, timeout, system, options, purpose)
+    if key and output:
+        llm_cache.set(key, output, cache_ttl)
+    return output
+
+
+def stream_llm(prompt: str, timeout: int = 60, cache_ttl: Optional[float] = None,
+               system: Optional[str] = None, purpose: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """
+    Generator version of run_llm: yields text chunks as the model produces them.
+
+    A cache hit is yielded as a single chunk. Errors end the stream early
+    (logged, never raised), mirroring run_llm returning "".
+    """
+    options = _resolve_options(purpose, options)
+    key, cached = _cache_lookup(prompt, cache_ttl, system, options, purpose)
+    if cached is not None:
+        yield cached
+        return
+
+    # Breaker first: while it is open, calls must not queue for a limiter slot
+    if not llm_breaker.allow():
+        logger.warning("LLM circuit open, skipping streamed call")
+        return
+    if not llm_limiter.acquire_blocking(_llm_user.get(), timeout):
+        llm_breaker.release()
+        logger.warning("No LLM slot within %ds, skipping streamed call", timeout)
+        return
+    try:
+        yield from _stream_backend(prompt, timeout, system, options, purpose, key, cache_ttl)
+    finally:
+        llm_limiter.release()
+
+
+def _stream_backend(prompt: str, timeout: int, system: Optional[str],
+                    options: Optional[Dict[str, Any]], purpose: Optional[str],
+                    key: Optional[str], cache_ttl: Optional[float]) -> Iterator[str]:
+    """Body of stream_llm once the breaker admitted the call and a limiter slot is held."""
+    timeout = _call_timeout(timeout)
+
+    route = purpose or "default"
+    model = _route_model(purpose)
+    metrics.increment(f"llm.route.{route}.calls")
+    start = time.perf_counter()
+    parts = []
+    chunks = None
+    settled = False  # success/failure recorded (or about to be)
+    try:
+        backend = get_backend()
+        try:
+            chunks, first = _open_stream(backend, prompt, timeout, system, options, model, route)
+        except LLMBackendUnavailable as e:
+            if backend.name == SubprocessBackend.name:
+                raise
+            logger.warning("LLM backend '%s' unavailable (%s), falling back to subprocess",
+                           backend.name, e)
+            chunks, first = _open_stream(get_backend(SubprocessBackend.name), prompt, timeout,
+                                         system, options, model, route)
+        if first is not None:
+            parts.append(first)
+            yield first
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        settled = True
+    except (subprocess.TimeoutExpired, requests.Timeout, TimeoutError):
+        logger.error("LLM stream timed out after %ds", timeout)
+        _record_route_failure(route)
+        settled = True
+        return
+    except LLMBackendError as e:
+        logger.error("LLM error: %s", str(e))
+        _record_route_failure(route)
+        settled = True
+        return
+    except Exception as e:
+        logger.exception("Unexpected error in stream_llm: %s", str(e))
+        _record_route_failure(route)
+        settled = True
+        return
+    finally:
+        metrics.observe(f"llm.route.{route}.latency", time.perf_counter() - start)
+        if not settled:
+            # The consumer stopped reading (close()/GC): the model was producing
+            # output, so that is a success; with nothing received, just free
+            # the probe slot so the breaker cannot stay half-open forever.
+            if parts:
+                llm_breaker.record_success()
+            else:
+                llm_breaker.release()
+            if chunks is not None:
+                chunks.close()
+
+    llm_breaker.record_success()
+    output = "".join(parts).strip()
+    if key and output:
+        llm_cache.set(key, output, cache_ttl)
+
+
+# Callback receiving text chunks for the request currently being served (see token_sink).
+_token_sink: contextvars.ContextVar = contextvars.ContextVar("llm_token_sink", default=None)
+
+
+@contextmanager
+def token_sink(callback: Callable[[str], None]):
+    """
+    Route tokens from run_llm_streamed calls made in this context to `callback`.
+
+    Used by streaming endpoints so user-facing answers generated deep in the
+    graph reach the client as they are produced. Only run_llm_streamed
+    forwards chunks (today: FAQ answers); run_llm calls for labels, slots
+    and JSON never reach the sink.
+    """
+    token = _token_sink.set(callback)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+def run_llm_streamed(prompt: str, timeout: int = 60, cache_ttl: Optional[float] = None,
+                     system: Optional[str] = None, purpose: Optional[str] = None,
+                     options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Same contract as run_llm, but forwards chunks to the active token_sink
+    (if any) while generating. Use for user-facing prose, not JSON/labels.
+    """
+    sink = _token_sink.get()
+    if sink is None:
+        return run_llm(prompt, timeout, cache_ttl=cache_ttl, system=system,
+                       purpose=purpose, options=options)
+
+    parts = []
+    for chunk in stream_llm(prompt, timeout, cache_ttl=cache_ttl, system=system,
+                            purpose=purpose, options=options):
+        sink(chunk)
+        parts.append(chunk)
+    return "".join(parts).strip()
+
+
+def _cache_lookup(prompt: str, cache_ttl: Optional[float], system: Optional[str] = None,
+                  options: Optional[Dict[str, Any]] = None,
+                  purpose: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Return (cache key or None, cached output or None)."""
+    if not cache_ttl or not LLM_CACHE_ENABLED:
+        return None, None
+    key = _cache_key(prompt, system, options, purpose)
+    return key, llm_cache.get(key)
+
+
+def _route_model(purpose: Optional[str]) -> Optional[str]:
+    """Model routed for `purpose`, or None when it is the default model."""
+    model = MODEL_ROUTES.get(purpose)
+    return model if model and model != LLM_MODEL else None
+
+
+def _record_route_failure(route: str) -> None:
+    metrics.increment(f"llm.route.{route}.errors")
+    llm_breaker.record_failure()
+
+
+def _generate_routed(backend, prompt: str, timeout: int, system: Optional[str],
+                     options: Optional[Dict[str, Any]], model: Optional[str], route: str) -> str:
+    """generate() on the routed model, retrying once on the default model if it errors."""
+    if model is not None:
+        try:
+            return backend.generate(prompt, timeout, system, options, model=model)
+        except LLMBackendUnavailable:
+            raise
+        except LLMBackendError as e:
+            metrics.increment(f"llm.route.{route}.fallback")
+            logger.warning("Model '%s' failed for %s (%s), falling back to default model",
+                           model, route, e)
+    return backend.generate(prompt, timeout, system, options)
+
+
+def _open_stream(backend, prompt: str, timeout: int, system: Optional[str],
+                 options: Optional[Dict[str, Any]], model: Optional[str], route: str):
+    """Start a stream and pull its first chunk, so routed-model errors can still fall back."""
+    if model is not None:
+        try:
+            chunks = backend.stream(prompt, timeout, system, options, model=model)
+            return chunks, next(chunks, None)
+        except LLMBackendUnavailable:
+            raise
+        except LLMBackendError as e:
+            metrics.increment(f"llm.route.{route}.fallback")
+            logger.warning("Model '%s' failed for %s (%s), falling back to default model",
+                           model, route, e)
+    chunks = backend.stream(prompt, timeout, system, options)
+    return chunks, next(chunks, None)
+
+
+def _generate(prompt: str, timeout: int, system: Optional[str] = None,
+              options: Optional[Dict[str, Any]] = None, purpose: Optional[str] = None) -> str:
+    """
+    _call_backend once the breaker admits the call and this thread holds a
+    fair llm_limiter slot ("" if the breaker is open or no slot is free within
+    `timeout`). The breaker is checked first so that, while it is open,
+    calls fail fast instead of queueing for slots.
+    """
+    if not llm_breaker.allow():
+        logger.warning("LLM circuit open, skipping call")
+        return ""
+    with llm_limiter.slot(_llm_user.get(), timeout) as acquired:
+        if not acquired:
+            llm_breaker.release()
+            logger.warning("No LLM slot within %ds, skipping call", timeout)
             return ""
-        output = result.stdout.decode("utf-8").strip()
-  
-        return output
-    except subprocess.TimeoutExpired:
+        return _call_backend(prompt, timeout, system, options, purpose)
+
+
+def _call_backend(prompt: str, timeout: int, system: Optional[str] = None,
+                  options: Optional[Dict[str, Any]] = None, purpose: Optional[str] = None) -> str:
+    """Call the backend (already admitted by llm_breaker), mapping every failure to an empty string."""
+    timeout = _call_timeout(timeout)
+    route = purpose or "default"
+    model = _route_model(purpose)
+    metrics.increment(f"llm.route.{route}.calls")
+    start = time.perf_counter()
+    try:
+        backend = get_backend()
+        try:
+            output = _generate_routed(backend, prompt, timeout, system, options, model, route)
+        except LLMBackendUnavailable as e:
+            if backend.name == SubprocessBackend.name:
+                raise
+            logger.warning("LLM backend '%s' unavailable (%s), falling back to subprocess",
+                           backend.name, e)
+            output = _generate_routed(get_backend(SubprocessBackend.name), prompt, timeout,
+                                      system, options, model, route)
+    except (subprocess.TimeoutExpired, requests.Timeout, TimeoutError):
         logger.error("LLM call timed out after %ds", timeout)
+        _record_route_failure(route)
+        return ""
+    except LLMBackendError as e:
+        logger.error("LLM error: %s", str(e))
+        _record_route_failure(route)
         return ""
     except Exception as e:
         logger.exception("Unexpected error in run_llm: %s", str(e))
+        _record_route_failure(route)
         return ""
+    finally:
+        metrics.observe(f"llm.route.{route}.latency", time.perf_counter() - start)
+    llm_breaker.record_success()
+    return output
+
+
+def _cache_key(prompt: str, system: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None, purpose: Optional[str] = None) -> str:
+    # Keyed on the active backend's model (plus any routed model) so answers
+    # from different models never mix.
+    return make_key(getattr(get_backend(), "model", LLM_MODEL), prompt,
+                    system=system, options=options, routed_model=_route_model(purpose))
+
+
+def lookup_cached_llm(prompt: str, system: Optional[str] = None,
+                      purpose: Optional[str] = None) -> Optional[str]:
+    """Return the cached output run_llm would serve for `prompt`, if any."""
+    return _cache_lookup(prompt, 1, system, _resolve_options(purpose, None), purpose)[1]
+
+
+def store_cached_llm(prompt: str, output: str, cache_ttl: float, system: Optional[str] = None,
+                     purpose: Optional[str] = None) -> None:
+    """Seed the cache as if run_llm(prompt, cache_ttl=..., system=..., purpose=...) had returned `output`."""
+    if output and cache_ttl and LLM_CACHE_ENABLED:
+        key = _cache_key(prompt, system, _resolve_options(purpose, None), purpose)
+        llm_cache.set(key, output, cache_ttl)
+
+
+def warm_up_llm(timeout: int = 120) -> None:
+    """
+    Load the active backend's default and routed models ahead of the first request.
+
+    Bypasses the cache and circuit breaker; errors propagate so the caller
+    can report the warm-up as failed.
+    """
+    backend = get_backend()
+    if getattr(backend, "warm_up", None) is None:
+        return
+    routed = sorted({m for m in map(_route_model, LLM_PURPOSES) if m})
+    for model in [None] + routed:
+        try:
+            backend.warm_up(timeout, model=model)
+        except LLMBackendUnavailable:
+            if backend.name == SubprocessBackend.name:
+                raise
+            logger.warning("LLM backend '%s' unavailable, warming up subprocess backend",
+                           backend.name)
+            get_backend(SubprocessBackend.name).warm_up(timeout, model=model)
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters for the LLM response cache."""
+    return llm_cache.stats()
+
+
+def get_breaker_state() -> dict:
+    """Current state of the LLM circuit breaker."""
+    return llm_breaker.snapshot()
+
+
+def get_model_routes() -> dict:
+    """Model used for each call purpose."""
+    return dict(MODEL_ROUTES)
@@ -0,0 +1,157 @@
+# utils/llm_fake_backend.py
+"""
+Deterministic stand-in for the LLM, for load tests and CI.
+
+Answers come from canned regex rules (overridable) that mimic the shape of
+each real prompt: intent labels, transfer/spend JSON, fused intent + slots
+JSON, suggestion arrays and short prose. Latency and jitter are injected
+so framework overhead can be measured without a model.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LLM_FAKE_LATENCY_MS = float(os.environ.get("LLM_FAKE_LATENCY_MS", "50"))
+LLM_FAKE_JITTER_MS = float(os.environ.get("LLM_FAKE_JITTER_MS", "20"))
+LLM_FAKE_SEED = int(os.environ.get("LLM_FAKE_SEED", "42"))
+
+_INTENT_KEYWORDS = [
+    ("transfer", ("transfer", "send", "pay", "remit")),
+    ("spend", ("spend", "spent", "spending", "transactions", "expense")),
+    ("offers", ("offer", "discount", "promo", "deal", "coupon")),
+    ("faq", ("how", "what", "why", "when", "where", "faq", "help")),
+]
+
+
+def _label_for(query: str) -> str:
+    q = query.lower()
+    for label, keywords in _INTENT_KEYWORDS:
+        if any(k in q for k in keywords):
+            return label
+    return "unknown"
+
+
+def _last_quoted(prompt: str) -> str:
+    quoted = re.findall(r'"([^"\n]*)"', prompt)
+    return quoted[-1] if quoted else prompt
+
+
+def _classify(prompt: str) -> str:
+    return _label_for(_last_quoted(prompt))
+
+
+def _classify_batch(prompt: str) -> str:
+    lines = re.findall(r'^(\d+)\. "(.*)"$', prompt, re.M)
+    return "\n".join(f"{n}: {_label_for(q)}" for n, q in lines)
+
+
+def _transfer_json(prompt: str) -> str:
+    query = _last_quoted(prompt).lower()
+    amount = re.search(r"(\d+(?:\.\d+)?)", query)
+    beneficiary = re.search(r"\bto\s+([a-z]+)", query)
+    account = "Savings" if "saving" in query else "Current" if "current" in query else None
+    return json.dumps({
+        "amount": float(amount.group(1)) if amount else None,
+        "to_beneficiary": beneficiary.group(1) if beneficiary else None,
+        "from_account": account,
+        "frequency": "recurring" if "monthly" in query or "recurring" in query else "one-time",
+    })
+
+
+def _spend_json(prompt: str) -> str:
+    query = _last_quoted(prompt).lower()
+    category = re.search(r"\bon\s+([a-z]+)", query)
+    return json.dumps({
+        "category": category.group(1) if category else None,
+        "start_date": None,
+        "end_date": None,
+        "merchant": None,
+    })
+
+
+def _fused_json(prompt: str) -> str:
+    intent = _classify(prompt)
+    slots = dict.fromkeys(("amount", "to_beneficiary", "from_account", "frequency",
+                           "category", "start_date", "end_date", "merchant"))
+    if intent == "transfer":
+        slots.update(json.loads(_transfer_json(prompt)))
+    elif intent == "spend":
+        slots.update(json.loads(_spend_json(prompt)))
+    return json.dumps({"intent": intent, "slots": slots})
+
+
+def _suggestions(prompt: str) -> str:
+    return json.dumps([
+        "Show me last month's spend",
+        "Show me offers",
+        "How do I book an appointment?",
+    ])
+
+
+DEFAULT_RULES: List[Tuple[str, object]] = [
+    (r"extract its details in one step", _fused_json),
+    (r"one line per query", _classify_batch),
+    (r"Classify this user query", _classify),
+    (r"structured transfer details", _transfer_json),
+    (r"spend analytics query", _spend_json),
+    (r"follow-up questions", _suggestions),
+]
+DEFAULT_RESPONSE = "This is a simulated response from the fake LLM backend."
+
+
+class FakeBackend:
+    """Rule-based LLM backend with configurable latency and jitter (options/model are ignored)."""
+
+    name = "fake"
+    model = "fake"
+
+    def __init__(self, latency_ms: float = LLM_FAKE_LATENCY_MS, jitter_ms: float = LLM_FAKE_JITTER_MS,
+                 responses: Optional[Dict[str, str]] = None, seed: int = LLM_FAKE_SEED):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # Custom canned answers (regex -> text) take precedence over the default rules.
+        self.responses = dict(responses or {})
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+
+    def _delay(self) -> float:
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def _answer(self, prompt: str, system: Optional[str] = None) -> str:
+        # Rules match on the instructions, which templates put in the system block
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        for pattern, text in self.responses.items():
+            if re.search(pattern, prompt):
+                return text
+        for pattern, rule in DEFAULT_RULES:
+            if re.search(pattern, prompt):
+                return rule(prompt)
+        return DEFAULT_RESPONSE
+
+    def generate(self, prompt: str, timeout: int, system: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> str:
+        self.calls += 1
+        delay = self._delay()
+        if delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake LLM latency {delay:.2f}s exceeded timeout {timeout}s")
+        time.sleep(delay)
+        return self._answer(prompt, system)
+
+    def stream(self, prompt: str, timeout: int, system: Optional[str] = None,
+               options: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> Iterator[str]:
+        self.calls += 1
+        words = self._answer(prompt, system).split(" ")
+        per_token = self._delay() / max(len(words), 1)
+        for i, word in enumerate(words):
+            time.sleep(per_token)
+            yield word if i == len(words) - 1 else word + " "
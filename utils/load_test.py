@@ -0,0 +1,134 @@
+# utils/load_test.py
+"""
+Load test for the LangGraph flow / Flask API against the fake LLM backend.
+
+Isolates our own overhead from model time. Example:
+
+    python -m utils.load_test --mode graph --requests 200 --concurrency 8 --latency-ms 50
+    python -m utils.load_test --mode api --requests 200 --concurrency 8 --latency-ms 0
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import metrics
+from utils.llm_connector import get_backend, register_backend, set_backend
+from utils.llm_fake_backend import FakeBackend
+
+QUERY_MIX = [
+    "show my spending this month",
+    "how much did I spend on coffee last month",
+    "show me offers",
+    "any discount deals for me?",
+    "transfer 100 to mom from savings",
+    "send 50 to john",
+]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _make_graph_runner():
+    from langgraph_flow.flows.main_flow import build_main_flow
+    from langgraph_flow.core.constants import ConversationPhase, IntentType
+    from langgraph_flow.core.state import StateManager
+
+    graph = build_main_flow()
+
+    def run(i: int, query: str) -> None:
+        state = {
+            "user_input": query,
+            "intent": IntentType.UNKNOWN,
+            "phase": ConversationPhase.NORMAL,
+            "user_id": str(1000 + i),
+        }
+        StateManager.ensure_defaults(state)
+        graph.invoke(state)
+
+    return run
+
+
+def _make_api_runner():
+    # The fake backend needs no warm-up; don't load the real models either
+    os.environ.setdefault("WARMUP_ENABLED", "0")
+    from api.main import app
+
+    client = app.test_client()
+
+    def run(i: int, query: str) -> None:
+        resp = client.post("/chatbot", json={"user_id": 1000 + i, "query": query})
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.get_data(as_text=True)[:200]}")
+        # Don't leave load-test users mid-transfer
+        client.post("/user/reset", json={"user_id": 1000 + i})
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["graph", "api"], default="graph")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    register_backend(
+        FakeBackend.name,
+        lambda: FakeBackend(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms),
+    )
+    set_backend(FakeBackend.name)
+
+    run = _make_graph_runner() if args.mode == "graph" else _make_api_runner()
+    metrics.reset()
+
+    latencies, errors = [], 0
+
+    def timed(i):
+        start = time.perf_counter()
+        run(i, QUERY_MIX[i % len(QUERY_MIX)])
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(timed, i) for i in range(args.requests)]
+        for fut in futures:
+            try:
+                latencies.append(fut.result())
+            except Exception as e:
+                errors += 1
+                print(f"request failed: {e}")
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "fake_latency_ms": args.latency_ms,
+        "errors": errors,
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(1000 * _percentile(latencies, 50), 2),
+            "p95": round(1000 * _percentile(latencies, 95), 2),
+            "p99": round(1000 * _percentile(latencies, 99), 2),
+            "max": round(1000 * max(latencies), 2) if latencies else 0.0,
+            "mean": round(1000 * statistics.mean(latencies), 2) if latencies else 0.0,
+        },
+        "llm_calls": get_backend().calls,
+        "metrics": metrics.snapshot(),
+    }
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# utils/metrics.py
+"""
+Minimal in-process metrics registry.
+
+Counters, gauges and timing summaries keyed by dotted names
+(e.g. "llm.cache.hit"). Thread-safe; exposed via /api/metrics.
+"""
+
+import threading
+from typing import Any, Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, Any] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Increase a counter."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: Any) -> None:
+    """Set a gauge to its current value."""
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record a duration (in seconds) into a count/total/max summary."""
+    with _lock:
+        t = _timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        t["count"] += 1
+        t["total"] += seconds
+        t["max"] = max(t["max"], seconds)
+
+
+def get_counter(name: str) -> float:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return a JSON-serializable copy of all metrics."""
+    with _lock:
+        timings = {
+            name: {
+                "count": t["count"],
+                "avg_ms": round(1000 * t["total"] / t["count"], 2) if t["count"] else 0.0,
+                "max_ms": round(1000 * t["max"], 2),
+            }
+            for name, t in _timings.items()
+        }
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timings": timings,
+        }
+
+
+def reset() -> None:
+    """Clear all metrics (mainly for benchmarks)."""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _timings.clear()
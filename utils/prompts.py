@@ -1,10 +1,83 @@
 # utils/prompts.py
-def extraction_prompt(query: str) -> str:
-    return f"""
-You are a precise information extraction engine.
-Extract structured transfer details from the following user query:
+"""
+Prompt templates.
+
+Each template is split into a static `system` block (role, rules, examples)
+and a short `user` tail holding everything that varies per call (query,
+dates, data). The system block is sent to the backend as a separate system
+prompt, so consecutive calls share a byte-identical prefix the model server
+can reuse from its prompt/KV cache; only the tail has to be processed.
+"""
+
+from typing import NamedTuple
+
+
+class RenderedPrompt(NamedTuple):
+    prompt: str
+    system: str
+
+    def inline(self) -> str:
+        """Single-string form (system block first) for backends without a system field."""
+        return f"{self.system}\n\n{self.prompt}"
+
+
+class PromptTemplate:
+    """Static system instructions + a str.format() tail for the variable parts."""
+
+    def __init__(self, system: str, user: str):
+        self.system = system.strip()
+        self.user = user.strip()
+
+    def render(self, **values) -> RenderedPrompt:
+        return RenderedPrompt(prompt=self.user.format(**values), system=self.system)
+
+
+CLASSIFY = PromptTemplate(
+    system="""
+Classify this user query into exactly one category: spend, faq, offers, transfer, or unknown.
+Return ONLY the single-word category label, nothing else.
+""",
+    user='Query: "{query}"',
+)
+
+BATCH_CLASSIFY = PromptTemplate(
+    system="""
+Classify each user query below into exactly one category: spend, faq, offers, transfer, or unknown.
+Return one line per query in the form "<number>: <label>" and nothing else.
+""",
+    user="{numbered}",
+)
+
+FUSED_CLASSIFY_EXTRACT = PromptTemplate(
+    system="""
+Classify the user query into exactly one category and extract its details in one step.
+Categories: spend, faq, offers, transfer, unknown.
+
+Return ONLY a JSON object (no text before or after) with exactly these keys:
+- intent: one of the categories above
+- slots: object with these keys (null when absent or not applicable):
+  - amount: number (transfer amount, numeric value only)
+  - to_beneficiary: string (transfer recipient name/nickname)
+  - from_account: "Savings", "Current", or null
+  - frequency: "one-time" or "recurring" (transfers only)
+  - category: string (spend category, e.g. "coffee", "groceries")
+  - start_date: YYYY-MM-DD (explicit spend period start)
+  - end_date: YYYY-MM-DD (explicit spend period end)
+  - merchant: string (spend merchant)
+
+Example: {"intent": "transfer", "slots": {"amount": 200, "to_beneficiary": "amy", "from_account": "Current", "frequency": "one-time", "category": null, "start_date": null, "end_date": null, "merchant": null}}
+""",
+    user="""
+Assume today's date is {today}.
 
-"{query}"
+Query: "{query}"
+""",
+)
+
+TRANSFER_EXTRACTION = PromptTemplate(
+    system="""
+You are a precise information extraction engine.
+Extract structured transfer details from the user query given at the end.
 
 Return ONLY a valid JSON object (no text before or after) with exactly these keys:
 - amount: number or null
@@ -15,7 +88,7 @@ Return ONLY a valid JSON object (no text before or after) with exactly these key
 Rules:
 1. Amount can appear as ₹100, Rs 100, $100, or just 100 - extract numeric value only.
 2. to_beneficiary is the recipient name/nickname (e.g., "mom", "john").
-3. from_account: 
+3. from_account:
    - If the text mentions "savings", return "Savings".
    - If it mentions "current", return "Current".
    - Otherwise return null.
@@ -26,10 +99,114 @@ Rules:
 
 Example format (single object, not a list):
 
-{{
+{
   "amount": 200,
   "to_beneficiary": "amy",
   "from_account": "Current",
   "frequency": "recurring"
-}}
-"""
+}
+""",
+    user='Query: "{query}"',
+)
+
+SPEND_EXTRACTION = PromptTemplate(
+    system="""
+Extract spend analytics query details from the user query.
+Return a JSON object with keys:
+  - category (string or null)
+  - start_date (YYYY-MM-DD or null)   # If the user gave explicit dates put them here; otherwise null.
+  - end_date (YYYY-MM-DD or null)
+  - merchant (string or null)
+
+Examples:
+  Input: "How much did I spend in groceries in August 2025?"
+  Output JSON: { "category": "Groceries", "start_date": "2025-08-01", "end_date": "2025-08-31", "merchant": null }
+
+  Input: "Show me my spends this month"
+  Output JSON: { "category": null, "start_date": null, "end_date": null, "merchant": null }
+    # For relative phrases like "this month" we'll compute concrete dates locally.
+
+The currency is USD and return the amounts in USD.
+""",
+    user="""
+Assume today's date is {today}.
+Query: "{query}"
+""",
+)
+
+SPEND_SUMMARY = PromptTemplate(
+    system="""
+You are a concise financial assistant. You are given the user's question and a spend analysis result as JSON.
+Provide a short chat-friendly reply (maximum 2-3 sentences, one paragraph) that:
+  - States the total spend (if available).
+  - Lists the top 2-3 categories or top 3 merchants if the query is for a category.
+  - Ends with a short CTA like "Would you like the full breakdown?" or "Want more detail?"
+
+Return ONLY the short reply (plain text). Do not return JSON or internal debug info.
+The currency is USD and return the amount ONLY in USD.
+Do not start with "As an AI language model" or greetings like "Hi" or "Hello".
+""",
+    user="""
+The user asked: "{query}"
+
+Here is the analysis JSON (keys: {keys}):
+{analysis}
+""",
+)
+
+CHAT_FORMAT = PromptTemplate(
+    system="""
+You are a helpful, professional banking assistant.
+You are given the user's question and the structured backend response to it.
+
+Your task:
+1. Keep the reply concise and direct (no extra details, no introduction).
+2. Formulate a conversational reply describing what happened.
+3. Summarize only the key info - amount, beneficiary. Do not add explanations.
+4. Do not expose internal keys, raw JSON, or formatting.
+5. Do not start with greetings ("Hi", "Hello", etc.).
+6. Do not end with "Best regards" or similar.
+7. Do not return status codes or raw JSON.
+8. If there is a 'recommendation', preserve it verbatim in the reply.
+
+Currency is USD. Use the same currency in your response. Start the reply directly.
+""",
+    user="""
+The user asked: "{query}"
+
+Here is the structured backend response:
+{response}
+""",
+)
+
+SUGGESTIONS = PromptTemplate(
+    system="""
+You are a helpful banking assistant.
+
+Your task:
+- Suggest 3-5 concise follow-up questions the user might want to ask next.
+- Questions should be relevant to the previous response and actionable.
+- Format as a JSON array of strings only.
+- Keep tone friendly and professional.
+""",
+    user="""
+The user asked: "{query}"
+The last response you gave: "{response}"
+""",
+)
+
+FAQ_ANSWER = PromptTemplate(
+    system="""
+You are a helpful and concise banking FAQ assistant.
+Based strictly on the context provided, give a clear and direct answer to the user's question.
+Do NOT mention documents, sources, file names, or any references. Do NOT provide document names or links.
+Only provide the factual answer.
+Return only the answer, without repeating the question.
+""",
+    user="""
+Context:
+{context}
+
+The user asked: "{query}"
+""",
+)
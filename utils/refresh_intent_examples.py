@@ -0,0 +1,81 @@
+# utils/refresh_intent_examples.py
+"""
+Grow data/intent_examples.json from the intent traffic log.
+
+The service only writes that log with INTENT_TRAFFIC_LOG_ENABLED=1.
+Queries the LLM labelled (the embedding classifier was unsure) are the most
+useful new examples, so by default only those are taken. The running
+service picks up the rewritten file on its next classification. Example:
+
+    python -m utils.refresh_intent_examples --min-count 2 --max-new 20
+"""
+
+import argparse
+import glob
+import json
+import os
+from collections import Counter
+
+from langgraph_flow.services.embedding_intent import INTENT_EXAMPLES_PATH, INTENT_TRAFFIC_LOG
+
+
+def _load_traffic(path, sources):
+    """Counts per (intent, query) across the log and its rotated backups."""
+    counts = Counter()
+    paths = [path] + sorted(glob.glob(f"{glob.escape(path)}.[0-9]*"))
+    for log_path in paths:
+        with open(log_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("source") in sources and record.get("query"):
+                    counts[(record["intent"], record["query"].strip())] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--traffic", default=INTENT_TRAFFIC_LOG)
+    parser.add_argument("--examples", default=INTENT_EXAMPLES_PATH)
+    parser.add_argument("--sources", default="llm",
+                        help="comma-separated traffic sources to learn from")
+    parser.add_argument("--min-count", type=int, default=1,
+                        help="only add queries seen at least this often")
+    parser.add_argument("--max-new", type=int, default=20, help="new examples per intent")
+    parser.add_argument("--max-per-intent", type=int, default=200,
+                        help="cap per intent; oldest examples are dropped first")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.examples, "r") as f:
+        examples = json.load(f)
+    counts = _load_traffic(args.traffic, set(args.sources.split(",")))
+
+    added = {}
+    for intent, texts in examples.items():
+        known = {t.lower() for t in texts}
+        candidates = [
+            (n, query) for (label, query), n in counts.items()
+            if label == intent and n >= args.min_count and query.lower() not in known
+        ]
+        candidates.sort(key=lambda c: -c[0])
+        new = [query for _, query in candidates[:args.max_new]]
+        examples[intent] = (texts + new)[-args.max_per_intent:]
+        added[intent] = new
+
+    print(json.dumps({"added": added}, indent=2, ensure_ascii=False))
+    if args.dry_run or not any(added.values()):
+        return
+
+    # Atomic replace so the service never reads a half-written file
+    tmp_path = f"{args.examples}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(examples, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, args.examples)
+
+
+if __name__ == "__main__":
+    main()
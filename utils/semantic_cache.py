@@ -0,0 +1,117 @@
+# utils/semantic_cache.py
+"""
+Nearest-neighbour answer cache keyed by query embeddings.
+
+Paraphrases ("how can I reset my pin" / "forgot my PIN, what do I do")
+land close together in embedding space, so a past answer can be reused
+when a new query's cosine similarity to a stored one is high enough.
+Entries expire by age; when full, the least frequently used entry goes.
+"""
+
+import threading
+import time
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from . import metrics
+
+# Similarity buckets (lower bounds) for per-range hit-rate metrics
+SIMILARITY_BUCKETS = (0.99, 0.97, 0.95, 0.92, 0.90, 0.85, 0.80)
+
+
+class SemanticEntry(NamedTuple):
+    value: Any
+    sources: Tuple[str, ...]
+    created_at: float
+
+
+def similarity_bucket(similarity: float) -> str:
+    """Metric label for the bucket `similarity` falls in, e.g. "0.95"."""
+    for bound in SIMILARITY_BUCKETS:
+        if similarity >= bound:
+            return f"{bound:.2f}"
+    return "lt_{:.2f}".format(SIMILARITY_BUCKETS[-1])
+
+
+class SemanticCache:
+    """Thread-safe embedding -> value cache with TTL and LFU eviction."""
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: Optional[float] = None):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None   # one normalized row per entry
+        self._entries: List[SemanticEntry] = []
+        self._hits: List[int] = []
+        self.evictions = 0
+
+    def nearest(self, embedding) -> Optional[Tuple[SemanticEntry, float]]:
+        """Most similar live entry and its cosine similarity, or None if empty."""
+        query = _normalize(embedding)
+        with self._lock:
+            self._expire()
+            if self._vectors is None:
+                return None
+            sims = self._vectors @ query
+            index = int(np.argmax(sims))
+            return self._entries[index], float(sims[index])
+
+    def record_hit(self, entry: SemanticEntry) -> None:
+        """Count a served hit towards the entry's frequency."""
+        with self._lock:
+            for i, existing in enumerate(self._entries):
+                if existing is entry:
+                    self._hits[i] += 1
+                    break
+
+    def add(self, embedding, value: Any, sources=()) -> None:
+        vector = _normalize(embedding)
+        entry = SemanticEntry(value, tuple(sources), time.time())
+        with self._lock:
+            self._expire()
+            if self._vectors is not None and len(self._entries) >= self.max_size:
+                self._evict_one()
+            self._entries.append(entry)
+            self._hits.append(0)
+            row = vector[None, :]
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._entries = []
+            self._hits = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict_one(self) -> None:
+        # Least frequently used; the oldest among equals
+        victim = min(range(len(self._entries)),
+                     key=lambda i: (self._hits[i], self._entries[i].created_at))
+        self._remove([victim])
+        self.evictions += 1
+        metrics.increment(f"{self.name}.evictions")
+
+    def _expire(self) -> None:
+        if not self.ttl or not self._entries:
+            return
+        cutoff = time.time() - self.ttl
+        expired = [i for i, e in enumerate(self._entries) if e.created_at <= cutoff]
+        if expired:
+            self._remove(expired)
+
+    def _remove(self, indexes: List[int]) -> None:
+        drop = set(indexes)
+        keep = [i for i in range(len(self._entries)) if i not in drop]
+        self._entries = [self._entries[i] for i in keep]
+        self._hits = [self._hits[i] for i in keep]
+        self._vectors = self._vectors[keep] if keep else None
+
+
+def _normalize(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -0,0 +1,93 @@
+# utils/ttft_benchmark.py
+"""
+Time-to-first-token benchmark: query-in-the-middle prompts vs prompt templates.
+
+The legacy layout interleaves the user query with the static instructions,
+so every call has a different prefix. The template layout (utils.prompts)
+sends the instructions as an identical system block with the query at the
+end, letting the model server reuse its cached prefix on repeated calls.
+Runs against a live backend, bypassing the response cache. Example:
+
+    python -m utils.ttft_benchmark --backend http --rounds 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from utils.llm_connector import get_backend, set_backend
+from utils.prompts import TRANSFER_EXTRACTION
+
+QUERIES = [
+    "transfer 100 to mom from savings",
+    "send 50 to john",
+    "pay 2500 to landlord every month from current",
+    "remit 75 dollars to amy",
+    "transfer 300 to dad",
+]
+
+
+def _legacy_prompt(query: str) -> str:
+    # The pre-template layout: the query sits right after the first line
+    return (
+        "You are a precise information extraction engine.\n"
+        "Extract structured transfer details from the following user query:\n\n"
+        f'"{query}"\n\n{TRANSFER_EXTRACTION.system}'
+    )
+
+
+def _time_to_first_token(backend, prompt: str, system, timeout: int) -> float:
+    start = time.perf_counter()
+    chunks = backend.stream(prompt, timeout, system)
+    try:
+        next(chunks, None)
+        return time.perf_counter() - start
+    finally:
+        chunks.close()
+
+
+def _run_layout(backend, layout: str, rounds: int, timeout: int) -> dict:
+    samples = []
+    for i in range(rounds):
+        query = QUERIES[i % len(QUERIES)]
+        if layout == "legacy":
+            prompt, system = _legacy_prompt(query), None
+        else:
+            rendered = TRANSFER_EXTRACTION.render(query=query)
+            prompt, system = rendered.prompt, rendered.system
+        samples.append(_time_to_first_token(backend, prompt, system, timeout))
+
+    repeats = samples[1:] or samples
+    return {
+        "first_call_ms": round(1000 * samples[0], 2),
+        "repeat_mean_ms": round(1000 * statistics.mean(repeats), 2),
+        "repeat_p50_ms": round(1000 * statistics.median(repeats), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", default=None, help="registered backend name (default: active)")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--timeout", type=int, default=120)
+    args = parser.parse_args()
+
+    if args.backend:
+        set_backend(args.backend)
+    backend = get_backend()
+
+    # Layouts run back to back (not interleaved) so each one sees its own
+    # warm prefix cache rather than the other layout's.
+    report = {"backend": backend.name, "model": getattr(backend, "model", None),
+              "rounds": args.rounds}
+    for layout in ("legacy", "template"):
+        report[layout] = _run_layout(backend, layout, args.rounds, args.timeout)
+
+    legacy, template = report["legacy"]["repeat_mean_ms"], report["template"]["repeat_mean_ms"]
+    report["repeat_speedup"] = round(legacy / template, 2) if template else None
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()